@@ -1,4 +1,6 @@
+import Link from 'next/link'
 import { listMicrobinfie, readMicrobinfie } from "@/lib/content.mjs"
+import { getRelatedEpisodes } from "@/lib/related.mjs"
 import CodeBlockWrapper from '@/components/CodeBlockWrapper'
 import GuestCard from '@/components/GuestCard'
 import { SoundCloudIcon, ApplePodcastsIcon, SpotifyIcon, RSSIcon, DownloadIcon } from '@/components/PodcastPlatformIcons'
@@ -20,6 +22,7 @@ export async function generateMetadata({ params }) {
 export default async function MicrobinfiePostPage({ params }) {
   const { slug } = await params
   const { frontmatter, content } = await readMicrobinfie(slug)
+  const relatedEpisodes = await getRelatedEpisodes(slug)
   
   // Extract SoundCloud track ID from GUID (format: tag:soundcloud,2010:tracks/679080552)
   let trackId = null
@@ -200,6 +203,31 @@ export default async function MicrobinfiePostPage({ params }) {
       <CodeBlockWrapper>
         {content}
       </CodeBlockWrapper>
+
+      {/* Related Episodes (by transcript similarity) */}
+      {relatedEpisodes.length > 0 && (
+        <section style={{
+          marginTop: '2rem',
+          paddingTop: '1.5rem',
+          borderTop: '1px solid var(--color-border)',
+        }}>
+          <h3 style={{ fontSize: '1rem', fontWeight: '600', marginBottom: '0.75rem' }}>
+            Related episodes
+          </h3>
+          <ul style={{ listStyle: 'none', padding: 0, margin: 0 }}>
+            {relatedEpisodes.map(episode => (
+              <li key={episode.slug} style={{ marginBottom: '0.5rem' }}>
+                <Link
+                  href={`/microbinfie/${episode.slug}`}
+                  style={{ color: 'var(--color-link)', textDecoration: 'none', fontSize: '0.95rem' }}
+                >
+                  {episode.title || episode.slug}
+                </Link>
+              </li>
+            ))}
+          </ul>
+        </section>
+      )}
     </article>
   )
 }
@@ -1,6 +1,7 @@
 import Link from 'next/link'
 import { Suspense } from 'react'
 import { listMicrobinfie } from "@/lib/content.mjs"
+import { applyTagIndex } from "@/lib/tags.mjs"
 import MicrobinfieFilter from '@/components/MicrobinfieFilter'
 import { SoundCloudIcon, ApplePodcastsIcon, SpotifyIcon, RSSIcon } from '@/components/PodcastPlatformIcons'
 
@@ -9,7 +10,7 @@ export const metadata = {
 }
 
 export default async function MicrobinfieIndexPage() {
-  const allEpisodes = await listMicrobinfie()
+  const { episodes: allEpisodes, tagCounts, relatedTags } = await applyTagIndex(await listMicrobinfie())
 
   
   return (
@@ -184,7 +185,7 @@ export default async function MicrobinfieIndexPage() {
 
       {/* Episodes with filtering */}
       <Suspense fallback={<div>Loading episodes...</div>}>
-        <MicrobinfieFilter episodes={allEpisodes} />
+        <MicrobinfieFilter episodes={allEpisodes} tagCounts={tagCounts} relatedTags={relatedTags} />
       </Suspense>
     </section>
   )
@@ -4,6 +4,7 @@ import { useState, useMemo, useEffect } from 'react'
 import { useRouter, useSearchParams } from 'next/navigation'
 import Link from 'next/link'
 import { SoundCloudIcon, DownloadIcon } from './PodcastPlatformIcons'
+import { searchEpisodes } from '@/lib/microbinfieSearch.mjs'
 
 // Simple markdown to HTML converter for excerpts
 function renderMarkdown(text) {
@@ -32,7 +33,9 @@ function renderMarkdown(text) {
   // Pagination
   const EPISODES_PER_PAGE = 10
 
-export default function MicrobinfieFilter({ episodes }) {
+  const isListedTag = (tag) => tag && tag.toLowerCase() !== 'microbinfie' && tag.toLowerCase() !== 'podcast'
+
+export default function MicrobinfieFilter({ episodes, tagCounts = {}, relatedTags = {} }) {
   const router = useRouter()
   const searchParams = useSearchParams()
   
@@ -40,6 +43,8 @@ export default function MicrobinfieFilter({ episodes }) {
   const [selectedTag, setSelectedTag] = useState(null)
   const [currentPage, setCurrentPage] = useState(1)
   const [showTags, setShowTags] = useState(false)
+  // Slugs matched by the static search index (guests, transcripts); null until loaded
+  const [indexMatches, setIndexMatches] = useState(null)
 
   // Initialize from URL params on mount
   useEffect(() => {
@@ -62,13 +67,30 @@ export default function MicrobinfieFilter({ episodes }) {
     router.replace(newUrl, { scroll: false })
   }, [searchTerm, selectedTag, router])
 
+  // Look the search term up in the sharded search index (debounced)
+  useEffect(() => {
+    // Drop the previous query's matches until this one has been looked up
+    setIndexMatches(null)
+    if (searchTerm.trim().length < 2) return
+    let cancelled = false
+    const timer = setTimeout(() => {
+      searchEpisodes(searchTerm)
+        .then(results => { if (!cancelled) setIndexMatches(new Set(results.map(r => r.slug))) })
+        .catch(() => { if (!cancelled) setIndexMatches(null) })
+    }, 150)
+    return () => {
+      cancelled = true
+      clearTimeout(timer)
+    }
+  }, [searchTerm])
+
   // Extract all unique tags
   const allTags = useMemo(() => {
     const tagSet = new Set()
     episodes.forEach(episode => {
       if (episode.tags && Array.isArray(episode.tags)) {
         episode.tags.forEach(tag => {
-          if (tag && tag.toLowerCase() !== 'microbinfie' && tag.toLowerCase() !== 'podcast') {
+          if (isListedTag(tag)) {
             tagSet.add(tag)
           }
         })
@@ -85,14 +107,15 @@ export default function MicrobinfieFilter({ episodes }) {
         episode.title?.toLowerCase().includes(searchLower) ||
         episode.subtitle?.toLowerCase().includes(searchLower) ||
         episode.excerpt?.toLowerCase().includes(searchLower) ||
-        (episode.tags && episode.tags.some(tag => tag.toLowerCase().includes(searchLower)))
+        (episode.tags && episode.tags.some(tag => tag.toLowerCase().includes(searchLower))) ||
+        (indexMatches && indexMatches.has(episode.slug))
       
       const matchesTag = !selectedTag || 
         (episode.tags && episode.tags.some(tag => tag.toLowerCase() === selectedTag.toLowerCase()))
       
       return matchesSearch && matchesTag
     })
-  }, [episodes, searchTerm, selectedTag])
+  }, [episodes, searchTerm, selectedTag, indexMatches])
 
   // Reset to page 1 when filters change
   useMemo(() => {
@@ -181,6 +204,31 @@ export default function MicrobinfieFilter({ episodes }) {
                   fontWeight: selectedTag === tag ? 600 : 400,
                   transition: 'all 0.2s',
                 }}
+              >
+                {tag}{tagCounts[tag] ? ` (${tagCounts[tag]})` : ''}
+              </button>
+            ))}
+          </div>
+        )}
+
+        {/* Topics that often appear alongside the selected one (from the tag index) */}
+        {selectedTag && (relatedTags[selectedTag] || []).some(isListedTag) && (
+          <div style={{ display: 'flex', gap: '0.5rem', flexWrap: 'wrap', alignItems: 'center', marginTop: '1rem' }}>
+            <span style={{ fontSize: '0.85rem', color: 'var(--color-text-secondary)' }}>Related topics:</span>
+            {relatedTags[selectedTag].filter(isListedTag).map(tag => (
+              <button
+                key={tag}
+                onClick={() => setSelectedTag(tag)}
+                style={{
+                  padding: '0.25rem 0.6rem',
+                  fontSize: '0.8rem',
+                  border: '1px solid var(--color-border)',
+                  borderRadius: '20px',
+                  background: 'var(--color-bg)',
+                  color: 'var(--color-text)',
+                  cursor: 'pointer',
+                  transition: 'all 0.2s',
+                }}
               >
                 {tag}
               </button>
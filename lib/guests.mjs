@@ -1,23 +1,80 @@
 import fs from 'node:fs/promises'
 import path from 'node:path'
+import yaml from 'js-yaml'
 import matter from 'gray-matter'
 
 const microbinfieDir = path.join(process.cwd(), 'content', 'microbinfie')
+// Written by scripts/build-guest-index.py (npm run build): one entry per person,
+// with spelling variants merged across episodes
+const guestIndexPath = path.join(process.cwd(), 'public', 'microbinfie-index', 'guests.json')
+// Podcast hosts, in every spelling; shared with scripts/guest_index.py
+const hostsPath = path.join(process.cwd(), 'scripts', 'data', 'hosts.yml')
 
 /**
  * Guest object structure:
  * {
+ *   id?: string,        // stable id (guest index only)
  *   name: string,
+ *   aliases?: string[], // other spellings merged into this guest (guest index only)
  *   affiliation?: string,
  *   url?: string,
  * }
  */
 
+/**
+ * Load guests from the prebuilt guest index, or null if it has not been built
+ */
+async function loadGuestIndex() {
+  let raw
+  try {
+    raw = await fs.readFile(guestIndexPath, 'utf8')
+  } catch {
+    return null
+  }
+  const { guests } = JSON.parse(raw)
+  const guestMap = new Map()
+  for (const { episodes, ...guest } of guests) {
+    guestMap.set(guest.name, { guest, episodes })
+  }
+  return guestMap
+}
+
 /**
  * Get all guests across all episodes with episode counts
  * Returns: Map<guestName, { guest: object, episodes: Array<{slug, title, date}> }>
  */
 export async function getAllGuests() {
+  const indexed = await loadGuestIndex()
+  if (indexed) return indexed
+  return scanGuests()
+}
+
+/**
+ * Same key as normalize_name() in scripts/guest_index.py: lowercase, titles
+ * dropped, letters only
+ */
+function normalizeName(name) {
+  let s = name.toLowerCase()
+  for (const title of ['dr', 'prof', 'professor']) {
+    s = s.replace(new RegExp(`\\b${title}\\b\\.?`, 'g'), '')
+  }
+  return s.replace(/[^a-z]+/g, '')
+}
+
+/**
+ * Normalized names of the podcast hosts, who are never listed as guests
+ */
+async function loadHostKeys() {
+  const hosts = yaml.load(await fs.readFile(hostsPath, 'utf8')) || []
+  return new Set(hosts.map(name => normalizeName(String(name))))
+}
+
+/**
+ * Fallback when the guest index is missing (e.g. dev without Python): scan
+ * every MDX file, grouping guests by exact name and skipping the hosts
+ */
+async function scanGuests() {
+  const hostKeys = await loadHostKeys()
   const entries = await fs.readdir(microbinfieDir)
   const mdxFiles = entries.filter(f => f.endsWith('.mdx'))
   
@@ -34,7 +91,7 @@ export async function getAllGuests() {
     
     if (Array.isArray(guests) && guests.length > 0) {
       for (const guest of guests) {
-        if (!guest.name) continue
+        if (!guest.name || hostKeys.has(normalizeName(guest.name))) continue
         
         const guestName = guest.name
         
@@ -114,5 +171,9 @@ export async function getGuestsByAppearances() {
  */
 export async function getGuestByName(name) {
   const guestMap = await getAllGuests()
-  return guestMap.get(name) || null
+  if (guestMap.has(name)) return guestMap.get(name)
+  for (const entry of guestMap.values()) {
+    if (entry.guest.aliases?.includes(name)) return entry
+  }
+  return null
 }
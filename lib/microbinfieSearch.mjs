@@ -0,0 +1,82 @@
+// Client-side search over the static index written by scripts/build-search-index.py.
+// Only the manifest and the shard for each query term's two-letter prefix are fetched.
+
+const INDEX_BASE = '/microbinfie-index/search'
+
+let manifestPromise = null
+const shardPromises = new Map()
+
+function fetchJson(url) {
+  return fetch(url).then(res => {
+    if (!res.ok) throw new Error(`${url}: ${res.status}`)
+    return res.json()
+  })
+}
+
+function loadManifest() {
+  if (!manifestPromise) {
+    manifestPromise = fetchJson(`${INDEX_BASE}/manifest.json`).then(manifest => ({
+      ...manifest,
+      shardSet: new Set(manifest.shards),
+      stopwordSet: new Set(manifest.stopwords),
+    }))
+    // Allow a retry after a failed fetch
+    manifestPromise.catch(() => { manifestPromise = null })
+  }
+  return manifestPromise
+}
+
+function loadShard(prefix) {
+  if (!shardPromises.has(prefix)) {
+    const promise = fetchJson(`${INDEX_BASE}/${prefix}.json`)
+    promise.catch(() => shardPromises.delete(prefix))
+    shardPromises.set(prefix, promise)
+  }
+  return shardPromises.get(prefix)
+}
+
+function tokenize(text) {
+  return text.toLowerCase().match(/[a-z0-9]+/g) || []
+}
+
+/**
+ * Search episode titles, tags, guests and transcripts.
+ * Every query term must match; the last term also matches as a prefix so
+ * results update while typing. Returns [{ slug, title, score }], best first.
+ */
+export async function searchEpisodes(query, { limit = 200 } = {}) {
+  const manifest = await loadManifest()
+  const prefixLength = manifest.prefixLength
+  const terms = [...new Set(tokenize(query))]
+    .filter(term => term.length >= prefixLength && !manifest.stopwordSet.has(term))
+  if (terms.length === 0) return []
+
+  const perTerm = await Promise.all(terms.map(async (term, i) => {
+    const prefix = term.slice(0, prefixLength)
+    const weights = new Map()
+    if (!manifest.shardSet.has(prefix)) return weights
+    const shard = await loadShard(prefix)
+    const isLast = i === terms.length - 1
+    for (const [candidate, postings] of Object.entries(shard)) {
+      if (candidate !== term && !(isLast && candidate.startsWith(term))) continue
+      for (const [doc, weight] of postings) {
+        weights.set(doc, Math.max(weights.get(doc) || 0, weight))
+      }
+    }
+    return weights
+  }))
+
+  const [first, ...rest] = perTerm
+  const results = []
+  for (const [doc, weight] of first) {
+    let score = weight
+    let matchesAll = true
+    for (const weights of rest) {
+      if (!weights.has(doc)) { matchesAll = false; break }
+      score += weights.get(doc)
+    }
+    if (matchesAll) results.push({ ...manifest.docs[doc], score })
+  }
+  results.sort((a, b) => b.score - a.score)
+  return results.slice(0, limit)
+}
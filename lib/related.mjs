@@ -0,0 +1,36 @@
+import fs from 'node:fs/promises'
+import path from 'node:path'
+
+// Written by scripts/related_episodes.py (npm run build): top-k episodes by
+// transcript similarity, keyed by episode number
+const relatedPath = path.join(process.cwd(), 'public', 'microbinfie-index', 'related.json')
+
+let relatedIndex
+
+/**
+ * Load the related-episode index once per build, or null if it has not been built
+ */
+async function loadRelatedIndex() {
+  if (relatedIndex === undefined) {
+    try {
+      relatedIndex = JSON.parse(await fs.readFile(relatedPath, 'utf8'))
+    } catch {
+      relatedIndex = null
+    }
+  }
+  return relatedIndex
+}
+
+/**
+ * Episodes whose transcripts are most similar to this one, best first:
+ * [{ slug, title, score }]. Empty without the index or a transcript.
+ */
+export async function getRelatedEpisodes(slug) {
+  const index = await loadRelatedIndex()
+  if (!index) return []
+  const episode = Object.keys(index.episodes).find(num => index.episodes[num].slug === slug)
+  if (episode === undefined) return []
+  return (index.related[episode] || [])
+    .map(([other, score]) => ({ ...index.episodes[String(other)], score }))
+    .filter(related => related.slug)
+}
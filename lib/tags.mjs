@@ -0,0 +1,44 @@
+import fs from 'node:fs/promises'
+import path from 'node:path'
+
+// Written by scripts/consolidate-tags.py --index-only (npm run build): canonical
+// tags with episode counts, the spellings merged into each, and co-occurrence
+const tagIndexPath = path.join(process.cwd(), 'public', 'microbinfie-index', 'tags.json')
+// Co-occurring tags offered as related topics for a selected tag
+const RELATED_TAGS = 6
+
+/**
+ * Load the tag index, or null if it has not been built
+ */
+async function loadTagIndex() {
+  let raw
+  try {
+    raw = await fs.readFile(tagIndexPath, 'utf8')
+  } catch {
+    return null
+  }
+  return JSON.parse(raw)
+}
+
+/**
+ * Map episode tags onto the canonical vocabulary (so "antibiotic-resistance"
+ * and "antimicrobial-resistance" are one topic even before the MDX files are
+ * rewritten) and return { episodes, tagCounts: {tag: episodes}, relatedTags: {tag: [tag, ...]} }.
+ * Without the index, episodes are returned unchanged with no counts or related tags.
+ */
+export async function applyTagIndex(episodes) {
+  const index = await loadTagIndex()
+  if (!index) return { episodes, tagCounts: {}, relatedTags: {} }
+
+  const aliases = index.aliases || {}
+  const canonical = episodes.map(episode => (
+    Array.isArray(episode.tags)
+      ? { ...episode, tags: [...new Set(episode.tags.map(tag => aliases[tag] || tag))] }
+      : episode
+  ))
+  const relatedTags = {}
+  for (const [tag, others] of Object.entries(index.cooccurrence || {})) {
+    relatedTags[tag] = others.slice(0, RELATED_TAGS).map(([other]) => other)
+  }
+  return { episodes: canonical, tagCounts: Object.fromEntries(index.tags || []), relatedTags }
+}
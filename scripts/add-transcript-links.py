@@ -3,25 +3,29 @@
 Add transcript links to MicroBinfie episode frontmatter.
 
 This script checks for existing transcripts and adds the link to the frontmatter.
+Files that need a new link are patched in one batch across a process pool;
+only the `transcript` line changes.
 """
 
+import argparse
 import re
 from pathlib import Path
-import frontmatter
+from episode_catalog import load_catalog, mdx_path, transcript_link
+from mdx_frontmatter import patch_many
 
 # Configuration
 TRANSCRIPT_DIR = Path("public/microbinfie-transcripts")
 CONTENT_DIR = Path("content/microbinfie")
 
-def extract_episode_number_from_filename(filename):
-    """Extract episode number from MDX filename like mb-147-nextflow.mdx."""
-    match = re.match(r'mb-(\d+)-', filename)
-    if match:
-        return int(match.group(1))
-    return None
+def parse_args():
+    parser = argparse.ArgumentParser(description="Add transcript links to MicroBinfie episode frontmatter.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes used to patch files (default: one per CPU)')
+    return parser.parse_args()
 
 def main():
     """Add transcript links to MDX frontmatter."""
+    args = parse_args()
     
     if not TRANSCRIPT_DIR.exists():
         print(f"❌ Transcript directory not found: {TRANSCRIPT_DIR}")
@@ -39,9 +43,13 @@ def main():
     updated = 0
     skipped = 0
     
-    # Process all MDX files
-    for mdx_file in sorted(CONTENT_DIR.glob("mb-*.mdx")):
-        episode_num = extract_episode_number_from_filename(mdx_file.name)
+    # Process all cataloged MDX files; only files needing a change are patched
+    patches = []
+    catalog = load_catalog(CONTENT_DIR, verbose=True)
+    for name in sorted(catalog):
+        entry = catalog[name]
+        mdx_file = mdx_path(entry, CONTENT_DIR)
+        episode_num = entry['episode']
         
         if not episode_num:
             print(f"⚠️  Can't extract episode number: {mdx_file.name}")
@@ -54,29 +62,25 @@ def main():
             skipped += 1
             continue
         
-        try:
-            # Load the MDX file
-            post = frontmatter.load(mdx_file)
-            transcript_path = f"/microbinfie-transcripts/episode-{episode_num:02d}.txt"
-            
-            # Check if already has correct transcript link
-            if post.get('transcript') == transcript_path:
-                print(f"✓  Episode {episode_num:3d}: Already has transcript - {mdx_file.name}")
-                skipped += 1
-                continue
-            
-            # Add transcript to frontmatter
-            post['transcript'] = transcript_path
-            
-            # Write back to file
-            with open(mdx_file, 'wb') as f:
-                frontmatter.dump(post, f)
-            
-            print(f"✅ Episode {episode_num:3d}: Added transcript link - {mdx_file.name}")
+        transcript_path = transcript_link(episode_num)
+        
+        # Check if already has correct transcript link
+        if entry.get('transcript') == transcript_path:
+            print(f"✓  Episode {episode_num:3d}: Already has transcript - {mdx_file.name}")
+            skipped += 1
+            continue
+        
+        patches.append((mdx_file, {'transcript': transcript_path}))
+    
+    for mdx_file, written, error in patch_many(patches, workers=args.workers):
+        if error:
+            print(f"❌ {mdx_file.name}: Error - {error}")
+            skipped += 1
+        elif written:
+            print(f"✅ Added transcript link - {mdx_file.name}")
             updated += 1
-            
-        except Exception as e:
-            print(f"❌ Episode {episode_num:3d}: Error - {e}")
+        else:
+            print(f"✓  Already up to date - {mdx_file.name}")
             skipped += 1
     
     print(f"\n{'='*60}")
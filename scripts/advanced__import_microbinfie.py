@@ -1,14 +1,15 @@
-import requests
 from openai import OpenAI
-from bs4 import BeautifulSoup
 from os import  path, getenv, makedirs
 from datetime import datetime
+from podcast_feed import fetch_feed
 import textwrap
 import argparse
 from pydub import AudioSegment
 from dotenv import load_dotenv
 import logging 
 import re
+from pathlib import Path
+from downloader import download_file, is_complete, make_session
 rss_feed  = 'https://feeds.soundcloud.com/users/soundcloud:users:698218776/sounds.rss'
 
 # Configure logging
@@ -22,24 +23,23 @@ def load_credentials(crendentials_file=".credentials"):
     return credentials
 
 def binfie_rss(rss_feed):
-    r = requests.get(rss_feed)
-    soup = BeautifulSoup(r.content, features='html.parser')
-    articles = soup.findAll('item')      
+    items, _status = fetch_feed(rss_feed)
     article_list = []
-    for a in articles:
-        title = a.find('title').text.replace(':', ' ')
+    for a in items:
+        title = a['title'].replace(':', ' ')
         episode_number_regex = re.match(r'(\d+)\s', title)
         if episode_number_regex:
             episode_number = episode_number_regex.group(1)
         else:
             episode_number = None
-        safe_name = a.find('link').next.strip().split('/')[-1]
-        mp3_url = a.find('enclosure')['url']
-        link = a.find('link').next.strip()
-        tidy_date = ' '.join(a.find('pubdate').text.split(' ')[:4])
+        safe_name = a['link'].split('/')[-1]
+        mp3_url = a['audio_url']
+        mp3_length = a['audio_length']
+        link = a['link']
+        tidy_date = ' '.join(a['pub_date'].split(' ')[:4])
         published = datetime.strptime(tidy_date, "%a, %d %b %Y")
-        desc = a.find('itunes:summary').next
-        track_id = a.find('guid').next.split('/')[1]
+        desc = a['summary']
+        track_id = a['guid'].split('/')[1]
         emb = f'<iframe width="100%" height="166" scrolling="no" frameborder="no" allow="autoplay" src="https://w.soundcloud.com/player/?url=https%3A//api.soundcloud.com/tracks/{track_id}&color=%23ff5500&auto_play=false&hide_related=false&show_comments=true&show_user=true&show_reposts=false&show_teaser=false"></iframe><div style="font-size: 10px; color: #cccccc;line-break: anywhere;word-break: normal;overflow: hidden;white-space: nowrap;text-overflow: ellipsis; font-family: Interstate,Lucida Grande,Lucida Sans Unicode,Lucida Sans,Garuda,Verdana,Tahoma,sans-serif;font-weight: 100;"><a href="https://soundcloud.com/microbinfie" title="Micro Binfie Podcast" target="_blank" style="color: #cccccc; text-decoration: none;">Micro Binfie Podcast</a> · <a href="https://soundcloud.com/microbinfie/40-a-crash-course-in-sars-cov-2-bioinformatics" title="{title}" target="_blank" style="color: #cccccc; text-decoration: none;">40 A crash course in SARS-CoV-2 bioinformatics</a></div>'
 
         # emb =  f'{link}'
@@ -51,6 +51,7 @@ def binfie_rss(rss_feed):
             'safe_name': safe_name,
             'embed': emb,
             'mp3_url': mp3_url,
+            'mp3_length': mp3_length,
             'episode_number': episode_number
             }
         article_list.append(article)
@@ -163,6 +164,8 @@ def main():
     load_credentials()
     summary_assistant, tidy_assistant = create_assistants()
 
+    session = make_session()
+
     makedirs(args.work_dir, exist_ok=True)
     # Ensure transcript directory exists (now under public for direct serving)
     makedirs(args.transcript_dir, exist_ok=True)
@@ -179,11 +182,9 @@ def main():
                 transcript_path = path.join(args.transcript_dir, 'episode-' + episode_number + '.txt')
                 # Download the audio file if not found 
                 mp3_filepath = path.join(args.work_dir, f"MicroBinfie podcast - {episode_number} - {safe_title}.mp3")
-                if not path.exists(mp3_filepath) or path.getsize(mp3_filepath) == 0:
+                if not is_complete(Path(mp3_filepath), article['mp3_length']):
                     logging.info(f"Downloading {article['mp3_url']} to {mp3_filepath}")
-                    response = requests.get(article['mp3_url'])
-                    with open(mp3_filepath, 'wb') as mp3_file:
-                        mp3_file.write(response.content)
+                    download_file(article['mp3_url'], mp3_filepath, article['mp3_length'], session=session)
                 # Transcribe the audio file if not found
                 if not path.exists(transcript_path) or path.getsize(transcript_path) == 0:
                     logging.info(f"Transcribing {mp3_filepath} to {transcript_path}")
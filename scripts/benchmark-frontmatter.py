@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: frontmatter.load vs the header-only reader in mdx_frontmatter.py.
+
+Parses every content/microbinfie/*.mdx file with each reader and reports the
+best of several passes, so the speedup from stopping at the closing `---`,
+from libyaml's CSafeLoader and from parsing only the keys a lookup needs
+(read_fields, as the episode catalog does) can be seen separately.
+
+Note that python-frontmatter itself switches to CSafeLoader when PyYAML has
+libyaml, so the pure-Python row shows what a build without libyaml costs.
+
+Usage (from the repo root):
+    python scripts/benchmark-frontmatter.py
+    python scripts/benchmark-frontmatter.py --repeat 10 --content-dir content
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import yaml
+
+import mdx_frontmatter
+from episode_catalog import CATALOG_FIELDS, CONTENT_DIR
+
+
+def time_reader(read, files, repeat):
+    """Best wall time (seconds) of `repeat` passes reading every file."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for path in files:
+            read(path)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def read_header_pure(path):
+    """read_header forced onto the pure-Python SafeLoader."""
+    original = mdx_frontmatter.SafeLoader
+    mdx_frontmatter.SafeLoader = yaml.SafeLoader
+    try:
+        return mdx_frontmatter.read_header(path)
+    finally:
+        mdx_frontmatter.SafeLoader = original
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark MDX frontmatter readers.")
+    parser.add_argument('--content-dir', type=Path, default=CONTENT_DIR,
+                        help=f'Directory searched recursively for .mdx files (default: {CONTENT_DIR})')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes per reader; best is reported (default: 5)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    files = sorted(args.content_dir.rglob('*.mdx'))
+    if not files:
+        print(f"❌ No .mdx files found in {args.content_dir}")
+        return
+
+    readers = []
+    try:
+        import frontmatter
+        readers.append(('frontmatter.load (full file)', frontmatter.load))
+    except ImportError:
+        print("⚠️  python-frontmatter not installed; skipping the baseline")
+    readers.append(('read_header (header only, SafeLoader)', read_header_pure))
+    if mdx_frontmatter.SafeLoader is not yaml.SafeLoader:
+        readers.append(('read_header (header only, CSafeLoader)', mdx_frontmatter.read_header))
+    else:
+        print("⚠️  PyYAML was built without libyaml; CSafeLoader unavailable")
+    readers.append((f"read_fields ({', '.join(CATALOG_FIELDS)})",
+                    lambda path: mdx_frontmatter.read_fields(path, CATALOG_FIELDS)))
+
+    print(f"📊 {len(files)} MDX files, best of {args.repeat} pass(es)\n")
+    baseline = None
+    for label, read in readers:
+        elapsed = time_reader(read, files, args.repeat)
+        baseline = baseline or elapsed
+        print(f"  {label:<46} {elapsed * 1000:8.1f} ms  "
+              f"{elapsed / len(files) * 1e6:7.0f} µs/file  {baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Offline, reproducible benchmark of the MicroBinfie podcast pipeline.
+
+Nothing touches SoundCloud, OpenAI or Anthropic: the feed is built from the
+fixture feed (scripts/fixtures/microbinfie-feed.xml) and the episode MDX
+files, audio is a synthetic MP3 generated with the bundled imageio_ffmpeg
+(tone bursts separated by short pauses, so the silence planner has work to
+do), MP3s are served from a local HTTP server, and the API clients are the
+stubs in offline_clients.py with a configurable latency.
+
+Stages:
+  feed-parse     parse the fixture feed, replicated to --feed-items items
+  guid-lookup    build the episode catalog cold, reload it warm, resolve every feed guid
+  download       fetch --downloads copies of the MP3 from the local server
+  chunking       silence planning + single-pass ffmpeg segmentation of the MP3
+  transcription  transcribe_audio with the stub client (parallel chunks, merge, write)
+  formatting     format --segments synthetic diarized segments with the segment index
+  frontmatter    patch a field in every MDX file (write pass + no-op pass)
+  enhance        run_enhancements over real transcripts with the stub LLM client
+
+Each stage runs in a fresh process inside a scratch directory holding a copy
+of content/microbinfie, so peak RSS is per stage and the working tree and
+.cache/ are never touched. Save results with --json and compare a later run
+against them with --baseline to spot regressions.
+
+Usage (from the repo root):
+    python scripts/benchmark-pipeline.py
+    python scripts/benchmark-pipeline.py --stages feed-parse guid-lookup --json bench.json
+    python scripts/benchmark-pipeline.py --baseline bench.json --latency 0.2
+"""
+
+import argparse
+import contextlib
+import functools
+import http.server
+import io
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import imageio_ffmpeg
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from episode_catalog import CONTENT_DIR, TRANSCRIPT_DIR  # noqa: E402
+from mdx_frontmatter import read_fields  # noqa: E402
+from podcast_feed import FIXTURE_FEED  # noqa: E402
+
+STAGES = ('feed-parse', 'guid-lookup', 'download', 'chunking', 'transcription',
+          'formatting', 'frontmatter', 'enhance')
+AUDIO_NAME = "synthetic-episode.mp3"
+AUDIO_BITRATE_KBPS = 64
+# Synthetic speech: 8.5s of modulated tone, then 0.5s of silence
+SYNTHETIC_AUDIO_EXPR = "if(lt(mod(t,9),8.5),0.3*sin(2*PI*220*t)*(0.6+0.4*sin(2*PI*3*t)),0)"
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ---------------------------------------------------------------------------
+# Fixtures (built once in the parent process)
+# ---------------------------------------------------------------------------
+
+def make_synthetic_mp3(path, seconds):
+    """Encode a mono MP3 of tone bursts and pauses with the bundled ffmpeg."""
+    cmd = [
+        imageio_ffmpeg.get_ffmpeg_exe(), '-hide_banner', '-loglevel', 'error', '-y',
+        '-f', 'lavfi', '-i', f"aevalsrc='{SYNTHETIC_AUDIO_EXPR}':s=16000:d={seconds}",
+        '-ac', '1', '-c:a', 'libmp3lame', '-b:a', f'{AUDIO_BITRATE_KBPS}k', str(path),
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def make_fixture_feed(path, content_dir, items, audio_url):
+    """Write an RSS feed with one item per MDX guid, padded with synthetic items to `items`."""
+    tree = ET.parse(FIXTURE_FEED)
+    channel = tree.getroot().find('channel')
+    template = channel.find('item')
+    for item in channel.findall('item'):
+        channel.remove(item)
+
+    episodes = []
+    for mdx_file in sorted(content_dir.glob('mb-*.mdx')):
+        fields = read_fields(mdx_file, ('guid', 'title'))
+        if fields.get('guid'):
+            episodes.append((fields['guid'], fields.get('title') or mdx_file.stem))
+    n = 0
+    while n < items:
+        guid, title = episodes[n] if n < len(episodes) else (f"tag:benchmark,2025:tracks/{n}", f"Synthetic {n}")
+        item = ET.fromstring(ET.tostring(template))
+        item.find('guid').text = guid
+        item.find('title').text = title
+        item.find('enclosure').set('url', audio_url)
+        channel.append(item)
+        n += 1
+    ET.register_namespace('itunes', 'http://www.itunes.com/dtds/podcast-1.0.dtd')
+    ET.register_namespace('atom', 'http://www.w3.org/2005/Atom')
+    tree.write(path, encoding='utf-8', xml_declaration=True)
+
+
+def prepare_workdir(workdir, opts):
+    """Copy the episode MDX files and build the feed and audio fixtures."""
+    shutil.copytree(REPO_DIR / CONTENT_DIR, workdir / CONTENT_DIR)
+    (workdir / 'fixtures').mkdir()
+    make_synthetic_mp3(workdir / 'fixtures' / AUDIO_NAME, int(opts.audio_minutes * 60))
+    make_fixture_feed(workdir / 'fixtures' / 'feed.xml', workdir / CONTENT_DIR, opts.feed_items,
+                      f"http://127.0.0.1/{AUDIO_NAME}")
+
+
+# ---------------------------------------------------------------------------
+# Stages (each runs in its own process with the scratch directory as cwd)
+# ---------------------------------------------------------------------------
+
+def stage_feed_parse(opts):
+    from podcast_feed import parse_feed
+    with open('fixtures/feed.xml', 'rb') as f:
+        data = f.read()
+    started = time.perf_counter()
+    for _ in range(opts.repeat):
+        items = parse_feed(io.BytesIO(data))
+    wall = (time.perf_counter() - started) / opts.repeat
+    return {'wall': wall, 'notes': f"{len(items)} items, {len(data) / 1e6:.1f} MB"}
+
+
+def stage_guid_lookup(opts):
+    from episode_catalog import catalog_by_guid, load_catalog
+    from podcast_feed import parse_feed
+    with open('fixtures/feed.xml', 'rb') as f:
+        items = parse_feed(f)
+    started = time.perf_counter()
+    cold = catalog_by_guid(load_catalog())
+    cold_wall = time.perf_counter() - started
+    started = time.perf_counter()
+    warm = catalog_by_guid(load_catalog())
+    found = sum(1 for item in items if warm.get(item['guid']))
+    warm_wall = time.perf_counter() - started
+    assert len(cold) == len(warm)
+    return {'wall': cold_wall + warm_wall,
+            'notes': f"cold {cold_wall * 1000:.0f} ms, warm {warm_wall * 1000:.0f} ms, {found} matched"}
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def stage_download(opts):
+    from downloader import download_many
+    server = http.server.ThreadingHTTPServer(
+        ('127.0.0.1', 0), functools.partial(_QuietHandler, directory='fixtures'))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/{AUDIO_NAME}"
+    size = Path('fixtures', AUDIO_NAME).stat().st_size
+    jobs = [{'url': url, 'dest': Path('downloads', f"episode-{i}.mp3"), 'expected_size': size}
+            for i in range(opts.downloads)]
+    started = time.perf_counter()
+    results = download_many(jobs, max_workers=4)
+    wall = time.perf_counter() - started
+    server.shutdown()
+    downloaded = sum(Path(p).stat().st_size for p in results.values() if p)
+    return {'wall': wall, 'bytes_down': downloaded, 'notes': f"{opts.downloads} file(s)"}
+
+
+def _transcribe_module():
+    from script_loader import load_script
+    return load_script('transcribe-episodes.py')
+
+
+def stage_chunking(opts):
+    transcribe = _transcribe_module()
+    started = time.perf_counter()
+    chunks = [(offset, buf.getbuffer().nbytes)
+              for offset, buf in transcribe.iter_audio_chunks(Path('fixtures', AUDIO_NAME))]
+    wall = time.perf_counter() - started
+    return {'wall': wall, 'notes': f"{len(chunks)} chunk(s), {sum(n for _, n in chunks) / 1e6:.1f} MB"}
+
+
+def stage_transcription(opts):
+    from offline_clients import FakeOpenAI
+    transcribe = _transcribe_module()
+    client = FakeOpenAI(latency=opts.latency, bitrate_kbps=AUDIO_BITRATE_KBPS, seed=1)
+    out = Path('transcripts', 'episode-01.txt')
+    out.parent.mkdir(exist_ok=True)
+    started = time.perf_counter()
+    ok = transcribe.transcribe_audio(Path('fixtures', AUDIO_NAME), out, client, workers=4, overwrite=True)
+    wall = time.perf_counter() - started
+    if not ok:
+        raise RuntimeError("transcription failed")
+    return {'wall': wall, 'api_calls': client.calls, 'bytes_up': client.uploaded_bytes,
+            'notes': f"{out.stat().st_size / 1e3:.0f} kB transcript"}
+
+
+def stage_formatting(opts):
+    transcribe = _transcribe_module()
+    words = "so the assembly graph had a plasmid that kraken could not place".split()
+    segments = [{
+        'speaker': 'A' if i % 4 < 2 else 'B',
+        'text': ' '.join(words[i % 5:]) + '.',
+        'start': i * 3.0,
+        'end': i * 3.0 + 2.8,
+    } for i in range(opts.segments)]
+    started = time.perf_counter()
+    text, records = transcribe.format_diarized_transcript_with_index(segments)
+    wall = time.perf_counter() - started
+    return {'wall': wall, 'notes': f"{len(segments)} segments -> {len(text) / 1e6:.1f} MB, {len(records)} records"}
+
+
+def stage_frontmatter(opts):
+    from mdx_frontmatter import patch_many
+    files = sorted(CONTENT_DIR.glob('mb-*.mdx'))
+    patches = [(path, {'transcript': f"/microbinfie-transcripts/benchmark-{i}.txt"}) for i, path in enumerate(files)]
+    started = time.perf_counter()
+    written = sum(1 for _, w, _ in patch_many(patches) if w)
+    write_wall = time.perf_counter() - started
+    started = time.perf_counter()
+    unchanged = sum(1 for _, w, _ in patch_many(patches) if not w)
+    noop_wall = time.perf_counter() - started
+    return {'wall': write_wall + noop_wall,
+            'notes': f"{written} written in {write_wall * 1000:.0f} ms, "
+                     f"{unchanged} unchanged in {noop_wall * 1000:.0f} ms"}
+
+
+def stage_enhance(opts):
+    from offline_clients import FakeAnthropic
+    from rate_limit import ApiRateLimiter
+    from script_loader import load_script
+    enhance = load_script('enhance-episodes-from-transcripts.py')
+    transcripts = sorted((REPO_DIR / TRANSCRIPT_DIR).glob('episode-*.txt'))[:opts.enhance_episodes]
+    jobs = [{'num': i, 'title': path.stem, 'content': '', 'guests': [],
+             'transcript': path.read_text(encoding='utf-8')} for i, path in enumerate(transcripts)]
+    client = FakeAnthropic(latency=opts.latency, seed=1)
+    started = time.perf_counter()
+    done = sum(1 for _, result in enhance.run_enhancements(
+        jobs, client, workers=4, limiter=ApiRateLimiter(), resolver=enhance.ModelResolver(),
+        cache_results=False) if result)
+    wall = time.perf_counter() - started
+    return {'wall': wall, 'api_calls': client.calls, 'notes': f"{done} episode(s)"}
+
+
+STAGE_FUNCTIONS = {
+    'feed-parse': stage_feed_parse,
+    'guid-lookup': stage_guid_lookup,
+    'download': stage_download,
+    'chunking': stage_chunking,
+    'transcription': stage_transcription,
+    'formatting': stage_formatting,
+    'frontmatter': stage_frontmatter,
+    'enhance': stage_enhance,
+}
+
+
+def run_stage(stage, workdir, opts):
+    """Child-process entry point: run one stage and attach its resource usage."""
+    os.chdir(workdir)
+    sink = contextlib.nullcontext() if opts.verbose else contextlib.redirect_stdout(io.StringIO())
+    with sink:
+        result = STAGE_FUNCTIONS[stage](opts)
+    result.update(stage=stage, peak_rss_mb=round(peak_rss_mb(), 1),
+                  child_peak_rss_mb=round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1))
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def print_table(results, baseline=None):
+    baseline = {r['stage']: r for r in baseline or []}
+    print(f"\n{'Stage':<14} {'Wall':>9} {'vs base':>8} {'API':>5} {'Down MB':>8} {'Up MB':>7} "
+          f"{'RSS MB':>7}  Notes")
+    print('-' * 100)
+    for r in results:
+        base = baseline.get(r['stage'])
+        delta = f"{(r['wall'] / base['wall'] - 1) * 100:+.0f}%" if base and base.get('wall') else ''
+        print(f"{r['stage']:<14} {r['wall'] * 1000:7.1f}ms {delta:>8} {r.get('api_calls', 0):>5} "
+              f"{r.get('bytes_down', 0) / 1e6:>8.1f} {r.get('bytes_up', 0) / 1e6:>7.1f} "
+              f"{r['peak_rss_mb']:>7.1f}  {r.get('notes', '')}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the MicroBinfie podcast pipeline.")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                        help='Stages to run (default: all)')
+    parser.add_argument('--latency', type=float, default=0.5,
+                        help='Seconds per stub API call (default: 0.5)')
+    parser.add_argument('--audio-minutes', type=float, default=45,
+                        help='Length of the synthetic MP3 (default: 45)')
+    parser.add_argument('--feed-items', type=int, default=2000,
+                        help='Items in the fixture feed (default: 2000)')
+    parser.add_argument('--downloads', type=int, default=3,
+                        help='MP3 copies fetched in the download stage (default: 3)')
+    parser.add_argument('--segments', type=int, default=20000,
+                        help='Synthetic segments in the formatting stage (default: 20000)')
+    parser.add_argument('--enhance-episodes', type=int, default=8,
+                        help='Transcripts run through the enhance stage (default: 8)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Repeats for the feed-parse stage; the mean is reported (default: 5)')
+    parser.add_argument('--json', type=Path, help='Write results to this JSON file')
+    parser.add_argument('--baseline', type=Path, help='Compare wall times against a previous --json file')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch directory')
+    parser.add_argument('--verbose', action='store_true', help='Show the scripts\' own progress output')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    workdir = Path(tempfile.mkdtemp(prefix='microbinfie-bench-'))
+    print(f"🧪 Preparing fixtures in {workdir} ({args.audio_minutes:g} min synthetic MP3, "
+          f"{args.feed_items} feed items)...")
+    started = time.monotonic()
+    prepare_workdir(workdir, args)
+    print(f"   ready in {time.monotonic() - started:.1f}s")
+
+    results = []
+    # A fresh process per stage keeps peak RSS and imports per stage
+    context = multiprocessing.get_context('spawn')
+    try:
+        for stage in args.stages:
+            print(f"⏱️  {stage}...")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results.append(pool.submit(run_stage, stage, workdir, args).result())
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = json.loads(args.baseline.read_text())['results'] if args.baseline else None
+    print_table(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'options': {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+            'results': results,
+        }, indent=2))
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Build the MicroBinfie guest index (run by `npm run build`).
+
+Merges the guests listed across content/microbinfie/*.mdx into one entry
+per person (see scripts/guest_index.py for the matching rules) and writes
+public/microbinfie-index/guests.json:
+
+  {"version": 1, "guests": [{"id", "name", "aliases": [...], "affiliation", "url",
+                              "episodes": [{"slug", "title", "date"}, ...]}, ...]}
+
+Guests are ordered by number of appearances, then surname. lib/guests.mjs
+reads this file instead of parsing every MDX file when the site builds.
+
+Usage (from the repo root):
+    python scripts/build-guest-index.py
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+try:
+    from episode_catalog import CONTENT_DIR
+    from guest_index import GUEST_INDEX_PATH, build_guest_index, is_host_name, write_guest_index
+except ImportError as e:
+    # lib/guests.mjs scans the MDX files itself without the index
+    print(f"⚠️  Skipping the guest index: {e} (pip install -r requirements.txt)")
+    sys.exit(0)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the merged MicroBinfie guest index for the site.")
+    parser.add_argument('--out', type=Path, default=GUEST_INDEX_PATH,
+                        help=f'Output file (default: {GUEST_INDEX_PATH})')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    started = time.monotonic()
+    if not CONTENT_DIR.exists():
+        print(f"❌ Content directory not found: {CONTENT_DIR}")
+        sys.exit(1)
+    # Hosts listed as guests by mistake are left out
+    guests = build_guest_index(exclude=is_host_name)
+    merged = [g for g in guests if g['aliases']]
+    for guest in merged:
+        print(f"  🔗 {guest['name']} ({guest['id']}): merged {', '.join(guest['aliases'])}")
+    size = write_guest_index(guests, args.out)
+    print(f"👥 Guest index: {len(guests)} guests ({len(merged)} merged from variant spellings), "
+          f"{size / 1e3:.1f} kB -> {args.out} ({time.monotonic() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
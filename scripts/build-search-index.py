@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Build the static MicroBinfie episode search index (run by `npm run build`).
+
+Reads content/microbinfie/*.mdx frontmatter (title, tags, guests) and the
+transcripts (via the incremental index in scripts/transcript_index.py) and
+writes public/microbinfie-index/search/:
+
+  manifest.json   {"version", "prefixLength", "stopwords": [...], "shards": [...],
+                   "docs": [{"slug", "title"}, ...]}
+  <pr>.json       {term: [[doc, weight], ...]} for terms starting with <pr>,
+                  best-weighted episodes first
+
+Weights are precomputed (field boosts for title/tags/guests plus a BM25 score
+for the transcript), so the browser only sums them. A query fetches the
+manifest once and then just the shard for each two-letter term prefix;
+lib/microbinfieSearch.mjs does the client side. Compact JSON with integer doc
+ids and rounded weights keeps shards small once gzipped.
+
+Usage (from the repo root):
+    python scripts/build-search-index.py
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+try:
+    from episode_catalog import CONTENT_DIR, TRANSCRIPT_DIR, load_catalog, mdx_path
+    from mdx_frontmatter import read_fields
+    from transcript_index import (
+        BM25_B, BM25_K1, INDEX_DIR, PREFIX_LEN, STOPWORDS,
+        load_docs, load_shard, term_prefix, tokenize, update_index,
+    )
+except ImportError as e:
+    # Search still matches titles and tags without the index; never fail the deploy over it
+    print(f"⚠️  Skipping the search index: {e} (pip install -r requirements.txt)")
+    sys.exit(0)
+
+SEARCH_DIR = Path("public/microbinfie-index/search")
+SEARCH_VERSION = 1
+# Added to an episode's weight for a term found in these frontmatter fields
+FIELD_WEIGHTS = {'title': 6.0, 'tags': 4.0, 'guests': 4.0}
+# Transcript-only terms seen fewer times than this across all episodes are dropped
+MIN_TRANSCRIPT_HITS = 2
+
+
+def episode_metadata(content_dir=CONTENT_DIR):
+    """Return [{'slug', 'title', 'episode', 'date', 'fields': {field: text}}], newest first."""
+    docs = []
+    for entry in load_catalog(content_dir).values():
+        post = read_fields(mdx_path(entry, content_dir), ('title', 'date', 'tags', 'guests'))
+        guests = [g.get('name', '') for g in post.get('guests') or [] if isinstance(g, dict)]
+        docs.append({
+            'slug': entry['slug'],
+            'title': post.get('title') or entry['slug'],
+            'episode': entry['episode'],
+            'date': str(post.get('date') or ''),
+            'fields': {
+                'title': post.get('title') or '',
+                'tags': ' '.join(str(t) for t in post.get('tags') or []),
+                'guests': ' '.join(guests),
+            },
+        })
+    docs.sort(key=lambda d: (d['date'], d['slug']), reverse=True)
+    return docs
+
+
+def build_postings(docs, index_dir=INDEX_DIR):
+    """Return {prefix: {term: {doc id: weight}}} combining frontmatter fields and transcripts."""
+    shards = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
+    for doc_id, doc in enumerate(docs):
+        for field, text in doc['fields'].items():
+            for term in set(tokenize(text)):
+                if len(term) >= PREFIX_LEN and term not in STOPWORDS:
+                    shards[term_prefix(term)][term][doc_id] += FIELD_WEIGHTS[field]
+
+    transcript_docs = load_docs(index_dir)
+    if not transcript_docs:
+        return shards
+    doc_ids = {str(doc['episode']): doc_id for doc_id, doc in enumerate(docs) if doc['episode'] is not None}
+    avg_length = sum(d['length'] for d in transcript_docs.values()) / len(transcript_docs)
+    for prefix_file in sorted((index_dir / 'terms').glob('*.json')):
+        prefix = prefix_file.stem
+        if len(prefix) < PREFIX_LEN:
+            continue
+        for term, by_episode in load_shard(prefix, index_dir).items():
+            hits = {episode: len(positions) for episode, positions in by_episode.items() if episode in doc_ids}
+            if not hits or (sum(hits.values()) < MIN_TRANSCRIPT_HITS and term not in shards[prefix]):
+                continue
+            idf = math.log(1 + (len(transcript_docs) - len(hits) + 0.5) / (len(hits) + 0.5))
+            for episode, tf in hits.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * transcript_docs[episode]['length'] / avg_length)
+                shards[prefix][term][doc_ids[episode]] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+    return shards
+
+
+def write_search_index(docs, shards, out_dir=SEARCH_DIR):
+    """Write the manifest and shards into a fresh directory, then swap it into place."""
+    tmp_dir = out_dir.with_name(out_dir.name + '.tmp')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    total_bytes = 0
+    for prefix, terms in sorted(shards.items()):
+        shard = {
+            term: [[doc_id, round(weight, 2)] for doc_id, weight in sorted(weights.items(), key=lambda kv: -kv[1])]
+            for term, weights in sorted(terms.items())
+        }
+        data = json.dumps(shard, ensure_ascii=False, separators=(',', ':'))
+        (tmp_dir / f"{prefix}.json").write_text(data, encoding='utf-8')
+        total_bytes += len(data)
+    manifest = {
+        'version': SEARCH_VERSION,
+        'prefixLength': PREFIX_LEN,
+        'stopwords': sorted(STOPWORDS),
+        'shards': sorted(shards),
+        'docs': [{'slug': doc['slug'], 'title': doc['title']} for doc in docs],
+    }
+    (tmp_dir / 'manifest.json').write_text(
+        json.dumps(manifest, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    os.replace(tmp_dir, out_dir)
+    return total_bytes
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the static MicroBinfie search index for the site.")
+    parser.add_argument('--out', type=Path, default=SEARCH_DIR,
+                        help=f'Output directory (default: {SEARCH_DIR})')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    started = time.monotonic()
+    if not CONTENT_DIR.exists():
+        print(f"❌ Content directory not found: {CONTENT_DIR}")
+        sys.exit(1)
+    docs = episode_metadata()
+    if TRANSCRIPT_DIR.exists():
+        update_index(verbose=True)
+    shards = build_postings(docs)
+    total_bytes = write_search_index(docs, shards, args.out)
+    print(f"🔎 Search index: {len(docs)} episodes, {len(shards)} shards, "
+          f"{total_bytes / 1e6:.1f} MB -> {args.out} ({time.monotonic() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Consolidate MicroBinfie episode tags into one canonical vocabulary.
+
+Near-duplicate tags across content/microbinfie/*.mdx ("E-coli" / "e-coli",
+"mlst-analysis" / "mlst", "variant-detection" / "variant-calling") are
+clustered (see scripts/tag_index.py for the rules and
+scripts/data/tag-vocabulary.yml for curated merges), every episode's `tags:`
+is rewritten to the canonical spellings in one pass, and the tag index is
+written to public/microbinfie-index/tags.json:
+
+  {"version": 1, "episodes": [{"slug", "title"}, ...], "tags": [[tag, count], ...],
+   "tagEpisodes": {tag: [episode ids]}, "cooccurrence": {tag: [[other tag, count], ...]},
+   "aliases": {merged spelling: canonical tag}}
+
+Episode ids are positions in "episodes" (newest first). lib/tags.mjs reads
+it for the episode list's topic filter.
+
+Usage (from the repo root):
+    python scripts/consolidate-tags.py --dry-run      # print the merges only
+    python scripts/consolidate-tags.py                # rewrite tags and write the index
+    python scripts/consolidate-tags.py --index-only   # write the index, leave MDX untouched (npm run build)
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+try:
+    from episode_catalog import CONTENT_DIR
+    from mdx_frontmatter import patch_many
+    from tag_index import (TAG_INDEX_PATH, build_tag_index, build_tag_mapping, corpus_tag_counts,
+                           load_episode_tags, load_vocabulary, write_tag_index)
+except ImportError as e:
+    # Only the build's index step is optional; an explicit rewrite should fail loudly
+    print(f"⚠️  Skipping tag consolidation: {e} (pip install -r requirements.txt)")
+    sys.exit(0 if '--index-only' in sys.argv else 1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Merge near-duplicate episode tags and build the tag index.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--dry-run', action='store_true',
+                      help='Print the tag merges but write nothing')
+    mode.add_argument('--index-only', action='store_true',
+                      help='Write the index with canonical tags but leave the MDX files untouched')
+    parser.add_argument('--out', type=Path, default=TAG_INDEX_PATH,
+                        help=f'Index file (default: {TAG_INDEX_PATH})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes rewriting MDX files (default: one per CPU)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    started = time.monotonic()
+    if not CONTENT_DIR.exists():
+        print(f"❌ Content directory not found: {CONTENT_DIR}")
+        sys.exit(1)
+
+    episodes = load_episode_tags()
+    tag_counts = corpus_tag_counts(episodes)
+    mapping = build_tag_mapping(tag_counts, load_vocabulary())
+    merges = defaultdict(list)
+    for tag, canonical in mapping.items():
+        if tag != canonical:
+            merges[canonical].append(tag)
+    for canonical in sorted(merges):
+        variants = ', '.join(f"{t} ({tag_counts[t]})" for t in sorted(merges[canonical]))
+        print(f"  🔗 {canonical}: merged {variants}")
+
+    patches = []
+    for episode in episodes:
+        tags = list(dict.fromkeys(mapping[t] for t in episode['tags']))
+        if tags != episode['tags']:
+            patches.append((episode['mdx_file'], {'tags': tags}))
+        episode['tags'] = tags
+
+    canonical_count = len(set(mapping.values()))
+    print(f"🏷️  {len(tag_counts)} tags -> {canonical_count} canonical, "
+          f"{len(patches)}/{len(episodes)} episode(s) to rewrite")
+    if args.dry_run:
+        print("   Dry run: nothing written")
+        return
+
+    if not args.index_only and patches:
+        errors = 0
+        for mdx_file, written, error in patch_many(patches, args.workers):
+            if error:
+                print(f"❌ {Path(mdx_file).name}: {error}")
+                errors += 1
+        print(f"✏️  Rewrote tags in {len(patches) - errors} episode(s), {errors} errors")
+
+    size = write_tag_index(build_tag_index(episodes, mapping), args.out)
+    print(f"📇 Tag index: {canonical_count} tags, {size / 1e3:.1f} kB -> {args.out} "
+          f"({time.monotonic() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
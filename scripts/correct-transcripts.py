@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Apply ASR corrections (names, the show name, tool names) across all transcripts.
+
+The glossary is built from the 'transcripts' and 'tools' profiles of
+scripts/data/term-variants.yml, the hosts in scripts/data/hosts.yml
+and every guest name in the episode frontmatter, and compiled once into a
+single-pass TermNormalizer (see term_normalizer.py).
+
+Each public/microbinfie-transcripts/episode-*.txt is scanned through a
+read-only mmap in a process pool, matching on raw bytes, so unchanged files
+are never decoded or copied. Only files with corrections are rewritten
+(atomically), and their .segments.jsonl offsets are shifted to match. Every
+change is written to a unified-diff report for review.
+
+Usage (from the repo root):
+    python scripts/correct-transcripts.py --dry-run
+    python scripts/correct-transcripts.py
+    python scripts/correct-transcripts.py 12 13 --report /tmp/fixes.diff
+"""
+
+import argparse
+import bisect
+import mmap
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from episode_catalog import CONTENT_DIR, load_catalog, mdx_path
+from mdx_frontmatter import read_fields
+from guest_index import HOST_NAMES
+from term_normalizer import TermNormalizer, match_key, load_table
+from transcript_store import load_segment_index, segment_index_path, write_segment_index
+
+TRANSCRIPT_DIR = Path("public/microbinfie-transcripts")
+REPORT_PATH = Path(".cache/microbinfie/transcript-corrections.diff")
+# Curated profiles, applied before the generated host and guest entries
+GLOSSARY_PROFILES = ('transcripts', 'tools')
+# Batches smaller than this are corrected in-process
+MIN_POOL_BATCH = 16
+
+_normalizer = None
+
+
+def _ascii_fold(name):
+    """'João Carriço' -> 'Joao Carrico' (how ASR usually spells it)."""
+    return unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+
+
+def host_entries(host_names):
+    """Group HOST_NAMES by first name; the first spelling listed is the canonical one."""
+    groups = {}
+    for name in host_names:
+        first = re.split(r'[\s-]+', name.strip())[0].lower()
+        groups.setdefault(first, []).append(name)
+    return {names[0]: names[1:] for names in groups.values()}
+
+
+def guest_entries(content_dir=CONTENT_DIR):
+    """{guest name: variants} from episode frontmatter; single-word names are too ambiguous to use."""
+    entries = {}
+    for entry in load_catalog(content_dir).values():
+        for guest in read_fields(mdx_path(entry, content_dir), ('guests',)).get('guests') or []:
+            name = (guest.get('name') or '').strip() if isinstance(guest, dict) else ''
+            if len(name.split()) < 2 or name in entries:
+                continue
+            variants = {name.replace('-', ' '), _ascii_fold(name)} - {name}
+            entries[name] = sorted(v for v in variants if v.strip())
+    return entries
+
+
+def build_glossary(content_dir=CONTENT_DIR, profiles=GLOSSARY_PROFILES):
+    """Return the merged {canonical: [variants]} table.
+    Sources are merged in priority order; a spelling already claimed by an
+    earlier canonical is skipped, so curated entries win over generated ones.
+    """
+    sources = [load_table(profile) for profile in profiles]
+    sources += [host_entries(HOST_NAMES), guest_entries(content_dir)]
+    claimed = {}
+    glossary = {}
+    for table in sources:
+        for canonical, variants in table.items():
+            kept = [v for v in [canonical, *(variants or [])]
+                    if claimed.setdefault(match_key(v), canonical) == canonical]
+            if canonical in kept:
+                glossary.setdefault(canonical, []).extend(v for v in kept if v != canonical)
+    return glossary
+
+
+def _init_worker(glossary):
+    global _normalizer
+    _normalizer = TermNormalizer(glossary)
+
+
+def shift_offsets(records, spans):
+    """Move segment store byte offsets past replaced spans [(start, end, new bytes)].
+    A position inside a replaced span maps to the end of its replacement.
+    """
+    starts = [start for start, _, _ in spans]
+    shifts = [0]  # shifts[i]: total length change of the first i spans
+    for start, end, new in spans:
+        shifts.append(shifts[-1] + len(new) - (end - start))
+
+    def new_position(position):
+        i = bisect.bisect_right(starts, position) - 1  # last span starting at or before position
+        if i < 0:
+            return position
+        start, end, new = spans[i]
+        if position >= end:
+            return position + shifts[i + 1]
+        if position == start:
+            return position + shifts[i]
+        return start + shifts[i] + len(new)
+
+    shifted = []
+    for record in records:
+        start = new_position(record['offset'])
+        end = new_position(record['offset'] + record['length'])
+        shifted.append({**record, 'offset': start, 'length': end - start})
+    return shifted
+
+
+def apply_spans(data, spans, start=0, end=None):
+    """Return data[start:end] with the replaced spans inside it swapped in."""
+    end = len(data) if end is None else end
+    pieces = []
+    position = start
+    for span_start, span_end, new in spans:
+        pieces += [data[position:span_start], new]
+        position = span_end
+    pieces.append(data[position:end])
+    return b''.join(pieces)
+
+
+def diff_report(name, data, spans):
+    """Unified diff of just the changed lines, with no context (a transcript line is a whole
+    speaker block). Replacements never cross a line break, so line numbers are unchanged.
+    """
+    by_line = {}
+    for span in spans:
+        by_line.setdefault(data.rfind(b'\n', 0, span[0]) + 1, []).append(span)
+    hunks = [f"--- a/{name}\n+++ b/{name}\n"]
+    line_no = 1
+    previous = 0
+    for line_start, line_spans in by_line.items():
+        line_no += data[previous:line_start].count(b'\n')
+        previous = line_start
+        line_end = data.find(b'\n', line_start)
+        line_end = len(data) if line_end == -1 else line_end
+        old = data[line_start:line_end].decode('utf-8')
+        new = apply_spans(data, line_spans, line_start, line_end).decode('utf-8')
+        hunks.append(f"@@ -{line_no} +{line_no} @@\n-{old}\n+{new}\n")
+    return ''.join(hunks)
+
+
+def correct_file(path, dry_run=False):
+    """Correct one transcript; returns (path, Counter of (found, canonical), diff text, error or None)."""
+    path = Path(path)
+    try:
+        if path.stat().st_size == 0:
+            return path, Counter(), '', None
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            spans = list(_normalizer.byte_replacements(data))
+            if not spans:
+                return path, Counter(), '', None
+            counts = Counter((data[start:end].decode('utf-8'), new.decode('utf-8')) for start, end, new in spans)
+            new_data = apply_spans(data, spans)
+            diff = diff_report(path.name, data, spans)
+
+        if not dry_run:
+            records = load_segment_index(path)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_bytes(new_data)
+            os.replace(tmp_path, path)
+            if records is not None and segment_index_path(path).exists():
+                write_segment_index(path, shift_offsets(records, spans))
+        return path, counts, diff, None
+    except Exception as e:
+        return path, Counter(), '', f"{type(e).__name__}: {e}"
+
+
+def _correct_job(job):
+    return correct_file(*job)
+
+
+def correct_many(paths, glossary, dry_run=False, workers=None):
+    """Correct transcripts across a process pool; returns correct_file results in input order."""
+    jobs = [(path, dry_run) for path in paths]
+    if workers == 1 or len(jobs) < MIN_POOL_BATCH:
+        _init_worker(glossary)
+        return [_correct_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(glossary,)) as pool:
+        return list(pool.map(_correct_job, jobs, chunksize=4))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Apply ASR name/term corrections across the transcript corpus.")
+    parser.add_argument('episodes', nargs='*', type=int,
+                        help='Only correct these episode numbers (default: all transcripts)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Write the diff report but leave transcripts untouched')
+    parser.add_argument('--report', type=Path, default=REPORT_PATH,
+                        help=f'Unified diff of every correction (default: {REPORT_PATH})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes scanning files (default: one per CPU)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not TRANSCRIPT_DIR.exists():
+        print(f"❌ Transcript directory not found: {TRANSCRIPT_DIR}")
+        return
+    started = time.monotonic()
+    paths = sorted(TRANSCRIPT_DIR.glob("episode-*.txt"))
+    if args.episodes:
+        wanted = set(args.episodes)
+        paths = [p for p in paths if (m := re.search(r'episode-(\d+)\.txt$', p.name)) and int(m.group(1)) in wanted]
+
+    glossary = build_glossary()
+    print(f"📖 Glossary: {len(glossary)} canonical names/terms, "
+          f"{sum(len(v) for v in glossary.values())} extra variants")
+
+    totals = Counter()
+    changed = 0
+    errors = 0
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as report:
+        for path, counts, diff, error in correct_many(paths, glossary, args.dry_run, args.workers):
+            if error:
+                print(f"❌ {path.name}: {error}")
+                errors += 1
+            elif counts:
+                changed += 1
+                totals.update(counts)
+                report.write(diff)
+                verb = 'would correct' if args.dry_run else 'corrected'
+                print(f"✏️  {path.name}: {verb} {sum(counts.values())} term(s)")
+
+    print(f"\n{'='*60}")
+    print(f"✅ {'Dry run' if args.dry_run else 'Corrections'} complete in {time.monotonic() - started:.1f}s")
+    print(f"   Files: {changed} changed, {len(paths) - changed - errors} unchanged, {errors} errors")
+    print(f"   Replacements: {sum(totals.values())}")
+    for (found, canonical), n in totals.most_common(15):
+        print(f"     {n:5d}  {found!r} -> {canonical!r}")
+    print(f"   Diff report: {args.report}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
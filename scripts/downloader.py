@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Shared, resumable MP3 downloader for the podcast scripts.
+
+- One pooled requests.Session with connection reuse and transport retries.
+- Downloads stream to "<file>.part" in 1 MB buffers and are renamed into place
+  only once complete; an interrupted download resumes with an HTTP Range
+  request (guarded by If-Range so a changed file restarts from scratch).
+- The RSS enclosure length is a hint: a file that does not match it is checked
+  against the server's size (Content-Range / Content-Length) with a Range
+  request, so a truncated file is resumed and a complete one is kept even when
+  the enclosure length is wrong.
+- download_many() fetches several episodes in parallel under a shared
+  concurrency and bandwidth cap.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limit import TokenBucket
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_TIMEOUT = (10, 60)
+
+
+def make_session(pool_size=8, retries=3):
+    """Return a requests.Session with a connection pool and retry on transient errors."""
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=1.0,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = 'happykhan-web podcast scripts'
+    return session
+
+
+def _part_paths(dest):
+    return dest.with_name(dest.name + '.part'), dest.with_name(dest.name + '.part.json')
+
+
+def _read_validator(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('validator')
+    except (OSError, ValueError):
+        return None
+
+
+def _write_validator(meta_path, response):
+    validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+    if validator:
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'validator': validator}, f)
+
+
+def is_complete(path, expected_size=None):
+    """True if path exists and, when expected_size is known, has exactly that many bytes."""
+    if not path.exists():
+        return False
+    size = path.stat().st_size
+    if expected_size:
+        return size == int(expected_size)
+    return size > 0
+
+
+def _total_size(response):
+    """Full size of the remote file from Content-Range (206/416) or Content-Length (200), if known."""
+    content_range = response.headers.get('Content-Range', '')
+    if '/' in content_range:
+        total = content_range.rsplit('/', 1)[1].strip()
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length', '')
+    if response.status_code == 200 and length.isdigit() and not response.headers.get('Content-Encoding'):
+        return int(length)
+    return None
+
+
+def download_file(url, dest, expected_size=None, session=None, limiter=None, chunk_size=CHUNK_SIZE):
+    """Download url to dest, resuming a partial download if one exists.
+
+    expected_size (the RSS enclosure length) is only a hint: when the local
+    file does not match it, the server's own size decides. Returns
+    (path, bytes_transferred). Raises on HTTP errors or if the finished file
+    does not match the server's size.
+    """
+    dest = Path(dest)
+    expected_size = int(expected_size) if expected_size else None
+    if is_complete(dest, expected_size):
+        return dest, 0
+
+    session = session or make_session(pool_size=1)
+    part_path, meta_path = _part_paths(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    # An existing file (from an older, non-resumable run, or with a wrong enclosure
+    # length) is resumed in place and only becomes the partial once the server says it is short
+    existing = dest if dest.exists() and not part_path.exists() else part_path
+    offset = existing.stat().st_size if existing.exists() else 0
+    headers = {}
+    if offset:
+        headers['Range'] = f'bytes={offset}-'
+        validator = _read_validator(meta_path) if existing == part_path else None
+        if validator:
+            headers['If-Range'] = validator
+
+    transferred = 0
+    with session.get(url, stream=True, timeout=DEFAULT_TIMEOUT, headers=headers) as response:
+        total = _total_size(response)
+        complete = False
+        if offset and response.status_code in (200, 416):
+            # Nothing left to fetch if the local file already holds every byte
+            complete = offset == (total if total is not None else expected_size)
+        if not complete:
+            response.raise_for_status()
+            if response.status_code == 206:
+                mode = 'ab'
+            else:
+                # Server ignored the range (or the file changed): start over
+                mode = 'wb'
+                offset = 0
+            if existing == dest:
+                os.replace(dest, part_path)
+            _write_validator(meta_path, response)
+            with open(part_path, mode) as f:
+                for block in response.iter_content(chunk_size=chunk_size):
+                    if limiter:
+                        limiter.acquire(len(block))
+                    f.write(block)
+                    transferred += len(block)
+
+    path = existing if complete else part_path
+    size = path.stat().st_size
+    # The server's size wins over the enclosure length
+    wanted = total if total is not None else expected_size
+    if wanted and size != wanted:
+        raise IOError(f"incomplete download: {size} of {wanted} bytes (partial kept for resume)")
+    if path != dest:
+        os.replace(path, dest)
+    if meta_path.exists():
+        meta_path.unlink()
+    return dest, transferred
+
+
+def download_many(jobs, max_workers=4, max_bytes_per_sec=None, session=None):
+    """Download several files in parallel.
+
+    jobs: iterable of dicts with 'url', 'dest' and optional 'expected_size'.
+    max_bytes_per_sec caps the combined bandwidth across all workers.
+    Returns {dest: path or None}; failures are printed and mapped to None.
+    """
+    jobs = list(jobs)
+    session = session or make_session(pool_size=max_workers)
+    limiter = TokenBucket(max_bytes_per_sec, capacity=max_bytes_per_sec) if max_bytes_per_sec else None
+    results = {}
+
+    def _run(job):
+        dest = Path(job['dest'])
+        if is_complete(dest, job.get('expected_size')):
+            print(f"  ✓ MP3 already exists: {dest.name}")
+            return dest
+        print(f"  ⬇️  Downloading MP3: {dest.name}")
+        try:
+            path, transferred = download_file(job['url'], dest, job.get('expected_size'),
+                                              session=session, limiter=limiter)
+            print(f"  ✓ Downloaded: {dest.name} ({transferred / 1e6:.1f} MB)")
+            return path
+        except Exception as e:
+            print(f"  ❌ Error downloading {dest.name}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for job, path in zip(jobs, pool.map(_run, jobs)):
+            results[Path(job['dest'])] = path
+    return results
@@ -12,59 +12,49 @@ This script:
 
 import os
 import re
+import json
 import sys
+import time
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-import frontmatter
+from episode_catalog import load_catalog, mdx_path, transcript_file_for
+from enhance_cache import load_result, prompt_template_hash, result_cache_key, store_result, text_sha256
+from mdx_frontmatter import patch_mdx, read_mdx
+from rate_limit import ApiRateLimiter
+from retry_utils import call_with_retry
+from run_metrics import RunMetrics
+from term_normalizer import get_normalizer
+from guest_index import is_host_name, normalize_name
+from tag_index import canonical_tags, corpus_tag_counts, load_episode_tags
+from transcript_windows import build_windows, estimate_tokens
+from pipeline_state import load_state, save_state, get_setting, set_setting
 
 # Configuration
 TRANSCRIPT_DIR = Path("public/microbinfie-transcripts")
 CONTENT_DIR = Path("content/microbinfie")
-
-# Hosts (should never be included as guests)
-HOST_NAMES = [
-    "Lee Katz",
-    "Andrew Page",
-    "Nabil-Fareed Alikhan",
-    "Nabil Fareed Alikhan",
-    "Nabil Ali Khan",
-    "Nabil Alikhan",
-]
-
-def _normalize_name(name: str) -> str:
-    s = name.lower()
-    # remove common titles and punctuation
-    for title in ["dr", "prof", "prof.", "professor"]:
-        s = re.sub(rf"\b{title}\b\.?", "", s)
-    s = re.sub(r"[^a-z]+", "", s)  # keep letters only
-    return s
-
-HOST_KEYS = { _normalize_name(n) for n in HOST_NAMES }
-
-def is_host_name(name: str) -> bool:
-    return _normalize_name(name) in HOST_KEYS
+MAX_OUTPUT_TOKENS = 2048
+# Map-reduce windowing for long transcripts (tokens are estimated at ~4 chars each)
+WINDOW_TOKENS = 12000
+MAX_WINDOWS = 8
+MAP_MAX_TOKENS = 1024
+MAP_WORKERS = 4
+# Attempts per model on transient errors (rate limits, overload, unparseable replies)
+API_RETRIES = 4
+
+@lru_cache(maxsize=None)
+def corpus_tags():
+    """{tag: episode count} across the corpus, read once per run to map model tags onto."""
+    return corpus_tag_counts(load_episode_tags(CONTENT_DIR))
 
 def normalize_brand_names(text: str) -> str:
-    """Normalize any variant of the show name to 'microbinfie podcast' (lowercase)."""
-    variants = [
-        r"micro\s*binfie",
-        r"micro\s*binfeed",
-        r"microbinfie",
-        r"microbinfeed",
-        r"micro\s*binfeed\s*podcast",
-        r"micro\s*binfie\s*podcast",
-        r"microbinfie\s*podcast",
-        r"microbinfeed\s*podcast",
-        r"micro\s*bin fie",
-        r"micro\s*bin feed",
-    ]
-    out = text
-    for pat in variants:
-        out = re.sub(pat, "microbinfie", out, flags=re.IGNORECASE)
-    # Ensure we refer to the show as 'microbinfie podcast'
-    out = re.sub(r"\bmicrobinfie\b(?!\s*podcast)", "microbinfie podcast", out, flags=re.IGNORECASE)
-    # Collapse duplicates like 'microbinfie podcast podcast'
-    out = re.sub(r"\bmicrobinfie podcast\s+podcast\b", "microbinfie podcast", out, flags=re.IGNORECASE)
-    return out
+    """Normalize any variant of the show name to 'microbinfie podcast' (lowercase).
+    Variants live in the 'summary' profile of scripts/data/term-variants.yml.
+    """
+    return get_normalizer('summary').normalize(text)
 
 def ensure_structured_summary(text: str) -> str:
     """Ensure the summary contains the required sections. If missing, add skeleton headings.
@@ -109,16 +99,9 @@ def load_anthropic_api_key():
             pass
     return None
 
-def extract_episode_number_from_filename(filename):
-    """Extract episode number from MDX filename like mb-147-nextflow.mdx."""
-    match = re.match(r'mb-(\d+)-', filename)
-    if match:
-        return int(match.group(1))
-    return None
-
 def read_transcript(episode_num):
     """Read transcript file for an episode."""
-    transcript_file = TRANSCRIPT_DIR / f"episode-{episode_num:02d}.txt"
+    transcript_file = transcript_file_for(episode_num, TRANSCRIPT_DIR)
     if not transcript_file.exists():
         return None
     
@@ -129,42 +112,109 @@ def read_transcript(episode_num):
         print(f"  ❌ Error reading transcript: {e}")
         return None
 
-def enhance_episode_with_ai(episode_num, title, current_content, transcript, existing_guests):
-    """Use Claude to analyze transcript and generate enhancements."""
-    # Lazy import to avoid hard dependency at module import time
-    import anthropic
-    api_key = os.environ.get("ANTHROPIC_API_KEY") or load_anthropic_api_key()
-    if not api_key:
-        raise RuntimeError("ANTHROPIC_API_KEY not configured")
-    # Ensure env is set for downstream SDK
-    os.environ["ANTHROPIC_API_KEY"] = api_key
-    client = anthropic.Anthropic(api_key=api_key)
-
-    # Choose model: allow override via env; else use a robust fallback list
-    model_override = os.environ.get("ANTHROPIC_MODEL")
-    model_candidates = [
-        model_override,
-        "claude-3-5-sonnet-latest",
-        "claude-3-5-haiku-latest",
-        "claude-3-5-sonnet-20240620",
-        "claude-3-haiku-20240307",
-    ]
-    model_candidates = [m for m in model_candidates if m]
-
-    # Build prompt in two parts to avoid f-string brace issues
-    prompt_header = (
-        "You are analyzing a podcast episode transcript to enhance its metadata and content.\n\n"
-        f"Episode: {title}\n"
-        f"Episode Number: {episode_num}\n\n"
-        "Current episode content (MDX):\n"
-        f"{current_content if current_content else 'No content yet'}\n\n"
-        "Existing guests in frontmatter:\n"
-        f"{existing_guests if existing_guests else 'None'}\n\n"
-        "Full transcript:\n"
-        f"{transcript[:15000]}  # First 15k chars to avoid token limits\n\n"
-    )
-
-    prompt_static = """
+_client = None
+_client_lock = threading.Lock()
+
+def get_anthropic_client():
+    """Return one Anthropic client shared by every episode (and worker thread)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            # Lazy import to avoid hard dependency at module import time
+            import anthropic
+            api_key = os.environ.get("ANTHROPIC_API_KEY") or load_anthropic_api_key()
+            if not api_key:
+                raise RuntimeError("ANTHROPIC_API_KEY not configured")
+            # Ensure env is set for downstream SDK
+            os.environ["ANTHROPIC_API_KEY"] = api_key
+            _client = anthropic.Anthropic(api_key=api_key)
+        return _client
+
+# Model fallback chain, tried in order until one works
+DEFAULT_MODEL_CANDIDATES = [
+    "claude-3-5-sonnet-latest",
+    "claude-3-5-haiku-latest",
+    "claude-3-5-sonnet-20240620",
+    "claude-3-haiku-20240307",
+]
+# Pipeline state setting that remembers the model that last worked
+MODEL_SETTING = "enhance_model"
+
+def is_dead_model_error(err) -> bool:
+    """True if the API said the model does not exist or is retired (no point retrying it)."""
+    if getattr(err, 'status_code', None) == 404:
+        return True
+    text = str(err).lower()
+    return 'not_found_error' in text or 'deprecated' in text or 'end-of-life' in text
+
+class ModelResolver:
+    """Resolve the model once per process instead of once per episode.
+    The first model that answers is tried first from then on, and models that
+    returned 404/deprecated are skipped for the rest of the run.
+    """
+
+    def __init__(self, preferred=None):
+        override = os.environ.get("ANTHROPIC_MODEL")
+        ordered = [override, preferred, *DEFAULT_MODEL_CANDIDATES]
+        self._candidates = list(dict.fromkeys(m for m in ordered if m))
+        self.working = None
+        self.dead = set()
+        self._lock = threading.Lock()
+
+    def candidates(self):
+        with self._lock:
+            rest = [m for m in self._candidates if m not in self.dead and m != self.working]
+            return ([self.working] if self.working else []) + rest
+
+    def mark_working(self, model):
+        with self._lock:
+            self.working = model
+
+    def mark_dead(self, model):
+        with self._lock:
+            self.dead.add(model)
+            if self.working == model:
+                self.working = None
+        print(f"  ⚠️  Model {model} unavailable; skipping it for the rest of this run")
+
+_resolver = None
+
+def get_model_resolver():
+    """Return the process-wide ModelResolver, seeded from the pipeline state."""
+    global _resolver
+    with _client_lock:
+        if _resolver is None:
+            _resolver = ModelResolver(preferred=get_setting(load_state(), MODEL_SETTING))
+        return _resolver
+
+def remember_working_model(resolver):
+    """Persist the model that worked so the next run starts with it."""
+    if resolver.working:
+        state = load_state()
+        if get_setting(state, MODEL_SETTING) != resolver.working:
+            set_setting(state, MODEL_SETTING, resolver.working)
+            save_state(state)
+
+# Start of the final (whole-episode) request; filled with str.format
+PROMPT_HEADER = (
+    "You are analyzing a podcast episode transcript to enhance its metadata and content.\n\n"
+    "Episode: {title}\n"
+    "Episode Number: {episode_num}\n\n"
+    "Current episode content (MDX):\n"
+    "{current_content}\n\n"
+    "Existing guests in frontmatter:\n"
+    "{existing_guests}\n\n"
+)
+# What follows the header: the transcript itself, or the notes from the map step
+FULL_TRANSCRIPT_SECTION = "Full transcript:\n{transcript}\n\n"
+NOTES_SECTION = (
+    "The transcript is long, so it was condensed into notes from {parts} consecutive parts "
+    "(in order). Treat these notes as the transcript:\n"
+    "{notes}\n\n"
+)
+
+# Output format and rules for the final (whole-episode) request
+PROMPT_INSTRUCTIONS = """
 Please analyze this transcript and provide:
 
 1. Summary: Provide a structured markdown section to APPEND to the MDX using EXACTLY this layout (no extra headings). Use the phrase "microbinfie podcast" exactly when referring to the show. Ensure the summary is substantial (overview ~60–120 words; 2–4 bullets per theme):
@@ -211,86 +261,235 @@ Important:
 - Do NOT include the hosts as guests under any circumstances. The hosts are: Lee Katz, Andrew Page, and Nabil-Fareed Alikhan.
 """
 
-    prompt = prompt_header + prompt_static
+# Per-window note extraction when a transcript is too long for one request
+MAP_PROMPT_HEADER = (
+    "You are analyzing part of a podcast episode transcript.\n\n"
+    "Episode: {title}\n"
+    "Episode Number: {episode_num}\n"
+    "Transcript part {part} of {parts}:\n"
+    "{window}\n"
+)
+MAP_INSTRUCTIONS = """
+Extract notes from this part of the transcript for a later summary of the whole episode.
+
+Format your response as JSON (no code fences, no ellipses/placeholders like ...):
+{
+  "topics": ["main themes discussed in this part"],
+  "key_points": ["specific points, tools, findings or advice, one per string"],
+  "guests": [
+    {"name": "Full Name", "affiliation": "Institution/Role", "url": "https://..."}
+  ],
+  "tags": ["tag1", "tag2"]
+}
 
-    last_err = None
-    for model in model_candidates:
-        try:
+Important:
+- Only include guests who are actually interviewed or featured (not just mentioned)
+- For URLs, only include if explicitly mentioned in transcript
+- Tags should be lowercase, hyphenated (e.g., "machine-learning", "genome-assembly")
+- Do NOT include the hosts as guests under any circumstances. The hosts are: Lee Katz, Andrew Page, and Nabil-Fareed Alikhan.
+"""
+
+def parse_json_response(response_text):
+    """Parse a model reply as JSON, tolerating code fences and placeholder ellipses."""
+    # Extract JSON from response (might be wrapped in markdown code blocks)
+    json_match = re.search(r'```(?:json)?\s*(\{[\s\S]*?\})\s*```', response_text, re.DOTALL)
+    if json_match:
+        response_text = json_match.group(1)
+
+    # Remove common placeholders/ellipses that break JSON
+    response_text = response_text.replace("...,", "").replace(", ...", "").replace("...", "")
+
+    return json.loads(response_text)
+
+def ask_model(client, prompt, resolver, limiter=None, max_tokens=MAX_OUTPUT_TOKENS, stage=None):
+    """Send a prompt down the model fallback chain and return (parsed JSON reply, model).
+    Transient failures (rate limits, overload, a reply that fails to parse) are
+    retried on the same model; only a model the API reports as gone (404 /
+    not_found / retired) falls through to the next candidate. The last error is
+    raised if no model succeeds.
+    stage (a run_metrics.StageRecord) collects calls, billed tokens and failed calls as retries.
+    """
+    last_err = RuntimeError("no model candidates available")
+    for model in resolver.candidates():
+        def _request():
+            if limiter:
+                limiter.acquire(estimate_tokens(prompt) + max_tokens)
+            if stage:
+                stage.add(api_calls=1)
             message = client.messages.create(
                 model=model,
-                max_tokens=2048,
+                max_tokens=max_tokens,
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
             )
+            usage = getattr(message, 'usage', None)
+            if stage and usage is not None:
+                stage.add(tokens_in=getattr(usage, 'input_tokens', 0) or 0,
+                          tokens_out=getattr(usage, 'output_tokens', 0) or 0)
+            return parse_json_response(message.content[0].text)
 
-            response_text = message.content[0].text
+        def _on_retry(attempt, exc, delay):
+            if stage:
+                stage.add(retries=1)
+            print(f"  🔁 {model}: attempt {attempt}/{API_RETRIES} failed ({exc}); retrying in {delay:.1f}s")
 
-            # Extract JSON from response (might be wrapped in markdown code blocks)
-            import json
-            json_match = re.search(r'```(?:json)?\s*(\{[\s\S]*?\})\s*```', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
+        try:
+            data = call_with_retry(_request, attempts=API_RETRIES, on_retry=_on_retry,
+                                   retryable=lambda e: not is_dead_model_error(e))
+        except Exception as e:
+            if stage:
+                stage.add(retries=1)
+            if not is_dead_model_error(e):
+                raise
+            # Never pay for this model again in this process; the next candidate takes over
+            last_err = e
+            resolver.mark_dead(model)
+            continue
+        resolver.mark_working(model)
+        return data, model
+    raise last_err
+
+def summarise_windows(client, windows, episode_num, title, resolver, limiter=None, workers=MAP_WORKERS,
+                      stage=None):
+    """Map step: extract JSON notes from each transcript window concurrently, in window order."""
+    def _summarise(index):
+        prompt = MAP_PROMPT_HEADER.format(
+            title=title, episode_num=episode_num, part=index + 1, parts=len(windows), window=windows[index],
+        ) + MAP_INSTRUCTIONS
+        return ask_model(client, prompt, resolver, limiter, max_tokens=MAP_MAX_TOKENS, stage=stage)[0]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(windows)))) as pool:
+        return list(pool.map(_summarise, range(len(windows))))
+
+def enhance_episode_with_ai(episode_num, title, current_content, transcript, existing_guests,
+                            client=None, limiter=None, resolver=None,
+                            window_tokens=WINDOW_TOKENS, max_windows=MAX_WINDOWS, cache_results=True,
+                            metrics=None):
+    """Use Claude to analyze transcript and generate enhancements.
+    client defaults to the shared Anthropic client; limiter (an ApiRateLimiter)
+    is acquired before every request; resolver (a ModelResolver) picks the model.
+
+    Transcripts that fit in one window_tokens budget are sent whole. Longer ones
+    are split on speaker blocks into at most max_windows windows, each window is
+    condensed to notes concurrently (map), and the notes replace the transcript
+    in the final request (reduce), so the whole episode is covered at a bounded cost.
+
+    With cache_results, the result is stored in the enhance cache under the
+    model that produced it (see load_cached_enhancements).
+
+    metrics (a run_metrics.RunMetrics) gets a 'map' stage (long transcripts
+    only) and a 'reduce' stage for the episode.
+    """
+    if client is None:
+        client = get_anthropic_client()
+    if metrics is None:
+        metrics = RunMetrics('enhance', path=False)
 
-            # Remove common placeholders/ellipses that break JSON
-            response_text = response_text.replace("...,", "").replace(", ...", "").replace("...", "")
+    # Choose model: start from the one already known to work, skipping dead ones
+    if resolver is None:
+        resolver = get_model_resolver()
 
-            data = json.loads(response_text)
-            # Normalize summary: prefer summary_lines if present
-            if isinstance(data, dict) and 'summary' not in data and 'summary_lines' in data:
-                if isinstance(data['summary_lines'], list):
-                    data['summary'] = "\n".join([str(x) for x in data['summary_lines']])
+    windows = build_windows(transcript, max_tokens=window_tokens, max_windows=max_windows)
+    try:
+        if len(windows) <= 1:
+            transcript_section = FULL_TRANSCRIPT_SECTION.format(transcript=transcript)
+        else:
+            print(f"  🪟 Episode {episode_num}: transcript split into {len(windows)} windows")
+            with metrics.stage(episode_num, 'map') as stage:
+                stage.add(windows=len(windows))
+                notes = summarise_windows(client, windows, episode_num, title, resolver, limiter, stage=stage)
+            transcript_section = NOTES_SECTION.format(
+                parts=len(windows), notes=json.dumps(notes, ensure_ascii=False, indent=1))
+
+        # Instructions are appended unformatted: their JSON examples contain braces
+        prompt_header = PROMPT_HEADER.format(
+            title=title,
+            episode_num=episode_num,
+            current_content=current_content if current_content else 'No content yet',
+            existing_guests=existing_guests if existing_guests else 'None',
+        ) + transcript_section
+
+        with metrics.stage(episode_num, 'reduce') as stage:
+            data, model = ask_model(client, prompt_header + PROMPT_INSTRUCTIONS, resolver, limiter, stage=stage)
+    except Exception as e:
+        print(f"  ❌ Episode {episode_num}: AI enhancement error: {e}")
+        return None
 
-            # Post-process: brand normalization and structure enforcement
-            if isinstance(data, dict) and 'summary' in data and isinstance(data['summary'], str):
-                s = normalize_brand_names(data['summary'])
-                s = ensure_structured_summary(s)
-                data['summary'] = s
+    # Normalize summary: prefer summary_lines if present
+    if isinstance(data, dict) and 'summary' not in data and 'summary_lines' in data:
+        if isinstance(data['summary_lines'], list):
+            data['summary'] = "\n".join([str(x) for x in data['summary_lines']])
 
-            return data
+    # Post-process: brand normalization and structure enforcement
+    if isinstance(data, dict) and 'summary' in data and isinstance(data['summary'], str):
+        s = normalize_brand_names(data['summary'])
+        s = ensure_structured_summary(s)
+        data['summary'] = s
 
-        except Exception as e:
-            last_err = e
-            # Try next model if this one fails (e.g., 404 not found)
-            continue
+    if cache_results and isinstance(data, dict):
+        key = result_cache_key(text_sha256(transcript), prompt_version(window_tokens, max_windows), model)
+        store_result(key, data, meta={'episode': episode_num, 'title': title, 'model': model})
 
-    print(f"  ❌ AI enhancement error: {last_err}")
-    return None
+    return data
+
+def prompt_version(window_tokens=WINDOW_TOKENS, max_windows=MAX_WINDOWS):
+    """Hash of everything that shapes the prompts; editing a template invalidates cached results."""
+    return prompt_template_hash(PROMPT_HEADER, FULL_TRANSCRIPT_SECTION, NOTES_SECTION, PROMPT_INSTRUCTIONS,
+                                MAP_PROMPT_HEADER, MAP_INSTRUCTIONS, MAP_MAX_TOKENS,
+                                MAX_OUTPUT_TOKENS, window_tokens, max_windows)
+
+def load_cached_enhancements(transcript, resolver, window_tokens=WINDOW_TOKENS, max_windows=MAX_WINDOWS):
+    """Return (enhancements, model) from the enhance cache, or (None, None) on a miss.
+    Candidate models are tried in the resolver's preference order.
+    """
+    transcript_sha = text_sha256(transcript)
+    version = prompt_version(window_tokens, max_windows)
+    for model in resolver.candidates():
+        data = load_result(result_cache_key(transcript_sha, version, model))
+        if data is not None:
+            return data, model
+    return None, None
 
 def update_episode_mdx(mdx_file, enhancements):
-    """Update MDX file with AI-generated enhancements."""
+    """Update MDX file with AI-generated enhancements.
+    Only changed frontmatter keys are rewritten, and the file is left untouched
+    if the enhancements are already applied.
+    """
     try:
-        post = frontmatter.load(mdx_file)
+        metadata, body = read_mdx(mdx_file)
+        updates = {}
         
         # Update guests if we found new ones
         if enhancements.get('guests'):
             # Filter out any hosts mistakenly included by the model
             filtered_guests = [g for g in enhancements['guests'] if not is_host_name(g.get('name', ''))]
-            # Merge with existing guests, avoid duplicates
-            existing_names = {g.get('name', '').lower() for g in post.get('guests', [])}
+            # Merge with existing guests, avoid duplicates (ignoring case, titles and punctuation)
+            current_guests = metadata.get('guests') or []
+            existing_names = {normalize_name(g.get('name', '')) for g in current_guests}
             new_guests = [
                 g for g in filtered_guests 
-                if g.get('name', '').lower() not in existing_names
+                if normalize_name(g.get('name', '')) not in existing_names
             ]
             
             if new_guests:
-                current_guests = post.get('guests', [])
-                post['guests'] = current_guests + new_guests
+                updates['guests'] = current_guests + new_guests
                 print(f"  ✅ Added {len(new_guests)} new guest(s)")
         
         # Add new tags
         if enhancements.get('tags'):
-            current_tags = post.get('tags', [])
-            # Keep existing tags, add new ones
-            existing_tag_set = set(current_tags)
-            new_tags = [t for t in enhancements['tags'] if t not in existing_tag_set]
+            current_tags = metadata.get('tags') or []
+            # Keep existing tags, add new ones in the corpus vocabulary (scripts/tag_index.py)
+            existing_tag_set = set(canonical_tags(current_tags, corpus_tags()))
+            new_tags = [t for t in canonical_tags(enhancements['tags'], corpus_tags()) if t not in existing_tag_set]
             
             if new_tags:
-                post['tags'] = current_tags + new_tags
+                updates['tags'] = current_tags + new_tags
                 print(f"  ✅ Added {len(new_tags)} new tag(s): {', '.join(new_tags)}")
         
         # Update content with summary: replace if minimal, else append/update marked block
-        current_content = post.content.strip()
+        current_content = body.strip()
+        new_content = None
         summary_md = enhancements.get('summary')
         if summary_md:
             START_MARK = "<!-- AI ENHANCEMENT START -->"
@@ -298,25 +497,23 @@ def update_episode_mdx(mdx_file, enhancements):
             block = f"\n\n{START_MARK}\n{summary_md}\n{END_MARK}\n"
 
             if len(current_content) < 200:
-                post.content = summary_md
+                new_content = summary_md
                 print(f"  ✅ Added AI-generated summary (replaced minimal content)")
             else:
                 if START_MARK in current_content and END_MARK in current_content:
-                    import re as _re
-                    new_content = _re.sub(
-                        _re.compile(_re.escape(START_MARK) + r"[\s\S]*?" + _re.escape(END_MARK), _re.MULTILINE),
-                        f"{START_MARK}\n{summary_md}\n{END_MARK}",
+                    new_content = re.sub(
+                        re.compile(re.escape(START_MARK) + r"[\s\S]*?" + re.escape(END_MARK), re.MULTILINE),
+                        lambda _: f"{START_MARK}\n{summary_md}\n{END_MARK}",
                         current_content
                     )
-                    post.content = new_content
                     print(f"  ✅ Updated AI-generated summary block")
                 else:
-                    post.content = current_content + block
+                    new_content = current_content + block
                     print(f"  ✅ Appended AI-generated summary to end of content")
         
-        # Write back to file
-        with open(mdx_file, 'wb') as f:
-            frontmatter.dump(post, f)
+        # Write back to file (atomically; skipped if nothing changed)
+        if not patch_mdx(mdx_file, updates, content=new_content):
+            print(f"  ✓ MDX already up to date")
         
         return True
         
@@ -324,23 +521,128 @@ def update_episode_mdx(mdx_file, enhancements):
         print(f"  ❌ Error updating MDX: {e}")
         return False
 
+def parse_episode_range(values):
+    """Turn ['1', '128'] or ['1-128'] into an inclusive set of episode numbers (None = all)."""
+    start = end = None
+    if len(values) == 1 and '-' in values[0]:
+        try:
+            s, e = values[0].split('-', 1)
+            start, end = int(s), int(e)
+        except ValueError:
+            start = end = None
+    elif len(values) >= 2:
+        try:
+            start = int(values[0])
+            end = int(values[1])
+        except ValueError:
+            start = end = None
+    if start is not None and end is not None and start <= end:
+        return set(range(start, end + 1))
+    return None
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Enhance MicroBinfie episode MDX files from their transcripts.")
+    parser.add_argument('range', nargs='*',
+                        help='Optional inclusive episode range: "1 128" or "1-128"')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Episodes analysed concurrently (default: 4)')
+    parser.add_argument('--rpm', type=int, default=50,
+                        help='Max API requests per minute across all workers (default: 50)')
+    parser.add_argument('--tpm', type=int, default=80000,
+                        help='Max input+output tokens per minute across all workers (default: 80000)')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='Extra rounds for episodes that failed, run after the others (default: 2)')
+    parser.add_argument('--window-tokens', type=int, default=WINDOW_TOKENS,
+                        help=f'Token budget per transcript window; longer transcripts are map-reduced (default: {WINDOW_TOKENS})')
+    parser.add_argument('--max-windows', type=int, default=MAX_WINDOWS,
+                        help=f'Upper bound on windows (map calls) per episode (default: {MAX_WINDOWS})')
+    parser.add_argument('--force', action='store_true',
+                        help='Ignore cached results and call the API for every episode (results are re-cached)')
+    parser.add_argument('--offline', action='store_true',
+                        help='Use the offline test client (no network, no MDX writes) to measure throughput')
+    parser.add_argument('--latency', type=float, default=0.5,
+                        help='Seconds per call for the offline client (default: 0.5)')
+    parser.add_argument('--metrics', type=Path, default=None,
+                        help='JSONL file for per-episode stage metrics (default: .cache/microbinfie/metrics/)')
+    return parser.parse_args()
+
+def run_enhancements(jobs, client, workers=4, limiter=None, retries=2, retry_delay=10.0, resolver=None,
+                     window_tokens=WINDOW_TOKENS, max_windows=MAX_WINDOWS, cache_results=True, metrics=None):
+    """Analyse episodes in a worker pool, yielding (job, enhancements) as each finishes.
+    Failed episodes are collected and retried in later rounds, so one slow or
+    failing episode never holds up the rest. enhancements is None if every round failed.
+    Each re-queued episode is logged to metrics as a 'requeue' stage.
+    """
+    pending = list(jobs)
+    for attempt in range(retries + 1):
+        if not pending:
+            return
+        if attempt:
+            delay = retry_delay * (2 ** (attempt - 1))
+            print(f"\n🔁 Retrying {len(pending)} failed episode(s) in {delay:.0f}s (round {attempt}/{retries})...")
+            time.sleep(delay)
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                pool.submit(
+                    enhance_episode_with_ai,
+                    job['num'],
+                    job['title'],
+                    job['content'],
+                    job['transcript'],
+                    job['guests'],
+                    client=client,
+                    limiter=limiter,
+                    resolver=resolver,
+                    window_tokens=window_tokens,
+                    max_windows=max_windows,
+                    cache_results=cache_results,
+                    metrics=metrics,
+                ): job
+                for job in pending
+            }
+            for fut in as_completed(futures):
+                job = futures[fut]
+                try:
+                    enhancements = fut.result()
+                except Exception as e:
+                    print(f"  ❌ Episode {job['num']}: {e}")
+                    enhancements = None
+                if enhancements:
+                    yield job, enhancements
+                elif attempt < retries:
+                    failed.append(job)
+                    if metrics:
+                        metrics.record(job['num'], 'requeue', retries=1)
+                else:
+                    yield job, None
+        pending = failed
+
 def main():
     """Main enhancement workflow."""
-    # Ensure API key present or in .credentials
-    api_key = load_anthropic_api_key()
-    if not api_key:
-        print("❌ ANTHROPIC_API_KEY not found (env or .credentials)")
-        print("   Get your API key from: https://console.anthropic.com/")
-        print("   Then either:\n     - export ANTHROPIC_API_KEY=...\n     - or add ANTHROPIC_API_KEY=... to .credentials")
-        sys.exit(1)
-    os.environ["ANTHROPIC_API_KEY"] = api_key
-    
-    # Check dependency lazily
-    try:
-        import anthropic  # noqa: F401
-    except ImportError:
-        print("❌ anthropic package not found. Install with:\n   pip install anthropic")
-        sys.exit(1)
+    args = parse_args()
+
+    if args.offline:
+        from offline_clients import FakeAnthropic
+        client = FakeAnthropic(latency=args.latency)
+        print("🧪 Offline mode: using the fake client; MDX files will not be written")
+    else:
+        # Ensure API key present or in .credentials
+        api_key = load_anthropic_api_key()
+        if not api_key:
+            print("❌ ANTHROPIC_API_KEY not found (env or .credentials)")
+            print("   Get your API key from: https://console.anthropic.com/")
+            print("   Then either:\n     - export ANTHROPIC_API_KEY=...\n     - or add ANTHROPIC_API_KEY=... to .credentials")
+            sys.exit(1)
+        os.environ["ANTHROPIC_API_KEY"] = api_key
+        
+        # Check dependency lazily
+        try:
+            import anthropic  # noqa: F401
+        except ImportError:
+            print("❌ anthropic package not found. Install with:\n   pip install anthropic")
+            sys.exit(1)
+        client = get_anthropic_client()
     
     if not TRANSCRIPT_DIR.exists():
         print(f"❌ Transcript directory not found: {TRANSCRIPT_DIR}")
@@ -349,25 +651,8 @@ def main():
     # Optional CLI filter: pass a start/end episode number (inclusive)
     # Usage examples:
     #   python scripts/enhance-episodes-from-transcripts.py 1 128
-    #   python scripts/enhance-episodes-from-transcripts.py 1-128
-    allowed = None
-    if len(sys.argv) >= 2:
-        arg1 = sys.argv[1]
-        start = end = None
-        if '-' in arg1 and len(sys.argv) == 2:
-            try:
-                s, e = arg1.split('-', 1)
-                start, end = int(s), int(e)
-            except ValueError:
-                start = end = None
-        elif len(sys.argv) >= 3:
-            try:
-                start = int(sys.argv[1])
-                end = int(sys.argv[2])
-            except ValueError:
-                start = end = None
-        if start is not None and end is not None and start <= end:
-            allowed = set(range(start, end + 1))
+    #   python scripts/enhance-episodes-from-transcripts.py 1-128 --workers 8
+    allowed = parse_episode_range(args.range)
 
     print("🤖 Starting AI-powered episode enhancement...\n")
     
@@ -375,9 +660,13 @@ def main():
     skipped = 0
     errors = 0
     
-    # Process all MDX files
-    for mdx_file in sorted(CONTENT_DIR.glob("mb-*.mdx")):
-        episode_num = extract_episode_number_from_filename(mdx_file.name)
+    # Select episodes from the catalog; frontmatter is only parsed for episodes in range
+    jobs = []
+    catalog = load_catalog(CONTENT_DIR, verbose=True)
+    for name in sorted(catalog):
+        entry = catalog[name]
+        mdx_file = mdx_path(entry, CONTENT_DIR)
+        episode_num = entry['episode']
         
         if not episode_num:
             continue
@@ -387,57 +676,99 @@ def main():
         
         # Load episode data
         try:
-            post = frontmatter.load(mdx_file)
-            title = post.get('title', mdx_file.name)
+            metadata, body = read_mdx(mdx_file)
+            title = metadata.get('title', mdx_file.name)
         except Exception as e:
             print(f"❌ Error reading {mdx_file.name}: {e}")
             errors += 1
             continue
         
-        print(f"\n{'='*60}")
-        print(f"Episode {episode_num}: {title}")
-        print(f"{'='*60}")
-        
         # Read transcript
         transcript = read_transcript(episode_num)
         if not transcript:
-            print(f"  ⏭️  No transcript available")
+            print(f"⏭️  Episode {episode_num}: No transcript available")
             skipped += 1
             continue
         
-        print(f"  📝 Transcript loaded ({len(transcript)} chars)")
-        
-        # Get current state
-        current_content = post.content.strip()
-        existing_guests = post.get('guests', [])
-        
-        print(f"  🤖 Analyzing with Claude...")
-        
-        # Get AI enhancements
-        enhancements = enhance_episode_with_ai(
-            episode_num,
-            title,
-            current_content,
-            transcript,
-            existing_guests
-        )
+        jobs.append({
+            'num': episode_num,
+            'mdx_file': mdx_file,
+            'title': title,
+            'content': body.strip(),
+            'guests': metadata.get('guests', []),
+            'transcript': transcript,
+        })
+    
+    resolver = get_model_resolver()
+    metrics = RunMetrics('enhance', path=args.metrics)
+    started = time.monotonic()
+
+    # Episodes whose transcript and prompt are unchanged reuse the cached result
+    # (the offline client's placeholder results are never cached)
+    use_cache = not (args.offline or args.force)
+    cached = []
+    misses = []
+    for job in jobs:
+        if use_cache:
+            with metrics.stage(job['num'], 'cache') as stage:
+                enhancements, model = load_cached_enhancements(job['transcript'], resolver,
+                                                               args.window_tokens, args.max_windows)
+                stage.add(cache_hits=int(enhancements is not None))
+        else:
+            enhancements = None
+        if enhancements is not None:
+            cached.append((job, enhancements))
+        else:
+            misses.append(job)
+    if use_cache:
+        print(f"\n💾 Result cache: {len(cached)} hit(s), {len(misses)} miss(es)")
+
+    print(f"\n🤖 Analyzing {len(misses)} episode(s) with Claude "
+          f"({args.workers} worker(s), ≤{args.rpm} req/min, ≤{args.tpm} tokens/min)...")
+    limiter = ApiRateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    results = run_enhancements(misses, client, workers=args.workers, limiter=limiter,
+                               retries=args.retries, resolver=resolver,
+                               window_tokens=args.window_tokens, max_windows=args.max_windows,
+                               cache_results=not args.offline, metrics=metrics)
+
+    # Results arrive as workers finish; MDX writes stay on this thread
+    for job, enhancements in itertools.chain(cached, results):
+        print(f"\n{'='*60}")
+        print(f"Episode {job['num']}: {job['title']}")
+        print(f"{'='*60}")
+        print(f"  📝 Transcript: {len(job['transcript'])} chars")
         
         if not enhancements:
             print(f"  ❌ Failed to get AI enhancements")
             errors += 1
             continue
         
-        # Update MDX file
-        if update_episode_mdx(mdx_file, enhancements):
+        if args.offline:
             enhanced += 1
-        else:
-            errors += 1
+            continue
+        
+        # Update MDX file
+        with metrics.stage(job['num'], 'write') as stage:
+            if update_episode_mdx(job['mdx_file'], enhancements):
+                enhanced += 1
+            else:
+                stage.fail()
+                errors += 1
     
+    elapsed = time.monotonic() - started
+    metrics.close()
+    if not args.offline:
+        remember_working_model(resolver)
     print(f"\n{'='*60}")
     print(f"✅ Enhancement complete!")
     print(f"   Enhanced: {enhanced} episodes")
     print(f"   Skipped: {skipped} episodes (no transcript)")
     print(f"   Errors: {errors} episodes")
+    if use_cache:
+        print(f"   Cache: {len(cached)} hit(s), {len(misses)} miss(es)")
+    print(f"   Model: {resolver.working or 'none resolved'}")
+    print(f"   Time: {elapsed:.1f}s ({enhanced / elapsed * 60 if elapsed else 0:.1f} episodes/min)")
+    metrics.print_summary()
     print(f"{'='*60}\n")
 
 if __name__ == "__main__":
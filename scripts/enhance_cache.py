@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Local cache of AI episode enhancements (summary, guests, tags).
+
+Each result is stored as JSON under .cache/microbinfie/enhance/, keyed by
+the sha256 of the transcript, a hash of the prompt templates and the model
+that answered. Rerunning the enhance script over episodes whose transcript
+and prompt have not changed then only rewrites the MDX, with no API calls.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR = Path(".cache/microbinfie/enhance")
+
+
+def text_sha256(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def prompt_template_hash(*parts):
+    """Hash the prompt templates (and any settings that shape the prompt) into one short version id."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+
+def result_cache_key(transcript_sha, template_hash, model):
+    """Return the cache key for one episode result: transcript hash, prompt version and model."""
+    return hashlib.sha256(f"{transcript_sha}\0{template_hash}\0{model}".encode('utf-8')).hexdigest()
+
+
+def _cache_path(key, cache_dir=CACHE_DIR):
+    # Fan out by prefix, as in the transcription cache
+    return cache_dir / key[:2] / f"{key}.json"
+
+
+def load_result(key, cache_dir=CACHE_DIR):
+    """Return the cached enhancement dict for a key, or None on a miss."""
+    try:
+        with open(_cache_path(key, cache_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)['result']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def store_result(key, result, meta=None, cache_dir=CACHE_DIR):
+    """Atomically write an episode's enhancement result (plus optional metadata) to the cache."""
+    path = _cache_path(key, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, suffix='.tmp', delete=False) as f:
+        json.dump({'meta': meta or {}, 'result': result}, f, ensure_ascii=False, indent=1)
+    os.replace(f.name, path)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Persistent catalog of MicroBinfie episode MDX files.
+
+The catalog maps every content/microbinfie/mb-*.mdx file to the fields the
+podcast scripts look episodes up by (guid, episode number, slug, transcript).
+It is stored as JSON under .cache/ and refreshed incrementally: a file's
+frontmatter is only re-parsed when its mtime or size has changed, so a lookup
+pass costs one stat() per file instead of one YAML parse per file per item.
+
+Usage from another script (run from the repo root):
+    from episode_catalog import load_catalog, catalog_by_guid
+    catalog = load_catalog()
+    mdx_path = catalog_by_guid(catalog).get(guid)
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from mdx_frontmatter import read_fields
+
+# Configuration
+CONTENT_DIR = Path("content/microbinfie")
+TRANSCRIPT_DIR = Path("public/microbinfie-transcripts")
+CATALOG_PATH = Path(".cache/microbinfie/episode-catalog.json")
+
+# Frontmatter keys parsed into catalog entries
+CATALOG_FIELDS = ('guid', 'title', 'transcript')
+
+# Bump when the entry layout changes so stale catalogs are rebuilt
+CATALOG_VERSION = 1
+
+
+def extract_episode_number_from_filename(filename):
+    """Extract episode number from MDX filename like mb-147-nextflow.mdx."""
+    match = re.match(r'mb-(\d+)-', filename)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def transcript_file_for(episode_num, transcript_dir=TRANSCRIPT_DIR):
+    """Return the on-disk transcript path for an episode (episode-07.txt style)."""
+    return transcript_dir / f"episode-{episode_num:02d}.txt"
+
+
+def transcript_link(episode_num):
+    """Return the site URL stored in an episode's `transcript` frontmatter."""
+    return f"/microbinfie-transcripts/{transcript_file_for(episode_num).name}"
+
+
+def _build_entry(mdx_file, stat):
+    """Parse one MDX file and return its catalog entry."""
+    post = read_fields(mdx_file, CATALOG_FIELDS)
+    return {
+        'file': mdx_file.name,
+        'slug': mdx_file.stem,
+        'guid': post.get('guid'),
+        'episode': extract_episode_number_from_filename(mdx_file.name),
+        'title': post.get('title'),
+        'transcript': post.get('transcript'),
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+    }
+
+
+def _read_catalog(catalog_path):
+    try:
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != CATALOG_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def _write_catalog(catalog_path, files):
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = catalog_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CATALOG_VERSION, 'files': files}, f, separators=(',', ':'))
+    os.replace(tmp_path, catalog_path)
+
+
+def load_catalog(content_dir=CONTENT_DIR, catalog_path=CATALOG_PATH, verbose=False):
+    """Load the catalog, re-parsing only MDX files whose mtime or size changed.
+
+    Returns a dict of {mdx filename: entry}. The refreshed catalog is written
+    back to disk only if something changed.
+    """
+    cached = _read_catalog(catalog_path)
+    files = {}
+    changed = False
+
+    for mdx_file in sorted(content_dir.glob("mb-*.mdx")):
+        stat = mdx_file.stat()
+        entry = cached.get(mdx_file.name)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            files[mdx_file.name] = entry
+            continue
+        try:
+            files[mdx_file.name] = _build_entry(mdx_file, stat)
+            changed = True
+        except Exception as e:
+            print(f"Error reading {mdx_file}: {e}")
+
+    if changed or set(files) != set(cached):
+        if verbose:
+            reparsed = sum(1 for name, e in files.items() if cached.get(name) is not e)
+            print(f"  📇 Episode catalog refreshed ({reparsed} of {len(files)} files re-read)")
+        _write_catalog(catalog_path, files)
+
+    return files
+
+
+def refresh_entry(catalog, mdx_file, catalog_path=CATALOG_PATH):
+    """Re-read a single MDX file after a script has rewritten it."""
+    mdx_file = Path(mdx_file)
+    catalog[mdx_file.name] = _build_entry(mdx_file, mdx_file.stat())
+    _write_catalog(catalog_path, catalog)
+    return catalog[mdx_file.name]
+
+
+def mdx_path(entry, content_dir=CONTENT_DIR):
+    """Return the MDX Path for a catalog entry."""
+    return content_dir / entry['file']
+
+
+def catalog_by_guid(catalog, content_dir=CONTENT_DIR):
+    """Return {guid: mdx Path} for every cataloged episode with a guid."""
+    return {
+        entry['guid']: mdx_path(entry, content_dir)
+        for entry in catalog.values()
+        if entry.get('guid')
+    }
+
+
+def catalog_by_episode(catalog):
+    """Return {episode number: entry} for every numbered episode."""
+    return {
+        entry['episode']: entry
+        for entry in catalog.values()
+        if entry.get('episode') is not None
+    }
+
+
+if __name__ == "__main__":
+    entries = load_catalog(verbose=True)
+    with_guid = sum(1 for e in entries.values() if e.get('guid'))
+    with_transcript = sum(1 for e in entries.values() if e.get('transcript'))
+    print(f"📇 {len(entries)} episodes cataloged ({with_guid} with guid, {with_transcript} with transcript link)")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Corpus-wide MicroBinfie guest index with fuzzy de-duplication.
+
+Every `guests:` entry in content/microbinfie/*.mdx is an appearance. Names
+are normalized (lowercase letters only, titles such as Dr/Prof dropped) and
+appearances with the same normalized name are one guest. Remaining variants
+are merged only when the given names agree (the same name, an initial, or a
+pair in NICKNAMES such as "Nick" / "Nicholas") and the surnames are equal or
+differ by a typo ("Torsten Seeman" / "Seemann"). "Andrew" / "Andrea" or
+"Chris" / "Christine" are different people. Names are only compared within a
+blocking key (the surname, or the first three letters of the given name plus
+the surname initial), so the comparison stays close to linear in the number
+of guests.
+
+Hosts (HOST_NAMES, from scripts/data/hosts.yml) are not guests;
+is_host_name() spots them under any of their spellings.
+
+Each guest gets a stable id: the slug of the name used in their earliest
+appearance. New episodes are always later, so ids do not change as the
+corpus grows. The display name is the most used spelling, and affiliation
+and url come from the most recent appearance that has them (what the guests
+page always did).
+
+    guests = build_guest_index()
+    write_guest_index(guests)   # public/microbinfie-index/guests.json, read by lib/guests.mjs
+"""
+
+import json
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import yaml
+
+from episode_catalog import CONTENT_DIR, load_catalog, mdx_path
+from mdx_frontmatter import atomic_write_text, read_fields
+
+GUEST_INDEX_PATH = Path("public/microbinfie-index/guests.json")
+GUEST_INDEX_VERSION = 1
+# Minimum similarity of two normalized surnames (given names agreeing) to merge them
+SURNAME_THRESHOLD = 0.9
+TITLES = ["dr", "prof", "prof.", "professor"]
+# Short forms of given names: {short form: full names}
+NICKNAMES = {
+    'alex': {'alexander', 'alexandra'}, 'andy': {'andrew'}, 'ben': {'benjamin'},
+    'bill': {'william'}, 'bob': {'robert'}, 'chris': {'christopher'}, 'dan': {'daniel'},
+    'dave': {'david'}, 'greg': {'gregory'}, 'jim': {'james'}, 'joe': {'joseph'},
+    'jon': {'jonathan'}, 'kate': {'katherine', 'catherine'}, 'liz': {'elizabeth'},
+    'matt': {'matthew'}, 'mike': {'michael'}, 'nick': {'nicholas', 'nicolas'},
+    'pete': {'peter'}, 'phil': {'philip', 'phillip'}, 'rob': {'robert'},
+    'sam': {'samuel', 'samantha'}, 'steve': {'stephen', 'steven'}, 'tom': {'thomas'},
+    'tony': {'anthony'}, 'will': {'william'},
+}
+
+# Podcast hosts (never guests), shared with lib/guests.mjs
+HOSTS_FILE = Path(__file__).parent / "data" / "hosts.yml"
+with open(HOSTS_FILE, 'r', encoding='utf-8') as f:
+    HOST_NAMES = [str(name) for name in yaml.safe_load(f) or []]
+
+
+def normalize_name(name: str) -> str:
+    s = name.lower()
+    # remove common titles and punctuation
+    for title in TITLES:
+        s = re.sub(rf"\b{title}\b\.?", "", s)
+    s = re.sub(r"[^a-z]+", "", s)  # keep letters only
+    return s
+
+
+HOST_KEYS = {normalize_name(n) for n in HOST_NAMES}
+
+
+def is_host_name(name):
+    return normalize_name(name) in HOST_KEYS
+
+
+def name_parts(name):
+    """(given, surname) as normalized letters; a single word is treated as the surname.
+    Hyphenated given names count by their first part ("Nabil-Fareed" -> "nabil").
+    """
+    words = [w for w in (normalize_name(w) for w in re.split(r'[\s-]+', name)) if w]
+    if not words:
+        return '', ''
+    return (words[0] if len(words) > 1 else ''), words[-1]
+
+
+def blocking_keys(name):
+    """Keys that any likely duplicate of `name` shares with it."""
+    given, surname = name_parts(name)
+    keys = {f"s:{surname}"} if surname else set()
+    if given and surname:
+        keys.add(f"g:{given[:3]}{surname[0]}")
+    return keys
+
+
+def same_given_name(a, b):
+    """True for the same normalized given name, an initial of it, or a nickname pair."""
+    if a == b:
+        return True
+    if len(a) == 1 or len(b) == 1:
+        return a[0] == b[0]
+    return b in NICKNAMES.get(a, ()) or a in NICKNAMES.get(b, ())
+
+
+def is_same_person(a, b):
+    """Match two display names already known to share a blocking key.
+    Single-word names only match exactly, which normalize_name already covers.
+    """
+    given_a, surname_a = name_parts(a)
+    given_b, surname_b = name_parts(b)
+    if not (given_a and given_b and same_given_name(given_a, given_b)):
+        return False
+    return surname_a == surname_b or SequenceMatcher(None, surname_a, surname_b).ratio() >= SURNAME_THRESHOLD
+
+
+def slugify(name):
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-') or 'guest'
+
+
+def load_appearances(content_dir=CONTENT_DIR, exclude=None):
+    """Return one dict per guest appearance (name, affiliation, url, slug, title, date), oldest first.
+    exclude(name) -> True drops an entry (e.g. a host listed as a guest).
+    """
+    appearances = []
+    for entry in load_catalog(content_dir).values():
+        post = read_fields(mdx_path(entry, content_dir), ('title', 'date', 'guests'))
+        for guest in post.get('guests') or []:
+            name = (guest.get('name') or '').strip() if isinstance(guest, dict) else ''
+            if not name or not normalize_name(name) or (exclude and exclude(name)):
+                continue
+            appearances.append({
+                'name': name,
+                'affiliation': (guest.get('affiliation') or '').strip(),
+                'url': (guest.get('url') or '').strip(),
+                'slug': entry['slug'],
+                'title': post.get('title') or entry['slug'],
+                'date': str(post.get('date') or ''),
+            })
+    appearances.sort(key=lambda a: (a['date'], a['slug']))
+    return appearances
+
+
+def cluster_names(names):
+    """Group display names into people; returns {name: representative name}."""
+    parent = {name: name for name in names}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    # Exact normalized matches first, then fuzzy matches within each block
+    by_key = {}
+    blocks = defaultdict(list)
+    for name in names:
+        union(by_key.setdefault(normalize_name(name), name), name)
+        for key in blocking_keys(name):
+            blocks[key].append(name)
+    for block in blocks.values():
+        for i, a in enumerate(block):
+            for b in block[i + 1:]:
+                if find(a) != find(b) and is_same_person(a, b):
+                    union(a, b)
+    return {name: find(name) for name in names}
+
+
+def build_guest_index(content_dir=CONTENT_DIR, exclude=None):
+    """Return merged guests, most appearances first: [{id, name, aliases, affiliation, url, episodes}]."""
+    appearances = load_appearances(content_dir, exclude)
+    names = list(dict.fromkeys(a['name'] for a in appearances))  # first-appearance order
+    person = cluster_names(names)
+    clusters = defaultdict(list)
+    for appearance in appearances:
+        clusters[person[appearance['name']]].append(appearance)
+
+    guests = []
+    used_ids = Counter()
+    # Oldest first, so an id collision always suffixes the newer guest
+    for group in sorted(clusters.values(), key=lambda g: (g[0]['date'], g[0]['slug'])):
+        base_id = slugify(group[0]['name'])
+        used_ids[base_id] += 1
+        spellings = Counter(a['name'] for a in group)
+        # Most used spelling; ties go to the most recent one
+        name = max(reversed([a['name'] for a in group]), key=spellings.get)
+        episodes = {}
+        for appearance in group:
+            episodes.setdefault(appearance['slug'], {
+                'slug': appearance['slug'], 'title': appearance['title'], 'date': appearance['date'] or None,
+            })
+        guests.append({
+            'id': base_id if used_ids[base_id] == 1 else f"{base_id}-{used_ids[base_id]}",
+            'name': name,
+            'aliases': sorted(set(spellings) - {name}),
+            'affiliation': next((a['affiliation'] for a in reversed(group) if a['affiliation']), ''),
+            'url': next((a['url'] for a in reversed(group) if a['url']), ''),
+            'episodes': sorted(episodes.values(), key=lambda e: e['date'] or '', reverse=True),
+        })
+    guests.sort(key=lambda g: (-len(g['episodes']), name_parts(g['name'])[1], g['id']))
+    return guests
+
+
+def write_guest_index(guests, path=GUEST_INDEX_PATH):
+    """Write the compact JSON artifact read by lib/guests.mjs; returns its size in bytes."""
+    data = json.dumps({'version': GUEST_INDEX_VERSION, 'guests': guests},
+                      ensure_ascii=False, separators=(',', ':'))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, data)
+    return len(data.encode('utf-8'))
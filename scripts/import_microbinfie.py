@@ -1,25 +1,22 @@
 
-import requests
-from bs4 import BeautifulSoup
 from os import  path
 from datetime import datetime
+from podcast_feed import fetch_feed
 import textwrap
 
 rss_feed  = 'https://feeds.soundcloud.com/users/soundcloud:users:698218776/sounds.rss'
 
 def binfie_rss(rss_feed):
-    r = requests.get(rss_feed)
-    soup = BeautifulSoup(r.content, features='html.parser')
-    articles = soup.findAll('item')      
+    items, _status = fetch_feed(rss_feed)
     article_list = []
-    for a in articles:
-        title = a.find('title').text.replace(':', ' ')
-        safe_name = a.find('link').next.strip().split('/')[-1]
-        link = a.find('link').next.strip()
-        tidy_date = ' '.join(a.find('pubdate').text.split(' ')[:4])
+    for a in items:
+        title = a['title'].replace(':', ' ')
+        safe_name = a['link'].split('/')[-1]
+        link = a['link']
+        tidy_date = ' '.join(a['pub_date'].split(' ')[:4])
         published = datetime.strptime(tidy_date, "%a, %d %b %Y")
-        desc = a.find('itunes:summary').next
-        track_id = a.find('guid').next.split('/')[1]
+        desc = a['summary']
+        track_id = a['guid'].split('/')[1]
         emb = f'<iframe width="100%" height="166" scrolling="no" frameborder="no" allow="autoplay" src="https://w.soundcloud.com/player/?url=https%3A//api.soundcloud.com/tracks/{track_id}&color=%23ff5500&auto_play=false&hide_related=false&show_comments=true&show_user=true&show_reposts=false&show_teaser=false"></iframe><div style="font-size: 10px; color: #cccccc;line-break: anywhere;word-break: normal;overflow: hidden;white-space: nowrap;text-overflow: ellipsis; font-family: Interstate,Lucida Grande,Lucida Sans Unicode,Lucida Sans,Garuda,Verdana,Tahoma,sans-serif;font-weight: 100;"><a href="https://soundcloud.com/microbinfie" title="Micro Binfie Podcast" target="_blank" style="color: #cccccc; text-decoration: none;">Micro Binfie Podcast</a> · <a href="https://soundcloud.com/microbinfie/40-a-crash-course-in-sars-cov-2-bioinformatics" title="{title}" target="_blank" style="color: #cccccc; text-decoration: none;">40 A crash course in SARS-CoV-2 bioinformatics</a></div>'
         
         # emb =  f'{link}'
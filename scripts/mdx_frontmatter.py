@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Read and patch YAML frontmatter in MDX files without churning them.
+
+patch_mdx() applies field updates by rewriting only the YAML lines of the
+keys that change; every other key keeps its exact formatting and the body is
+left byte-for-byte unless new content is given. Nothing is written when the
+result would be identical, and writes go through a temp file and rename so
+an interrupted run never leaves a truncated file. patch_many() applies a
+batch of patches across a process pool.
+
+read_header() is the fast path for lookups: it reads only up to the closing
+`---` and parses with libyaml's CSafeLoader when PyYAML was built with it
+(falling back to the pure-Python SafeLoader otherwise). read_fields() goes
+further and parses only the lines of the keys asked for.
+
+    metadata = read_header(path)
+    guid = read_fields(path, ['guid']).get('guid')
+    patch_mdx(path, {'transcript': '/microbinfie-transcripts/episode-09.txt'})
+    patch_many([(path, {'tags': [...]}) for path in paths], workers=8)
+"""
+
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import yaml
+
+# libyaml-backed loader/dumper when available; same results, several times faster
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+class _Delete:
+    """Sentinel update value that removes a key (survives pickling into pool workers)."""
+
+    def __reduce__(self):
+        return 'DELETE'
+
+    def __repr__(self):
+        return 'DELETE'
+
+
+# Pass as an update value to remove a key
+DELETE = _Delete()
+DELIMITER = '---\n'
+# Top-level key at column 0 (continuation lines are indented or list items)
+TOP_LEVEL_KEY_RE = re.compile(r'^([^\s#\-][^:]*):(?:\s|$)')
+# Never wrap long scalars (wrapping is what makes re-dumped headers churn)
+DUMP_WIDTH = 1_000_000
+# Batches smaller than this are patched in-process
+MIN_POOL_BATCH = 16
+
+
+def split_mdx(text):
+    """Return (yaml header text, body) for an MDX document; header is None without frontmatter."""
+    if not text.startswith(DELIMITER):
+        return None, text
+    end = text.find('\n' + DELIMITER, len(DELIMITER) - 1)
+    if end == -1:
+        return None, text
+    return text[len(DELIMITER):end + 1], text[end + 1 + len(DELIMITER):]
+
+
+def load_yaml(text):
+    """Parse a YAML header, returning {} for an empty or missing one."""
+    return (yaml.load(text, Loader=SafeLoader) if text else None) or {}
+
+
+def _read_header_text(mdx_file, block_size=8192):
+    """Return the raw YAML header of an MDX file, reading only until the closing `---`."""
+    with open(mdx_file, 'r', encoding='utf-8') as f:
+        text = f.read(block_size)
+        if not text.startswith(DELIMITER):
+            return None
+        while True:
+            end = text.find('\n' + DELIMITER, len(DELIMITER) - 1)
+            if end != -1:
+                return text[len(DELIMITER):end + 1]
+            more = f.read(block_size)
+            if not more:
+                # Closing delimiter as the last line of the file, or no frontmatter at all
+                closing = '\n' + DELIMITER.rstrip('\n')
+                return text[len(DELIMITER):-len(DELIMITER) + 1] if text.endswith(closing) else None
+            text += more
+
+
+def read_header(mdx_file):
+    """Return the frontmatter dict of an MDX file, reading only up to the closing `---`."""
+    return load_yaml(_read_header_text(mdx_file))
+
+
+def read_fields(mdx_file, keys):
+    """Return {key: value} for just the requested top-level keys.
+    Only the YAML lines of those keys are parsed, which is much cheaper than
+    building the whole header when a lookup needs e.g. guid and transcript.
+    """
+    header = _read_header_text(mdx_file)
+    if not header:
+        return {}
+    wanted = set(keys)
+    lines = header.splitlines(keepends=True)
+    values = {}
+    for key, start, end in _key_spans(lines):
+        if key in wanted:
+            try:
+                values.update(load_yaml(''.join(lines[start:end])))
+            except yaml.YAMLError:
+                # e.g. an alias to an anchor defined under another key
+                return {k: v for k, v in load_yaml(header).items() if k in wanted}
+    return values
+
+
+def read_mdx(mdx_file):
+    """Return (metadata dict, body text) for an MDX file."""
+    header, body = split_mdx(Path(mdx_file).read_text(encoding='utf-8'))
+    return load_yaml(header), body
+
+
+def _dump_key(key, value):
+    return yaml.dump({key: value}, Dumper=SafeDumper, default_flow_style=False,
+                     allow_unicode=True, sort_keys=False, width=DUMP_WIDTH)
+
+
+def _key_spans(lines):
+    """Yield (key, first line, end line) for each top-level key in header lines."""
+    starts = [(i, m.group(1).strip()) for i, line in enumerate(lines)
+              if (m := TOP_LEVEL_KEY_RE.match(line))]
+    for n, (i, key) in enumerate(starts):
+        end = starts[n + 1][0] if n + 1 < len(starts) else len(lines)
+        yield key, i, end
+
+
+def patch_header(header, updates):
+    """Return the header text with `updates` applied, rewriting only the changed keys."""
+    metadata = load_yaml(header)
+    changed = {
+        key: value for key, value in updates.items()
+        if (key in metadata if value is DELETE else metadata.get(key, DELETE) != value)
+    }
+    if not changed:
+        return header
+
+    expected = dict(metadata)
+    for key, value in changed.items():
+        if value is DELETE:
+            expected.pop(key, None)
+        else:
+            expected[key] = value
+
+    lines = (header or '').splitlines(keepends=True)
+    spans = {key: (start, end) for key, start, end in _key_spans(lines)}
+    replacements = {}
+    appended = []
+    for key, value in changed.items():
+        text = '' if value is DELETE else _dump_key(key, value)
+        if key in spans:
+            replacements[spans[key][0]] = (spans[key][1], text)
+        elif text:
+            appended.append(text)
+    out = []
+    i = 0
+    while i < len(lines):
+        if i in replacements:
+            end, text = replacements[i]
+            out.append(text)
+            i = end
+        else:
+            out.append(lines[i])
+            i += 1
+    if out and not out[-1].endswith('\n'):
+        out[-1] += '\n'
+    new_header = ''.join(out + appended)
+
+    # Unusual layouts (flow mappings, anchors, ...) fall back to a full re-dump
+    if load_yaml(new_header) != expected:
+        new_header = yaml.dump(expected, Dumper=SafeDumper, default_flow_style=False,
+                               allow_unicode=True, sort_keys=False, width=DUMP_WIDTH)
+    return new_header
+
+
+def render_mdx(text, updates=None, content=None):
+    """Return the document text with frontmatter updates and (optionally) a new body applied."""
+    header, body = split_mdx(text)
+    if updates:
+        header = patch_header(header, updates)
+    if content is not None and content.strip() != body.strip():
+        body = '\n' + content.strip() + '\n'
+    if header is None:
+        return body
+    return DELIMITER + header + DELIMITER + body
+
+
+def atomic_write_text(path, text):
+    """Write text via a temp file in the same directory and rename it into place."""
+    path = Path(path)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, prefix=f".{path.name}.",
+                                     suffix='.tmp', delete=False) as f:
+        f.write(text)
+    try:
+        if path.exists():
+            os.chmod(f.name, path.stat().st_mode & 0o777)
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+
+def patch_mdx(mdx_file, updates=None, content=None):
+    """Apply frontmatter updates (key -> value, or DELETE) and an optional new body.
+    Returns True if the file was written, False if it was already up to date.
+    """
+    mdx_file = Path(mdx_file)
+    text = mdx_file.read_text(encoding='utf-8')
+    new_text = render_mdx(text, updates, content)
+    if new_text == text:
+        return False
+    atomic_write_text(mdx_file, new_text)
+    return True
+
+
+def _patch_job(job):
+    mdx_file, updates = job[0], job[1]
+    content = job[2] if len(job) > 2 else None
+    try:
+        return mdx_file, patch_mdx(mdx_file, updates, content), None
+    except Exception as e:
+        return mdx_file, False, f"{type(e).__name__}: {e}"
+
+
+def patch_many(patches, workers=None):
+    """Apply (mdx_file, updates[, content]) patches, in a process pool for larger batches.
+    Returns [(mdx_file, written, error or None)] in input order.
+    """
+    patches = list(patches)
+    if workers == 1 or len(patches) < MIN_POOL_BATCH:
+        return [_patch_job(job) for job in patches]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_patch_job, patches, chunksize=8))
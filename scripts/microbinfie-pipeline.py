@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Incremental MicroBinfie pipeline: only new episodes, only missing stages.
+
+This script:
+1. Fetches the RSS feed (conditional request, so an unchanged feed is free)
+2. Diffs it against the pipeline state (last processed guid/pubDate plus
+   per-episode stage status in .cache/microbinfie/pipeline-state.json)
+3. Runs only the stages each selected episode is still missing:
+   downloaded -> transcribed -> linked -> enhanced
+4. Adds completed episodes to the related-episode sidecar
+   (scripts/related_episodes.py)
+
+The first run seeds the state from what is already on disk (transcripts,
+transcript links, AI summaries) without processing the back catalogue.
+
+Usage (from the repo root):
+    python scripts/microbinfie-pipeline.py                 # new episodes only
+    python scripts/microbinfie-pipeline.py --backfill      # plus older episodes with missing stages
+    python scripts/microbinfie-pipeline.py 147 --stages transcribed linked
+    python scripts/microbinfie-pipeline.py --dry-run
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from downloader import download_file
+from episode_catalog import CONTENT_DIR, load_catalog, catalog_by_guid, transcript_file_for
+from mdx_frontmatter import read_mdx
+from pipeline_state import (
+    STAGES, load_state, save_state, episode_state, mark_stage, missing_stages, set_setting,
+)
+from podcast_feed import RSS_FEED_URL, fetch_feed, pub_datetime
+from script_loader import load_script
+
+ENHANCE_START_MARK = "<!-- AI ENHANCEMENT START -->"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run only the missing pipeline stages for new MicroBinfie episodes.")
+    parser.add_argument('episodes', nargs='*', type=int,
+                        help='Only consider these episode numbers (implies --backfill for them)')
+    parser.add_argument('--feed', default=RSS_FEED_URL,
+                        help='RSS feed URL or local XML file (default: SoundCloud feed)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                        help='Limit which stages may run (default: all)')
+    parser.add_argument('--backfill', action='store_true',
+                        help='Also process older episodes that are missing stages')
+    parser.add_argument('--sync', action='store_true',
+                        help='Run scripts/sync-microbinfie.mjs when a new feed item has no MDX file yet')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show what would run without doing anything')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Concurrent chunk uploads when transcribing (default: transcribe-episodes.py default)')
+    return parser.parse_args()
+
+
+def infer_done_stages(entry, transcript_path):
+    """Work out which stages an episode already has from files on disk."""
+    done = []
+    if transcript_path.exists():
+        done += ['downloaded', 'transcribed']
+    if entry.get('transcript'):
+        done.append('linked')
+    mdx_file = CONTENT_DIR / entry['file']
+    if ENHANCE_START_MARK in mdx_file.read_text(encoding='utf-8'):
+        done.append('enhanced')
+    return done
+
+
+class StageRunner:
+    """Runs individual stages, creating API clients only when a stage needs them."""
+
+    def __init__(self, args, state):
+        self.args = args
+        self.state = state
+        self._transcribe = None
+        self._enhance = None
+        self._openai = None
+
+    @property
+    def transcribe(self):
+        if self._transcribe is None:
+            self._transcribe = load_script('transcribe-episodes.py')
+        return self._transcribe
+
+    @property
+    def enhance(self):
+        if self._enhance is None:
+            self._enhance = load_script('enhance-episodes-from-transcripts.py')
+        return self._enhance
+
+    def mp3_path(self, ep):
+        slug = self.transcribe.generate_slug(ep['title'])
+        return self.transcribe.AUDIO_DIR / f"MicroBinfie podcast - {ep['num']:02d} - {slug}.mp3"
+
+    def downloaded(self, ep):
+        path, transferred = download_file(ep['audio_url'], self.mp3_path(ep), ep['audio_length'])
+        print(f"  ✓ Audio ready: {path.name} ({transferred / 1e6:.1f} MB downloaded)")
+        return True
+
+    def transcribed(self, ep):
+        if self._openai is None:
+            api_key = self.transcribe.load_api_key()
+            if not api_key:
+                print("  ❌ OpenAI API key not found in .credentials file")
+                return False
+            self._openai = self.transcribe.OpenAI(api_key=api_key)
+        mp3_path = self.mp3_path(ep)
+        if not mp3_path.exists():
+            # State says downloaded but the audio was cleaned up since
+            self.downloaded(ep)
+        workers = self.args.workers or self.transcribe.DEFAULT_WORKERS
+        return self.transcribe.transcribe_audio(mp3_path, ep['transcript_path'], self._openai, workers=workers)
+
+    def linked(self, ep):
+        return self.transcribe.update_mdx_frontmatter(ep['mdx_file'], ep['num'])
+
+    def enhanced(self, ep):
+        transcript = self.enhance.read_transcript(ep['num'])
+        if not transcript:
+            print("  ⏭️  No transcript available")
+            return False
+        enhancements, model = self.enhance.load_cached_enhancements(transcript, self.enhance.get_model_resolver())
+        if enhancements is not None:
+            print(f"  💾 Using cached enhancement ({model})")
+            return self.enhance.update_episode_mdx(ep['mdx_file'], enhancements)
+        api_key = self.enhance.load_anthropic_api_key()
+        if not api_key:
+            print("  ❌ ANTHROPIC_API_KEY not found (env or .credentials)")
+            return False
+        os.environ["ANTHROPIC_API_KEY"] = api_key
+        metadata, body = read_mdx(ep['mdx_file'])
+        enhancements = self.enhance.enhance_episode_with_ai(
+            ep['num'],
+            metadata.get('title', ep['mdx_file'].name),
+            body.strip(),
+            transcript,
+            metadata.get('guests', []),
+        )
+        if not enhancements:
+            return False
+        # Keep the resolved model in this run's state so it is not overwritten on save
+        resolver = self.enhance.get_model_resolver()
+        if resolver.working:
+            set_setting(self.state, self.enhance.MODEL_SETTING, resolver.working)
+        return self.enhance.update_episode_mdx(ep['mdx_file'], enhancements)
+
+
+def update_related_episodes():
+    """Add newly transcribed episodes to the related-episode sidecar (needs numpy/scipy)."""
+    try:
+        from related_episodes import TOP_K, update_related, write_related
+    except ImportError as e:
+        print(f"⚠️  Skipping related episodes ({e}); install numpy and scipy to build them")
+        return
+    related, how = update_related()
+    write_related(related, TOP_K)
+    print(f"🔗 Related episodes: {how}")
+
+
+def is_pending(state, guid):
+    """True if a tracked, non-seeded episode still has stages to run."""
+    record = state['episodes'].get(guid)
+    return bool(record and not record['seeded'] and missing_stages(state, guid))
+
+
+def newest_done_item(items, state):
+    """The newest tracked feed item that is older than every pending episode, or None.
+    last_pub_date stops there, so a new episode whose stages failed is retried next run.
+    """
+    done = None
+    for item in items:
+        if is_pending(state, item['guid']):
+            done = None
+        elif done is None and item['guid'] in state['episodes']:
+            done = item
+    return done
+
+
+def select_episodes(items, state, guid_index, catalog, args):
+    """Return (work, unmatched): feed episodes with stages to run, and new items with no MDX yet."""
+    fresh_state = state['last_pub_date'] is None
+    last_seen = state['last_pub_date']
+    wanted = set(args.episodes)
+    work = []
+    unmatched = []
+
+    for item in items:
+        guid = item['guid']
+        published = pub_datetime(item)
+        is_new = guid not in state['episodes']
+        # Feed is newest first: everything older than the last run is already known
+        if not (fresh_state or args.backfill or wanted) and not is_new and published and last_seen \
+                and published.isoformat() <= last_seen and not is_pending(state, guid):
+            break
+
+        mdx_file = guid_index.get(guid)
+        if not mdx_file:
+            if is_new and not fresh_state:
+                unmatched.append(item)
+            continue
+        entry = catalog[mdx_file.name]
+        num = entry['episode']
+        if num is None or (wanted and num not in wanted):
+            continue
+
+        transcript_path = transcript_file_for(num)
+        if is_new:
+            record = episode_state(state, guid, num)
+            # On the first run, the existing back catalogue is recorded, not processed
+            record['seeded'] = fresh_state
+            for stage in infer_done_stages(entry, transcript_path):
+                mark_stage(state, guid, stage, num)
+
+        record = episode_state(state, guid, num)
+        if record['seeded'] and not (args.backfill or wanted):
+            continue
+        stages = [s for s in missing_stages(state, guid) if s in args.stages]
+        if stages:
+            work.append({
+                'guid': guid,
+                'num': num,
+                'title': item['title'],
+                'audio_url': item['audio_url'],
+                'audio_length': item['audio_length'],
+                'mdx_file': mdx_file,
+                'transcript_path': transcript_path,
+                'stages': stages,
+            })
+    return work, unmatched
+
+
+def main():
+    args = parse_args()
+
+    print("📻 Fetching RSS feed...")
+    try:
+        items, feed_status = fetch_feed(args.feed)
+    except Exception as e:
+        print(f"❌ Error fetching RSS feed: {e}")
+        sys.exit(1)
+    print(f"📊 {len(items)} episodes in feed ({feed_status})")
+
+    state = load_state()
+    catalog = load_catalog(CONTENT_DIR)
+    guid_index = catalog_by_guid(catalog)
+
+    work, unmatched = select_episodes(items, state, guid_index, catalog, args)
+    if unmatched and args.sync and not args.dry_run:
+        print(f"🔄 {len(unmatched)} new feed item(s) without MDX; running sync-microbinfie.mjs...")
+        subprocess.run(['node', 'scripts/sync-microbinfie.mjs'], check=True)
+        catalog = load_catalog(CONTENT_DIR)
+        guid_index = catalog_by_guid(catalog)
+        work, unmatched = select_episodes(items, state, guid_index, catalog, args)
+    for item in unmatched:
+        print(f"⚠️  No MDX file yet for new episode: {item['title']} (run npm run sync-podcast or pass --sync)")
+
+    if not work:
+        print("✅ Nothing to do: no new episodes or missing stages")
+    runner = StageRunner(args, state)
+    completed = 0
+    failed = 0
+    for ep in work:
+        print(f"\n{'='*60}")
+        print(f"Episode {ep['num']}: {ep['title']}")
+        print(f"  ⏳ Stages to run: {', '.join(ep['stages'])}")
+        print(f"{'='*60}")
+        if args.dry_run:
+            continue
+        for stage in ep['stages']:
+            try:
+                ok = getattr(runner, stage)(ep)
+            except Exception as e:
+                print(f"  ❌ {stage} failed: {e}")
+                ok = False
+            if not ok:
+                failed += 1
+                break
+            mark_stage(state, ep['guid'], stage, ep['num'])
+            # Save after every stage so an interrupted run resumes where it stopped
+            save_state(state)
+        else:
+            completed += 1
+
+    if not args.dry_run:
+        # Remember the newest feed item below which every tracked episode is done
+        item = newest_done_item(items, state)
+        if item:
+            published = pub_datetime(item)
+            state['last_guid'] = item['guid']
+            state['last_pub_date'] = published.isoformat() if published else state['last_pub_date']
+        save_state(state)
+        if completed:
+            update_related_episodes()
+
+    print(f"\n{'='*60}")
+    print(f"✅ Pipeline complete!")
+    print(f"   Episodes completed: {completed}")
+    print(f"   Episodes with failed stages: {failed}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Offline stand-ins for the API clients used by the podcast scripts.
+
+They mimic the small slice of each SDK the scripts call, sleep for a
+configurable latency and count calls, so pipelines can be exercised and
+timed with no network and no API keys.
+"""
+
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+class _OfflineClient:
+    """Shared latency, failure injection and call counting.
+
+    latency: seconds per call (a (min, max) tuple draws uniformly).
+    failure_rate: fraction of calls that raise, to exercise retry paths.
+    """
+
+    def __init__(self, latency, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def _count(self, failed=False):
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.failures += 1
+
+    def _call(self):
+        """Sleep for the configured latency, then count the call or raise a simulated failure."""
+        delay = self._random.uniform(*self.latency) if isinstance(self.latency, tuple) else self.latency
+        time.sleep(delay)
+        if self._random.random() < self.failure_rate:
+            self._count(failed=True)
+            raise RuntimeError("simulated API failure (offline client)")
+        self._count()
+
+
+_WORDS = ("genome assembly reads coverage kraken mlst pipeline sequencing nanopore "
+          "illumina outbreak plasmid phylogeny annotation database contig").split()
+
+
+class FakeAnthropic(_OfflineClient):
+    """Mimics anthropic.Anthropic().messages.create for the enhance script."""
+
+    def __init__(self, latency=0.5, failure_rate=0.0, seed=None):
+        super().__init__(latency, failure_rate, seed)
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, model, max_tokens, messages, **kwargs):
+        self._call()
+        prompt = messages[-1]['content']
+        body = {
+            "summary_lines": [
+                "Offline summary generated without calling the API.",
+                "",
+                "### Key Points",
+                "",
+                "#### 1. Theme 1",
+                "- Placeholder",
+                "",
+                "### Take-Home Messages",
+                "- Placeholder",
+            ],
+            "guests": [],
+            "tags": ["offline-test"],
+        }
+        return SimpleNamespace(
+            model=model,
+            content=[SimpleNamespace(type='text', text=json.dumps(body))],
+            usage=SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=200),
+        )
+
+
+class FakeOpenAI(_OfflineClient):
+    """Mimics OpenAI().audio.transcriptions.create for diarized transcription.
+
+    The audio duration is estimated from the upload size at `bitrate_kbps`,
+    and one segment is returned every `segment_seconds`, alternating between
+    two speakers.
+    """
+
+    def __init__(self, latency=1.0, failure_rate=0.0, seed=None, bitrate_kbps=64, segment_seconds=4.0):
+        super().__init__(latency, failure_rate, seed)
+        self.bitrate_kbps = bitrate_kbps
+        self.segment_seconds = segment_seconds
+        self.uploaded_bytes = 0
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, file, **kwargs):
+        data = file.read()
+        with self._lock:
+            self.uploaded_bytes += len(data)
+        self._call()
+        duration = len(data) * 8 / (self.bitrate_kbps * 1000)
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(start + self.segment_seconds, duration)
+            words = [self._random.choice(_WORDS) for _ in range(int((end - start) * 2.5) + 1)]
+            segments.append(SimpleNamespace(
+                speaker='A' if len(segments) % 4 < 2 else 'B',
+                text=' '.join(words).capitalize() + '.',
+                start=start,
+                end=end,
+            ))
+            start = end
+        return SimpleNamespace(text=' '.join(s.text for s in segments), segments=segments)
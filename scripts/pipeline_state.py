@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Persistent state for the MicroBinfie episode pipeline.
+
+Stored as JSON in .cache/microbinfie/pipeline-state.json:
+{
+  "version": 1,
+  "last_guid": "...", "last_pub_date": "2025-10-30T05:26:59+00:00",
+  "episodes": {
+    "<guid>": {"episode": 147, "seeded": false,
+               "stages": {"downloaded": "<iso time>", "transcribed": "...", ...}}
+  },
+  "settings": {"<name>": <value>}
+}
+
+Stages run in order: downloaded -> transcribed -> linked -> enhanced.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+STATE_PATH = Path(".cache/microbinfie/pipeline-state.json")
+STATE_VERSION = 1
+STAGES = ('downloaded', 'transcribed', 'linked', 'enhanced')
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def load_state(state_path=STATE_PATH):
+    """Load pipeline state, returning a fresh empty state if none exists yet."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            state.setdefault('episodes', {})
+            state.setdefault('settings', {})
+            return state
+    except (OSError, ValueError):
+        pass
+    return {
+        'version': STATE_VERSION,
+        'last_guid': None,
+        'last_pub_date': None,
+        'episodes': {},
+        'settings': {},
+    }
+
+
+def save_state(state, state_path=STATE_PATH):
+    """Atomically write pipeline state."""
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_name(state_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+
+def episode_state(state, guid, episode=None):
+    """Return (creating if needed) the state record for an episode guid."""
+    record = state['episodes'].setdefault(guid, {'episode': episode, 'seeded': False, 'stages': {}})
+    if episode is not None:
+        record['episode'] = episode
+    return record
+
+
+def mark_stage(state, guid, stage, episode=None):
+    """Record that a stage finished for an episode."""
+    if stage not in STAGES:
+        raise ValueError(f"unknown pipeline stage: {stage}")
+    episode_state(state, guid, episode)['stages'][stage] = _now()
+
+
+def missing_stages(state, guid):
+    """Return the stages not yet recorded for an episode, in pipeline order.
+    A recorded stage implies every earlier stage (e.g. audio is not needed
+    again once an episode is transcribed).
+    """
+    done = episode_state(state, guid)['stages']
+    last_done = max((i for i, stage in enumerate(STAGES) if stage in done), default=-1)
+    return list(STAGES[last_done + 1:])
+
+
+def get_setting(state, name, default=None):
+    return state['settings'].get(name, default)
+
+
+def set_setting(state, name, value):
+    state['settings'][name] = value
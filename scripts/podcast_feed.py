@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Fetch and parse the MicroBinfie SoundCloud RSS feed.
+
+- Conditional GET: the ETag / Last-Modified from the previous fetch are sent
+  as If-None-Match / If-Modified-Since, and a 304 returns the cached items
+  without downloading or parsing anything.
+- The feed is parsed with a streaming ElementTree iterparse straight off the
+  response, clearing each <item> once read.
+- Parsed items are cached as gzipped JSON under .cache/microbinfie/.
+
+`source` may also be a local path (or file:// URL), e.g. the fixture feed in
+scripts/fixtures/microbinfie-feed.xml, which is parsed directly and never cached.
+
+Each item is a dict with: title, link, guid, pub_date, description, summary,
+subtitle, duration, image, audio_url, audio_length, audio_type.
+"""
+
+import gzip
+import json
+import os
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+RSS_FEED_URL = "https://feeds.soundcloud.com/users/soundcloud:users:698218776/sounds.rss"
+FEED_CACHE_PATH = Path(".cache/microbinfie/feed.json.gz")
+FIXTURE_FEED = Path(__file__).parent / "fixtures" / "microbinfie-feed.xml"
+
+ITUNES_NS = "{http://www.itunes.com/dtds/podcast-1.0.dtd}"
+
+# Child tag -> item key for plain text fields
+_TEXT_FIELDS = {
+    'title': 'title',
+    'link': 'link',
+    'guid': 'guid',
+    'pubDate': 'pub_date',
+    'description': 'description',
+    f'{ITUNES_NS}summary': 'summary',
+    f'{ITUNES_NS}subtitle': 'subtitle',
+    f'{ITUNES_NS}duration': 'duration',
+}
+
+
+def parse_feed(stream):
+    """Parse RSS XML from a binary file-like object into a list of item dicts."""
+    items = []
+    for _event, elem in ET.iterparse(stream, events=('end',)):
+        if elem.tag != 'item':
+            continue
+        item = {key: None for key in _TEXT_FIELDS.values()}
+        item.update(image=None, audio_url=None, audio_length=None, audio_type=None)
+        for child in elem:
+            key = _TEXT_FIELDS.get(child.tag)
+            if key:
+                item[key] = (child.text or '').strip()
+            elif child.tag == 'enclosure':
+                item['audio_url'] = child.get('url')
+                item['audio_length'] = child.get('length')
+                item['audio_type'] = child.get('type')
+            elif child.tag == f'{ITUNES_NS}image':
+                item['image'] = child.get('href')
+        items.append(item)
+        elem.clear()
+    return items
+
+
+def pub_datetime(item):
+    """Return the item's pubDate as an aware datetime (None if missing)."""
+    if not item.get('pub_date'):
+        return None
+    return parsedate_to_datetime(item['pub_date'])
+
+
+def _local_path(source):
+    if source.startswith('file://'):
+        return Path(source[len('file://'):])
+    if '://' not in source:
+        return Path(source)
+    return None
+
+
+def _read_cache(cache_path):
+    try:
+        with gzip.open(cache_path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(cache_path, cache):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, cache_path)
+
+
+def fetch_feed(source=RSS_FEED_URL, cache_path=FEED_CACHE_PATH, session=None, force=False, timeout=30):
+    """Return the feed's items, re-downloading only if the feed changed.
+
+    Returns (items, status) where status is 'local', 'not-modified' or 'fetched'.
+    force skips the conditional headers and always re-parses.
+    """
+    local = _local_path(str(source))
+    if local is not None:
+        with open(local, 'rb') as f:
+            return parse_feed(f), 'local'
+
+    import requests
+
+    cache = None if force else _read_cache(cache_path)
+    if cache and cache.get('url') != source:
+        cache = None
+    headers = {}
+    if cache:
+        if cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        if cache.get('last_modified'):
+            headers['If-Modified-Since'] = cache['last_modified']
+
+    http = session or requests
+    with http.get(source, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304 and cache:
+            return cache['items'], 'not-modified'
+        response.raise_for_status()
+        response.raw.decode_content = True
+        items = parse_feed(response.raw)
+        _write_cache(cache_path, {
+            'url': source,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'items': items,
+        })
+    return items, 'fetched'
+
+
+if __name__ == "__main__":
+    import sys
+    feed_items, feed_status = fetch_feed(sys.argv[1] if len(sys.argv) > 1 else RSS_FEED_URL)
+    print(f"📻 {len(feed_items)} episodes in feed ({feed_status})")
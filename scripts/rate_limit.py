@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Thread-safe token bucket used to cap request, token and byte rates.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Allow `rate` units per second on average, with bursts up to `capacity`.
+
+    acquire(n) blocks the calling thread until n units are available. A
+    request larger than the capacity is allowed once the bucket is full, so
+    it cannot block forever.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, amount):
+        """Bucket allowing `amount` units per minute, refilled continuously."""
+        return cls(amount / 60.0, capacity=amount)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1):
+        need = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= need:
+                    self._tokens -= amount
+                    return
+                wait = (need - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ApiRateLimiter:
+    """Combined requests/min and tokens/min limit for an LLM API.
+
+    Call acquire(estimated_tokens) before each request; either limit may be
+    None to leave it uncapped.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket.per_minute(tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, estimated_tokens=0):
+        if self.requests:
+            self.requests.acquire(1)
+        if self.tokens and estimated_tokens:
+            self.tokens.acquire(estimated_tokens)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Related-episode recommendations from precomputed transcript vectors.
+
+Every public/microbinfie-transcripts/episode-NN.txt becomes a hashed
+bag-of-words row (tokens as in transcript_index.py, hashed with crc32 into
+N_FEATURES columns, so the columns never depend on the rest of the corpus).
+Raw term counts are kept as a SciPy CSR matrix in .cache/microbinfie/related/;
+rows are TF-IDF weighted (sublinear tf) and L2-normalized, so a row product
+is the cosine similarity, and the top-k neighbours of every episode are
+written to public/microbinfie-index/related.json:
+
+  {"version": 1, "k": 5, "episodes": {"147": {"title", "slug"}},
+   "related": {"147": [[episode, score], ...]}}       (best match first)
+
+Updates are incremental: when only new transcripts appeared, just their rows
+are added and multiplied against the cached matrix, and each older episode's
+list only takes in the new episodes that beat it. Scores already in the lists
+are not re-weighted for the new document frequencies; a changed or removed
+transcript (or --rebuild) recomputes all pairs, in blocks of BLOCK_ROWS.
+
+Usage (from the repo root):
+    python scripts/related_episodes.py              # update and write related.json
+    python scripts/related_episodes.py --rebuild
+    python scripts/related_episodes.py show 147
+"""
+
+import argparse
+import json
+import sys
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+try:
+    import numpy as np
+    from scipy import sparse
+
+    from episode_catalog import CONTENT_DIR, TRANSCRIPT_DIR, catalog_by_episode, load_catalog
+    from mdx_frontmatter import atomic_write_text
+    from transcript_index import index_transcript, transcript_files
+except ImportError as e:
+    # Optional build step: the episode pages just omit related episodes
+    print(f"⚠️  Skipping related episodes: {e} (pip install -r requirements.txt)")
+    sys.exit(0)
+
+CACHE_DIR = Path(".cache/microbinfie/related")
+RELATED_PATH = Path("public/microbinfie-index/related.json")
+RELATED_VERSION = 1
+N_FEATURES = 2 ** 18
+TOP_K = 5
+# Tokens shorter than this, and bare numbers, say nothing about the topic
+MIN_TOKEN_LEN = 3
+# Rows multiplied against the whole matrix at once in a full rebuild
+BLOCK_ROWS = 512
+
+
+def term_features(text):
+    """Return (column indices, raw counts) of a transcript's hashed bag of words."""
+    postings, _, _ = index_transcript(text)
+    counts = Counter()
+    for term, positions in postings.items():
+        if len(term) >= MIN_TOKEN_LEN and not term.isdigit():
+            counts[zlib.crc32(term.encode('utf-8')) % N_FEATURES] += len(positions)
+    columns = sorted(counts)
+    return columns, [counts[c] for c in columns]
+
+
+def count_matrix(rows):
+    """CSR matrix of raw counts from [(columns, counts)], one row per transcript."""
+    indptr = np.cumsum([0] + [len(columns) for columns, _ in rows])
+    indices = np.fromiter((c for columns, _ in rows for c in columns), dtype=np.int32, count=indptr[-1])
+    data = np.fromiter((n for _, counts in rows for n in counts), dtype=np.float64, count=indptr[-1])
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), N_FEATURES))
+
+
+def tfidf_matrix(counts):
+    """L2-normalized rows of (1 + log tf) * smoothed idf."""
+    n_docs = counts.shape[0]
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1 + n_docs) / (1 + df)) + 1
+    weights = counts.astype(np.float64, copy=True)
+    weights.data = (1 + np.log(weights.data)) * idf[weights.indices]
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ weights
+
+
+def top_k(scores, k, exclude=None):
+    """Return [(column, score)] of the k highest positive scores in a 1-D array, best first."""
+    if exclude is not None:
+        scores[exclude] = -1
+    k = min(k, len(scores))
+    best = np.argpartition(-scores, k - 1)[:k] if k else []
+    ranked = sorted(best, key=lambda c: (-scores[c], c))
+    return [(int(c), float(scores[c])) for c in ranked if scores[c] > 0]
+
+
+def all_neighbours(weights, k):
+    """Top-k neighbour rows of every row: {row: [(row, score)]}."""
+    neighbours = {}
+    n_docs = weights.shape[0]
+    transposed = weights.T.tocsc()
+    for start in range(0, n_docs, BLOCK_ROWS):
+        block = (weights[start:start + BLOCK_ROWS] @ transposed).toarray()
+        for offset, scores in enumerate(block):
+            neighbours[start + offset] = top_k(scores, k, exclude=start + offset)
+    return neighbours
+
+
+def add_neighbours(weights, neighbours, new_rows, k):
+    """Add rows new_rows (the last rows of weights) to an existing {row: [(row, score)]}."""
+    scores = (weights[new_rows] @ weights.T.tocsc()).toarray()
+    for offset, row in enumerate(new_rows):
+        neighbours[row] = top_k(scores[offset].copy(), k, exclude=row)
+    new_set = set(new_rows)
+    for row in range(weights.shape[0]):
+        if row in new_set:
+            continue
+        candidates = neighbours.get(row, []) + [(new_row, float(scores[offset, row]))
+                                                for offset, new_row in enumerate(new_rows)
+                                                if scores[offset, row] > 0]
+        neighbours[row] = sorted(candidates, key=lambda c: (-c[1], c[0]))[:k]
+    return neighbours
+
+
+def _file_stamp(path):
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_cache(cache_dir=CACHE_DIR, k=TOP_K):
+    """Return (docs [{'episode', 'stamp'}], counts matrix, {row: [(row, score)]}), or None if unusable."""
+    try:
+        with open(cache_dir / 'state.json', 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        counts = sparse.load_npz(cache_dir / 'counts.npz').tocsr()
+    except (OSError, ValueError):
+        return None
+    if (state.get('version') != RELATED_VERSION or state.get('features') != N_FEATURES
+            or state.get('k') != k or counts.shape[0] != len(state['docs'])):
+        return None
+    neighbours = {int(row): [tuple(n) for n in rows] for row, rows in state['neighbours'].items()}
+    return state['docs'], counts, neighbours
+
+
+def save_cache(docs, counts, neighbours, k, cache_dir=CACHE_DIR):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / 'counts.tmp.npz'
+    sparse.save_npz(tmp_path, counts)
+    tmp_path.replace(cache_dir / 'counts.npz')
+    state = {
+        'version': RELATED_VERSION, 'features': N_FEATURES, 'k': k, 'docs': docs,
+        'neighbours': {str(row): [[other, round(score, 4)] for other, score in rows]
+                       for row, rows in neighbours.items()},
+    }
+    atomic_write_text(cache_dir / 'state.json', json.dumps(state, separators=(',', ':')))
+
+
+def update_related(transcript_dir=TRANSCRIPT_DIR, cache_dir=CACHE_DIR, k=TOP_K, rebuild=False):
+    """Bring the cached vectors and neighbour lists up to date.
+    Returns ({episode: [(episode, score)]}, how: 'unchanged' | 'added N' | 'rebuilt').
+    """
+    files = transcript_files(transcript_dir)
+    cached = None if rebuild else load_cache(cache_dir, k)
+    if cached is not None:
+        docs, counts, neighbours = cached
+        known = {doc['episode'] for doc in docs}
+        stale = any(doc['episode'] not in files or _file_stamp(files[doc['episode']]) != doc['stamp']
+                    for doc in docs)
+        new_episodes = sorted(set(files) - known)
+        if stale:
+            cached = None
+        elif new_episodes:
+            new_docs = [{'episode': ep, 'stamp': _file_stamp(files[ep])} for ep in new_episodes]
+            rows = [term_features(files[ep].read_text(encoding='utf-8')) for ep in new_episodes]
+            counts = sparse.vstack([counts, count_matrix(rows)], format='csr')
+            new_rows = list(range(len(docs), len(docs) + len(new_docs)))
+            docs += new_docs
+            neighbours = add_neighbours(tfidf_matrix(counts), neighbours, new_rows, k)
+            how = f"added {len(new_docs)}"
+        else:
+            how = 'unchanged'
+
+    if cached is None:
+        episodes = sorted(files)
+        docs = [{'episode': ep, 'stamp': _file_stamp(files[ep])} for ep in episodes]
+        counts = count_matrix([term_features(files[ep].read_text(encoding='utf-8')) for ep in episodes])
+        neighbours = all_neighbours(tfidf_matrix(counts), k)
+        how = 'rebuilt'
+
+    if how != 'unchanged':
+        save_cache(docs, counts, neighbours, k, cache_dir)
+    by_episode = {
+        docs[row]['episode']: [(docs[other]['episode'], score) for other, score in rows]
+        for row, rows in neighbours.items()
+    }
+    return by_episode, how
+
+
+def write_related(related, k=TOP_K, path=RELATED_PATH, catalog=None):
+    """Write the compact JSON sidecar for the site; returns its size in bytes."""
+    if catalog is None:
+        catalog = load_catalog(CONTENT_DIR)
+    by_episode = catalog_by_episode(catalog)
+    episodes = {}
+    for episode in sorted(related):
+        entry = by_episode.get(episode) or {}
+        episodes[str(episode)] = {'title': entry.get('title'), 'slug': entry.get('slug')}
+    data = json.dumps({
+        'version': RELATED_VERSION,
+        'k': k,
+        'episodes': episodes,
+        'related': {str(ep): [[other, round(score, 4)] for other, score in related[ep]] for ep in sorted(related)},
+    }, ensure_ascii=False, separators=(',', ':'))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, data)
+    return len(data.encode('utf-8'))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Find related MicroBinfie episodes from their transcripts.")
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('update', help='Add new transcripts and write the sidecar (default)')
+    show = sub.add_parser('show', help="Print an episode's related episodes")
+    show.add_argument('episode', type=int)
+    parser.add_argument('-k', type=int, default=TOP_K, help=f'Related episodes per episode (default: {TOP_K})')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute every pair from scratch')
+    parser.add_argument('--out', type=Path, default=RELATED_PATH,
+                        help=f'Sidecar file (default: {RELATED_PATH})')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not TRANSCRIPT_DIR.exists():
+        print(f"❌ Transcript directory not found: {TRANSCRIPT_DIR}")
+        sys.exit(1)
+    started = time.monotonic()
+    related, how = update_related(k=args.k, rebuild=args.rebuild)
+    catalog = load_catalog(CONTENT_DIR)
+
+    if args.command == 'show':
+        if args.episode not in related:
+            print(f"❌ No transcript for episode {args.episode}")
+            sys.exit(1)
+        titles = {num: entry['title'] for num, entry in catalog_by_episode(catalog).items()}
+        print(f"🔗 Related to episode {args.episode}: {titles.get(args.episode) or ''}")
+        for episode, score in related[args.episode]:
+            print(f"  Episode {episode:>3}  {score:.3f}  {titles.get(episode) or ''}")
+        return
+
+    size = write_related(related, args.k, args.out, catalog)
+    print(f"🔗 Related episodes ({how}): {len(related)} episodes x top {args.k}, "
+          f"{size / 1e3:.1f} kB -> {args.out} ({time.monotonic() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Retry helper with exponential backoff for the podcast scripts' API calls.
+"""
+
+import random
+import time
+
+
+def call_with_retry(fn, attempts=4, base_delay=2.0, max_delay=60.0, label=None, on_retry=None,
+                    retryable=None):
+    """Call fn() until it succeeds, sleeping base_delay * 2**n (plus jitter) between tries.
+
+    Re-raises the last exception once all attempts are used up, or at once if
+    retryable(exc) is given and returns False. on_retry, if given, is called as
+    on_retry(attempt, exc, delay) before each sleep.
+    """
+    attempts = max(1, int(attempts))
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts or (retryable and not retryable(e)):
+                raise
+            delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+            delay += random.uniform(0, delay / 4)
+            if on_retry:
+                on_retry(attempt, e, delay)
+            else:
+                what = f"{label}: " if label else ""
+                print(f"  🔁 {what}attempt {attempt}/{attempts} failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
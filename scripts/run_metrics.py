@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Per-episode, per-stage instrumentation for the transcribe and enhance scripts.
+
+Each stage of an episode (download, transcribe, format, map, reduce, ...) is
+timed with a context manager and can accumulate counters from any thread:
+
+    metrics = RunMetrics('transcribe')
+    with metrics.stage(145, 'transcribe') as stage:
+        stage.add(audio_seconds=2712.4, api_calls=1, bytes_uploaded=len(chunk))
+    metrics.print_summary()
+
+When a stage finishes it is appended to a JSONL file straight away (one
+object per line, so an interrupted backfill still leaves a usable log), by
+default under .cache/microbinfie/metrics/<script>-<run id>.jsonl:
+
+    {"run": "20261018T141502", "script": "transcribe", "episode": 145,
+     "stage": "transcribe", "status": "ok", "wall_s": 41.83,
+     "audio_seconds": 2712.4, "api_calls": 2, "bytes_uploaded": 21693440, ...}
+
+print_summary() aggregates the stages into an end-of-run table. Audio
+seconds and tokens in/out are what the APIs bill for, and wall time per
+stage shows where a backfill waits, which is what concurrency settings are
+sized from.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+METRICS_DIR = Path(".cache/microbinfie/metrics")
+# Counters shown in the summary table, in column order: (key, heading, scale, format)
+SUMMARY_COUNTERS = [
+    ('audio_seconds', 'Audio min', 1 / 60, '{:.1f}'),
+    ('bytes_uploaded', 'Up MB', 1e-6, '{:.1f}'),
+    ('api_calls', 'Calls', 1, '{:.0f}'),
+    ('cache_hits', 'Cached', 1, '{:.0f}'),
+    ('tokens_in', 'Tok in', 1, '{:,.0f}'),
+    ('tokens_out', 'Tok out', 1, '{:,.0f}'),
+    ('retries', 'Retries', 1, '{:.0f}'),
+]
+
+
+class StageRecord:
+    """Counters for one stage of one episode; add() is safe to call from worker threads."""
+
+    def __init__(self, episode, stage):
+        self.episode = episode
+        self.stage = stage
+        self.status = 'ok'
+        self.error = None
+        self.wall_s = 0.0
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self.counts[key] = self.counts.get(key, 0) + value
+
+    def fail(self, error=None):
+        """Mark the stage failed without raising (for code that reports errors by return value)."""
+        self.status = 'error'
+        self.error = str(error) if error is not None else None
+
+    def to_dict(self):
+        data = {'episode': self.episode, 'stage': self.stage, 'status': self.status,
+                'wall_s': round(self.wall_s, 3)}
+        with self._lock:
+            data.update(self.counts)
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+class RunMetrics:
+    """Collects StageRecords for one script run and writes each to JSONL as it finishes.
+
+    path=None writes to METRICS_DIR/<script>-<run id>.jsonl; path=False keeps
+    the records in memory only.
+    """
+
+    def __init__(self, script, path=None):
+        self.script = script
+        self.run_id = time.strftime('%Y%m%dT%H%M%S')
+        self.records = []
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        if path is None:
+            path = METRICS_DIR / f"{script}-{self.run_id}.jsonl"
+        self.path = Path(path) if path else None
+        self._file = None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    @contextmanager
+    def stage(self, episode, stage):
+        """Time a stage; an exception escaping the block marks it failed and is re-raised."""
+        record = StageRecord(episode, stage)
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.fail(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            record.wall_s = time.perf_counter() - started
+            self._finish(record)
+
+    def record(self, episode, stage, **counts):
+        """Log counters that are not tied to a timed block (e.g. a retry decision)."""
+        record = StageRecord(episode, stage)
+        record.add(**counts)
+        self._finish(record)
+
+    def _finish(self, record):
+        line = {'run': self.run_id, 'script': self.script, **record.to_dict()}
+        with self._lock:
+            self.records.append(record)
+            if self._file:
+                self._file.write(json.dumps(line, ensure_ascii=False) + '\n')
+                self._file.flush()
+
+    def summary(self):
+        """Return per-stage totals in first-seen stage order."""
+        totals = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            row = totals.setdefault(record.stage, {
+                'stage': record.stage, 'runs': 0, 'errors': 0, 'episodes': set(),
+                'wall_s': 0.0, 'max_wall_s': 0.0, 'counts': {},
+            })
+            row['runs'] += 1
+            row['errors'] += record.status != 'ok'
+            if record.episode is not None:
+                row['episodes'].add(record.episode)
+            row['wall_s'] += record.wall_s
+            row['max_wall_s'] = max(row['max_wall_s'], record.wall_s)
+            for key, value in record.counts.items():
+                row['counts'][key] = row['counts'].get(key, 0) + value
+        return list(totals.values())
+
+    def print_summary(self):
+        """Print the per-stage table, showing only counters some stage recorded."""
+        rows = self.summary()
+        if not rows:
+            return
+        columns = [c for c in SUMMARY_COUNTERS if any(c[0] in row['counts'] for row in rows)]
+        headings = ['Stage', 'Runs', 'Eps', 'Wall s', 'Mean s', 'Max s'] + [c[1] for c in columns] + ['Errors']
+        table = []
+        for row in rows:
+            cells = [row['stage'], str(row['runs']), str(len(row['episodes'])),
+                     f"{row['wall_s']:.1f}", f"{row['wall_s'] / row['runs']:.2f}", f"{row['max_wall_s']:.2f}"]
+            for key, _, scale, fmt in columns:
+                value = row['counts'].get(key)
+                cells.append(fmt.format(value * scale) if value is not None else '-')
+            cells.append(str(row['errors']))
+            table.append(cells)
+        widths = [max(len(h), *(len(r[i]) for r in table)) for i, h in enumerate(headings)]
+
+        def fmt_row(cells):
+            return '  '.join(c.ljust(w) if i == 0 else c.rjust(w) for i, (c, w) in enumerate(zip(cells, widths)))
+
+        print(f"\n⏱️  Stage metrics ({time.monotonic() - self.started:.1f}s elapsed; "
+              "stage wall times overlap when episodes run concurrently)")
+        print('   ' + fmt_row(headings))
+        print('   ' + '  '.join('-' * w for w in widths))
+        for cells in table:
+            print('   ' + fmt_row(cells))
+        if self.path:
+            print(f"   JSONL: {self.path}")
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
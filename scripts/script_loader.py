@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Import the hyphenated podcast scripts (e.g. transcribe-episodes.py) as modules,
+so pipeline and benchmark tools can reuse their functions.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_script(filename):
+    """Load scripts/<filename> once and return it as a module."""
+    path = SCRIPTS_DIR / filename
+    module_name = path.stem.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
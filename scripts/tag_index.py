@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Canonical tag vocabulary and tag co-occurrence index for MicroBinfie episodes.
+
+Near-duplicate tags are clustered without comparing every pair: each tag is
+reduced to lookup keys and tags sharing a key are merged.
+
+  - spelling key: lowercase, hyphenated, light suffix stemming, so "E-coli"
+    = "e-coli" and "genome-sequencing" = "genomic-sequencing"
+  - a generic trailing qualifier ("mlst-analysis", "covid-19-research") or
+    leading domain word ("genome-assembly") merges into the shorter tag when
+    that tag is also in use
+  - curated merges from scripts/data/tag-vocabulary.yml
+
+Each cluster's canonical tag is the curated one if any, else its most used
+spelling. write_tag_index() writes the static artifact with tag -> episodes,
+tag x tag co-occurrence counts and the merged spellings, read by
+lib/tags.mjs so the episode list shows canonical topics (even before the
+MDX files are rewritten) and related topics.
+
+    mapping = build_tag_mapping(tag_counts)          # {tag: canonical tag}
+    tags = canonical_tags(['Genomic-Assembly'], tag_counts)
+"""
+
+import json
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+from episode_catalog import CONTENT_DIR, load_catalog, mdx_path
+from mdx_frontmatter import atomic_write_text, read_fields
+
+VOCABULARY_FILE = Path(__file__).parent / "data" / "tag-vocabulary.yml"
+TAG_INDEX_PATH = Path("public/microbinfie-index/tags.json")
+TAG_INDEX_VERSION = 1
+# Trailing words that do not change what a tag is about
+QUALIFIER_WORDS = {'analysis', 'research', 'method', 'methods'}
+# Leading words that every episode of this podcast is about anyway
+DOMAIN_WORDS = {'genome', 'genomic', 'genomics'}
+STEM_SUFFIXES = ('ics', 'ic', 'es', 's', 'e')
+MIN_STEM = 4
+
+
+def normalize_tag(tag):
+    """'Genome Assembly' -> 'genome-assembly'."""
+    return re.sub(r'[^a-z0-9]+', '-', str(tag).lower()).strip('-')
+
+
+def _stem(word):
+    for suffix in STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def spelling_key(tag):
+    return '-'.join(_stem(word) for word in normalize_tag(tag).split('-'))
+
+
+@lru_cache(maxsize=None)
+def load_vocabulary(path=VOCABULARY_FILE):
+    """Return {alias spelling key: canonical tag} from the curated vocabulary, parsed once per process."""
+    with open(path, 'r', encoding='utf-8') as f:
+        table = yaml.safe_load(f) or {}
+    aliases = {}
+    for canonical, names in table.items():
+        for name in [canonical, *(names or [])]:
+            aliases[spelling_key(name)] = normalize_tag(canonical)
+    return aliases
+
+
+def build_tag_mapping(tag_counts, vocabulary=None):
+    """Return {tag as written: canonical tag} for every tag in a {tag: episode count} Counter."""
+    vocabulary = load_vocabulary() if vocabulary is None else vocabulary
+    parent = {}
+
+    def find(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(a, b):
+        parent[find(b)] = find(a)
+
+    key_counts = Counter()
+    spellings = defaultdict(Counter)
+    for tag, count in tag_counts.items():
+        key = spelling_key(tag)
+        find(key)
+        key_counts[key] += count
+        spellings[key][normalize_tag(tag)] += count
+    for key in list(key_counts):
+        words = key.split('-')
+        if len(words) > 1 and words[-1] in {_stem(w) for w in QUALIFIER_WORDS} and '-'.join(words[:-1]) in key_counts:
+            union('-'.join(words[:-1]), key)
+        if len(words) > 1 and words[0] in {_stem(w) for w in DOMAIN_WORDS} and '-'.join(words[1:]) in key_counts:
+            union('-'.join(words[1:]), key)
+        if key in vocabulary:
+            canonical_key = spelling_key(vocabulary[key])
+            find(canonical_key)
+            union(canonical_key, key)
+
+    clusters = defaultdict(list)
+    for key in key_counts:
+        clusters[find(key)].append(key)
+    canonical_for_key = {}
+    for root, keys in clusters.items():
+        curated = next((vocabulary[k] for k in [root, *keys] if k in vocabulary), None)
+        if curated:
+            canonical = curated
+        else:
+            merged = Counter()
+            for key in keys:
+                merged.update(spellings[key])
+            canonical = min(merged, key=lambda t: (-merged[t], len(t), t))
+        for key in keys:
+            canonical_for_key[key] = canonical
+    return {tag: canonical_for_key[spelling_key(tag)] for tag in tag_counts}
+
+
+def canonical_tags(tags, corpus_counts, vocabulary=None):
+    """Map new tags (e.g. fresh from the model) onto the corpus vocabulary, dropping
+    duplicates but keeping order. corpus_counts is the {tag: episode count} of the corpus.
+    """
+    mapping = build_tag_mapping(corpus_counts + Counter(tags), vocabulary)
+    return list(dict.fromkeys(mapping[tag] for tag in tags if normalize_tag(tag)))
+
+
+def load_episode_tags(content_dir=CONTENT_DIR):
+    """Return [{'slug', 'title', 'date', 'mdx_file', 'tags'}], newest first."""
+    episodes = []
+    for entry in load_catalog(content_dir).values():
+        path = mdx_path(entry, content_dir)
+        post = read_fields(path, ('title', 'date', 'tags'))
+        episodes.append({
+            'slug': entry['slug'],
+            'title': post.get('title') or entry['slug'],
+            'date': str(post.get('date') or ''),
+            'mdx_file': path,
+            'tags': [str(t) for t in post.get('tags') or []],
+        })
+    episodes.sort(key=lambda e: (e['date'], e['slug']), reverse=True)
+    return episodes
+
+
+def corpus_tag_counts(episodes):
+    return Counter(tag for episode in episodes for tag in set(episode['tags']))
+
+
+def build_tag_index(episodes, mapping=None):
+    """Return the index dict: episodes, tags with counts, tag -> episode ids, co-occurrence
+    and aliases (each merged spelling in mapping -> its canonical tag).
+    Episode tags must already be canonical.
+    """
+    tag_episodes = defaultdict(list)
+    cooccurrence = defaultdict(Counter)
+    for doc_id, episode in enumerate(episodes):
+        tags = episode['tags']
+        for tag in tags:
+            tag_episodes[tag].append(doc_id)
+            for other in tags:
+                if other != tag:
+                    cooccurrence[tag][other] += 1
+    tags = sorted(tag_episodes, key=lambda t: (-len(tag_episodes[t]), t))
+    return {
+        'version': TAG_INDEX_VERSION,
+        'episodes': [{'slug': e['slug'], 'title': e['title']} for e in episodes],
+        'tags': [[tag, len(tag_episodes[tag])] for tag in tags],
+        'tagEpisodes': {tag: tag_episodes[tag] for tag in tags},
+        'aliases': {tag: canonical for tag, canonical in sorted((mapping or {}).items()) if tag != canonical},
+        # Most frequent co-occurring tags first
+        'cooccurrence': {tag: [[other, n] for other, n in sorted(cooccurrence[tag].items(), key=lambda kv: (-kv[1], kv[0]))]
+                         for tag in tags if cooccurrence[tag]},
+    }
+
+
+def write_tag_index(index, path=TAG_INDEX_PATH):
+    """Write the compact JSON artifact; returns its size in bytes."""
+    data = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, data)
+    return len(data.encode('utf-8'))
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Single-pass normalization of brand names, people and terms.
+
+A profile in scripts/data/term-variants.yml maps each canonical spelling to
+its variants. TermNormalizer compiles a profile into one case-insensitive
+regex shaped like a trie of the variants (shared prefixes are tested once,
+longest match wins, whole words only) and rewrites every match in a single
+scan of the text, looking the canonical spelling up from the matched text.
+That keeps it cheap enough to run over every transcript, where one re.sub
+per variant would rescan the text once per pattern.
+
+    normalizer = get_normalizer('transcripts')
+    text = normalizer.normalize(text)
+    text, counts = normalizer.normalize_with_counts(text)   # {(found, canonical): n}
+
+Usage (from the repo root; reports what would change, writes nothing):
+    python scripts/term_normalizer.py
+    python scripts/term_normalizer.py --profile summary path/to/file.txt
+"""
+
+import argparse
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+TERMS_FILE = Path(__file__).parent / "data" / "term-variants.yml"
+TRANSCRIPT_DIR = Path("public/microbinfie-transcripts")
+
+
+def match_key(text):
+    """Lookup key for a variant or a matched span: lowercase, whitespace removed."""
+    return ''.join(text.lower().split())
+
+
+# A space inside a variant: optional spaces or tabs (never a line break)
+_GAP = ' '
+_GAP_PATTERN = r'[^\S\n]*'
+
+
+def _build_trie(variants):
+    """Character trie of lowercased variants; '' marks the end of a variant."""
+    root = {}
+    for variant in variants:
+        node = root
+        for char in _GAP.join(variant.lower().split()):
+            node = node.setdefault(char, {})
+        node[''] = True
+    return root
+
+
+def _trie_pattern(node):
+    """Regex matching exactly the variants below a trie node, preferring the longest."""
+    branches = [(_GAP_PATTERN if char == _GAP else re.escape(char)) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # A variant may also end here; the greedy ? tries the longer ones first
+    return f'(?:{pattern})?' if '' in node else pattern
+
+
+class TermNormalizer:
+    """Rewrite every variant in a {canonical: [variants]} table to its canonical spelling."""
+
+    def __init__(self, table):
+        self.canonical = {}
+        variants = set()
+        for canonical, names in table.items():
+            for variant in [canonical, *(names or [])]:
+                key = match_key(variant)
+                if self.canonical.setdefault(key, canonical) != canonical:
+                    raise ValueError(f"variant {variant!r} maps to both "
+                                     f"{self.canonical[key]!r} and {canonical!r}")
+                variants.add(variant)
+        pattern = rf'\b{_trie_pattern(_build_trie(variants))}\b'
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+        # Same trie over UTF-8 bytes, for scanning files (or mmaps) without decoding them
+        self.byte_pattern = re.compile(pattern.encode('utf-8'), re.IGNORECASE)
+
+    def _replace(self, match):
+        return self.canonical[match_key(match.group(0))]
+
+    def normalize(self, text):
+        return self.pattern.sub(self._replace, text)
+
+    def normalize_with_counts(self, text):
+        """Return (normalized text, Counter of {(text found, canonical): count}) for changed spans only."""
+        counts = Counter()
+
+        def _replace(match):
+            found = match.group(0)
+            canonical = self.canonical[match_key(found)]
+            if found != canonical:
+                counts[(found, canonical)] += 1
+            return canonical
+
+        return self.pattern.sub(_replace, text), counts
+
+    def replacements(self, text):
+        """Yield (start, end, canonical) for each span that would change, in text order."""
+        for match in self.pattern.finditer(text):
+            canonical = self._replace(match)
+            if match.group(0) != canonical:
+                yield match.start(), match.end(), canonical
+
+    def byte_replacements(self, data):
+        """Like replacements() over UTF-8 bytes (e.g. an mmap), yielding byte offsets and encoded text.
+        Case-insensitivity covers ASCII letters only, since that is all bytes patterns fold.
+        """
+        size = len(data)
+        for match in self.byte_pattern.finditer(data):
+            start, end = match.span()
+            # Bytes-mode \b treats non-ASCII letters as non-word characters; keep to whole words
+            if (start and data[start - 1] >= 0x80) or (end < size and data[end] >= 0x80):
+                continue
+            found = match.group(0).decode('utf-8')
+            canonical = self.canonical[match_key(found)]
+            if found != canonical:
+                yield start, end, canonical.encode('utf-8')
+
+
+def load_table(profile, path=TERMS_FILE):
+    """Return the {canonical: [variants]} table for one profile of the variants file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        profiles = yaml.safe_load(f) or {}
+    if profile not in profiles:
+        raise KeyError(f"no profile {profile!r} in {path} (have: {', '.join(profiles)})")
+    return profiles[profile]
+
+
+@lru_cache(maxsize=None)
+def get_normalizer(profile, path=TERMS_FILE):
+    """Compiled normalizer for a profile, built once per process."""
+    return TermNormalizer(load_table(profile, path))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Report the term normalizations a profile would make.")
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help=f'Text files to check (default: {TRANSCRIPT_DIR}/*.txt)')
+    parser.add_argument('--profile', default='transcripts',
+                        help=f'Profile in {TERMS_FILE.name} (default: transcripts)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    paths = args.paths or sorted(TRANSCRIPT_DIR.glob('*.txt'))
+    started = time.perf_counter()
+    normalizer = get_normalizer(args.profile)
+    counts = Counter()
+    changed_files = 0
+    total_bytes = 0
+    for path in paths:
+        text = path.read_text(encoding='utf-8')
+        total_bytes += len(text)
+        _, file_counts = normalizer.normalize_with_counts(text)
+        if file_counts:
+            changed_files += 1
+            counts.update(file_counts)
+    elapsed = time.perf_counter() - started
+
+    for (found, canonical), n in counts.most_common():
+        print(f"  {n:5d}  {found!r} -> {canonical!r}")
+    print(f"\n🔤 {sum(counts.values())} replacement(s) in {changed_files}/{len(paths)} file(s), "
+          f"{total_bytes / 1e6:.1f} MB scanned in {elapsed:.2f}s (nothing written)")
+
+
+if __name__ == "__main__":
+    main()
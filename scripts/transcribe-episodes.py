@@ -13,24 +13,50 @@ This script:
 import os
 import re
 import sys
-import requests
-import xml.etree.ElementTree as ET
 from pathlib import Path
-import frontmatter
 from openai import OpenAI
 from pydub import AudioSegment
 from mutagen import File as MutagenFile
 import io
+import argparse
 import subprocess
 import shlex
 import tempfile
 import imageio_ffmpeg
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from episode_catalog import load_catalog, catalog_by_guid, transcript_file_for, transcript_link
+from mdx_frontmatter import patch_mdx
+from retry_utils import call_with_retry
+from downloader import download_many
+from podcast_feed import RSS_FEED_URL, fetch_feed
+from transcription_cache import chunk_cache_key, load_manifest, load_segments, store_manifest, store_segments
+from transcript_store import dump_segment_record, segment_index_path
+from run_metrics import RunMetrics
 
 # Configuration
-RSS_FEED_URL = "https://feeds.soundcloud.com/users/soundcloud:users:698218776/sounds.rss"
 AUDIO_DIR = Path("podcast_episode_audio")
 TRANSCRIPT_DIR = Path("public/microbinfie-transcripts")
 CONTENT_DIR = Path("content/microbinfie")
+TRANSCRIBE_MODEL = "gpt-4o-transcribe-diarize"
+# Request parameters that shape the API result; part of the transcription cache key
+TRANSCRIBE_PARAMS = {
+    'response_format': 'diarized_json',
+    'chunking_strategy': 'auto',
+}
+# Concurrent chunk uploads per episode (override with --workers or TRANSCRIBE_WORKERS)
+DEFAULT_WORKERS = int(os.environ.get("TRANSCRIBE_WORKERS", "4"))
+# Chunk lengths: the diarize model accepts at most 1400s of audio per request
+FIXED_CHUNK_SECONDS = 1200
+MAX_CHUNK_SECONDS = 1380
+# Silence planner: look back this far from the limit for a pause of at least MIN_SILENCE_SECONDS
+SILENCE_SEARCH_SECONDS = 180
+MIN_SILENCE_SECONDS = 0.5
+SILENCE_FRAME_SECONDS = 0.1
+SILENCE_RELATIVE_LEVEL = 0.1
+# Stay a little under the API's 25 MB per-file upload limit
+MAX_UPLOAD_BYTES = 24 * 1024 * 1024
+# In-progress transcripts are written as episode-NN.txt.partial
+PARTIAL_SUFFIX = '.partial'
 
 # Load OpenAI API key from .credentials file
 def load_api_key():
@@ -125,6 +151,169 @@ def chunk_audio_to_bytes(audio_path: Path, max_seconds: int = 1200):
         yield (start_sec, buf)
         start_sec += this_len
 
+def decode_rms_frames(audio_path: Path, frame_seconds: float = SILENCE_FRAME_SECONDS, sample_rate: int = 8000):
+    """Decode audio once to 8 kHz mono PCM and return per-frame RMS energy as a NumPy array.
+    PCM is streamed from ffmpeg in blocks, so the decoded audio is never held in memory.
+    """
+    import numpy as np
+
+    ffmpeg_path = ensure_ffmpeg_available()
+    if not ffmpeg_path:
+        raise RuntimeError("ffmpeg binary not available (imageio-ffmpeg)")
+    frame_samples = int(sample_rate * frame_seconds)
+    cmd = [
+        ffmpeg_path,
+        '-hide_banner',
+        '-loglevel', 'error',
+        '-i', str(audio_path),
+        '-vn',
+        '-ac', '1',
+        '-ar', str(sample_rate),
+        '-f', 's16le',
+        'pipe:1'
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    block_bytes = frame_samples * 2 * 600  # one minute of frames per read
+    rms_blocks = []
+    leftover = b''
+    try:
+        while True:
+            data = proc.stdout.read(block_bytes)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - len(data) % (frame_samples * 2)
+            leftover = data[usable:]
+            if usable:
+                samples = np.frombuffer(data[:usable], dtype='<i2').astype(np.float32)
+                frames = samples.reshape(-1, frame_samples)
+                rms_blocks.append(np.sqrt(np.mean(frames * frames, axis=1)))
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {audio_path.name} for silence detection")
+    return np.concatenate(rms_blocks) if rms_blocks else np.zeros(0, dtype=np.float32)
+
+def plan_silence_boundaries(audio_path: Path, max_seconds: int = MAX_CHUNK_SECONDS,
+                            search_seconds: int = SILENCE_SEARCH_SECONDS,
+                            min_silence_seconds: float = MIN_SILENCE_SECONDS):
+    """Plan chunk cut points (seconds) that fall in pauses, each chunk <= max_seconds.
+    Scans the audio once: for each chunk, looks back `search_seconds` from the
+    max_seconds limit for the quietest `min_silence_seconds` stretch, preferring the
+    latest pause that counts as silence for this episode so chunks stay large.
+    Returns None when NumPy is unavailable so callers fall back to fixed cuts.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        print("  ⚠️  NumPy not installed; using fixed chunk boundaries")
+        return None
+
+    rms = decode_rms_frames(audio_path)
+    frames_per_second = 1.0 / SILENCE_FRAME_SECONDS
+    total_frames = len(rms)
+    max_frames = int(max_seconds * frames_per_second)
+    if total_frames <= max_frames:
+        return []
+
+    # Average energy over a sliding pause-length window
+    width = max(1, int(min_silence_seconds * frames_per_second))
+    smoothed = np.convolve(rms, np.ones(width, dtype=np.float32) / width, mode='same')
+    # Episode-relative silence level: ~20 dB below the typical (median) energy
+    threshold = float(np.median(smoothed)) * SILENCE_RELATIVE_LEVEL
+    search_frames = int(search_seconds * frames_per_second)
+
+    cuts = []
+    cut = 0
+    while total_frames - cut > max_frames:
+        hi = cut + max_frames
+        lo = max(cut + 1, hi - search_frames)
+        window = smoothed[lo:hi]
+        quiet = np.flatnonzero(window <= threshold)
+        if len(quiet):
+            # Latest qualifying pause keeps chunks large; cut in the middle of it
+            run_end = int(quiet[-1])
+            breaks = np.flatnonzero(np.diff(quiet) > 1)
+            if len(breaks):
+                run_start = int(quiet[breaks[-1] + 1])
+            else:
+                run_start = int(quiet[0])
+            best = (run_start + run_end) // 2
+        else:
+            # No pause in range: take the quietest point
+            best = int(np.argmin(window))
+        cut = lo + best
+        cuts.append(round(cut / frames_per_second, 2))
+    return cuts
+
+def segment_audio_to_bytes(audio_path: Path, max_seconds: int = 1200, cut_points=None):
+    """Yield (offset_seconds, chunk_bytes_io) for each chunk <= max_seconds.
+    If cut_points (seconds, ascending) is given, chunks are split exactly there instead.
+    Splits the whole file in a single ffmpeg run using the segment muxer and hands
+    each segment over as soon as ffmpeg closes it, so only one decode pass is made
+    and at most one finished segment sits in memory per consumer. Audio is stream
+    copied when the source bitrate keeps chunks under the upload size limit,
+    otherwise it is re-encoded to 128k once, in the same pass.
+    """
+    ffmpeg_path = ensure_ffmpeg_available()
+    if not ffmpeg_path:
+        raise RuntimeError("ffmpeg binary not available (imageio-ffmpeg)")
+
+    total_seconds = get_audio_duration_seconds(audio_path)
+    if cut_points is not None:
+        edges = [0.0, *cut_points, total_seconds]
+        longest_chunk = max(b - a for a, b in zip(edges, edges[1:]))
+        split_args = ['-segment_times', ','.join(f"{t:.2f}" for t in cut_points)] if cut_points else ['-segment_time', str(total_seconds + 1)]
+    else:
+        longest_chunk = max_seconds
+        split_args = ['-segment_time', str(max_seconds)]
+    bytes_per_second = audio_path.stat().st_size / max(total_seconds, 1.0)
+    if bytes_per_second * longest_chunk <= MAX_UPLOAD_BYTES:
+        codec_args = ['-c:a', 'copy']
+    else:
+        codec_args = ['-c:a', 'libmp3lame', '-b:a', '128k']
+
+    with tempfile.TemporaryDirectory(prefix="microbinfie-chunks-") as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        cmd = [
+            ffmpeg_path,
+            '-hide_banner',
+            '-loglevel', 'error',
+            '-i', str(audio_path),
+            '-vn',
+            '-map', '0:a:0',
+            *codec_args,
+            '-f', 'segment',
+            *split_args,
+            '-segment_format', 'mp3',
+            '-reset_timestamps', '1',
+            # ffmpeg appends "name,start,end" here as each segment is closed
+            '-segment_list', 'pipe:1',
+            '-segment_list_type', 'csv',
+            str(tmp_dir / 'chunk-%03d.mp3'),
+        ]
+        with open(tmp_dir / 'ffmpeg.log', 'w+') as err_log:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_log, text=True)
+            try:
+                for line in proc.stdout:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    name, start, _end = line.rsplit(',', 2)
+                    segment_path = tmp_dir / name
+                    buf = io.BytesIO(segment_path.read_bytes())
+                    segment_path.unlink()
+                    buf.name = "chunk.mp3"
+                    yield (float(start), buf)
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                proc.wait()
+            if proc.returncode != 0:
+                err_log.seek(0)
+                raise RuntimeError(f"ffmpeg failed to segment {audio_path.name}: {err_log.read()[:200]}")
+
 def extract_episode_number(title):
     """Extract episode number from title."""
     # Match patterns like "Episode 123:" or "123:" at the start
@@ -153,102 +342,196 @@ def generate_slug(title):
     slug = re.sub(r'[-\s]+', '-', slug)
     return slug.strip('-')
 
-def find_mdx_file_by_guid(guid):
-    """Find MDX file matching the GUID."""
-    for mdx_file in CONTENT_DIR.glob("mb-*.mdx"):
-        try:
-            post = frontmatter.load(mdx_file)
-            if post.get('guid') == guid:
-                return mdx_file
-        except Exception as e:
-            print(f"Error reading {mdx_file}: {e}")
-    return None
+def find_mdx_file_by_guid(guid, guid_index=None):
+    """Find MDX file matching the GUID.
+    Pass a prebuilt {guid: path} index to avoid reloading the episode catalog.
+    """
+    if guid_index is None:
+        guid_index = catalog_by_guid(load_catalog(CONTENT_DIR))
+    return guid_index.get(guid)
 
-def download_mp3(url, filename):
-    """Download MP3 file if it doesn't exist."""
-    filepath = AUDIO_DIR / filename
-    
-    if filepath.exists():
-        print(f"  ✓ MP3 already exists: {filename}")
-        return filepath
-    
-    print(f"  ⬇️  Downloading MP3: {filename}")
-    try:
-        response = requests.get(url, stream=True, timeout=30)
-        response.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        print(f"  ✓ Downloaded: {filename}")
-        return filepath
-    except Exception as e:
-        print(f"  ❌ Error downloading {filename}: {e}")
-        return None
+def iter_audio_chunks(audio_path, chunking='segment', boundaries='silence'):
+    """Yield (offset_seconds, chunk_bytes_io) using the selected chunking mode.
+    - segment + silence: cut in pauses, chunks up to MAX_CHUNK_SECONDS, one ffmpeg pass
+    - segment + fixed: fixed FIXED_CHUNK_SECONDS cuts, one ffmpeg pass
+    - per-chunk: fixed cuts, one ffmpeg run per chunk (legacy)
+    """
+    if chunking == 'per-chunk':
+        return chunk_audio_to_bytes(audio_path, max_seconds=FIXED_CHUNK_SECONDS)
+    cut_points = None
+    if boundaries == 'silence':
+        cut_points = plan_silence_boundaries(audio_path)
+        if cut_points is not None:
+            print(f"  🔇 Planned {len(cut_points) + 1} chunk(s) split at pauses")
+    return segment_audio_to_bytes(audio_path, max_seconds=FIXED_CHUNK_SECONDS, cut_points=cut_points)
+
+def transcribe_chunk(client, chunk_bytes, offset_sec, chunk_idx, model=TRANSCRIBE_MODEL, retries=4,
+                     cache_only=False, stage=None, key=None):
+    """Return one audio chunk's diarized segments, shifted by offset_sec.
+    Results come from the transcription cache when this exact chunk has been
+    transcribed with this model before; otherwise the API is called (retrying
+    with backoff) and the raw segments are cached before returning.
+    With cache_only, a cache miss raises instead of calling the API.
+    stage (a run_metrics.StageRecord) collects calls, bytes uploaded and retries.
+    key is the chunk's cache key if already known; chunk_bytes may then be None with cache_only.
+    """
+    if key is None:
+        key = chunk_cache_key(chunk_bytes.getvalue(), model, TRANSCRIBE_PARAMS)
+    raw_segments = load_segments(key)
+    if raw_segments is not None:
+        print(f"  💾 Chunk {chunk_idx}: cached transcription")
+        if stage:
+            stage.add(cache_hits=1)
+    elif cache_only:
+        raise RuntimeError(f"chunk {chunk_idx} is not in the transcription cache")
+    else:
+        def _request():
+            chunk_bytes.seek(0)
+            if stage:
+                stage.add(api_calls=1, bytes_uploaded=len(chunk_bytes.getbuffer()))
+            return client.audio.transcriptions.create(
+                model=model,
+                file=chunk_bytes,
+                **TRANSCRIBE_PARAMS
+            )
+
+        def _on_retry(attempt, exc, delay):
+            if stage:
+                stage.add(retries=1)
+            print(f"  🔁 chunk {chunk_idx}: attempt {attempt}/{retries} failed ({exc}); retrying in {delay:.1f}s")
 
-def transcribe_audio(audio_path, output_path, client):
+        response = call_with_retry(_request, attempts=retries, label=f"chunk {chunk_idx}", on_retry=_on_retry)
+        raw_segments = []
+        if hasattr(response, 'segments') and response.segments:
+            for seg in response.segments:
+                raw_segments.append({
+                    'speaker': getattr(seg, 'speaker', 'Unknown'),
+                    'text': getattr(seg, 'text', ''),
+                    'start': float(getattr(seg, 'start', 0.0)),
+                    'end': float(getattr(seg, 'end', 0.0)),
+                })
+        store_segments(key, raw_segments, meta={'model': model, 'chunk': chunk_idx})
+
+    segments = []
+    for seg in raw_segments:
+        text = seg['text'].strip()
+        if text:
+            segments.append({
+                'speaker': seg['speaker'],
+                'text': text,
+                'start': seg['start'] + offset_sec,
+                'end': seg['end'] + offset_sec,
+            })
+    return segments
+
+def transcription_settings(model, chunking, boundaries):
+    """What decides a transcript's chunks and their cache keys (stored in its chunk manifest)."""
+    return {'model': model, 'chunking': chunking, 'boundaries': boundaries, 'params': TRANSCRIBE_PARAMS}
+
+def cached_chunks(output_path, model=TRANSCRIBE_MODEL, chunking='segment', boundaries='silence'):
+    """[(offset_sec, cache key)] of an existing transcript made with these settings, or None."""
+    return load_manifest(output_path.name, transcription_settings(model, chunking, boundaries))
+
+def transcribe_audio(audio_path, output_path, client, workers=DEFAULT_WORKERS, retries=4,
+                     chunking='segment', boundaries='silence', model=TRANSCRIBE_MODEL,
+                     cache_only=False, overwrite=False, metrics=None, episode=None):
     """Transcribe audio using GPT-4o diarization, auto-chunking client-side if needed.
-    - Chunks to <=1200s to satisfy model's 1400s max duration per request.
-    - Concatenates diarized segments, adjusts timestamps, and writes a readable transcript.
+    - Chunks stay under the model's 1400s max duration per request; by default cuts
+      are placed in pauses (see iter_audio_chunks for `chunking`/`boundaries`).
+    - Chunks already in the transcription cache are not sent again; cache_only
+      re-formats purely from the cache and never calls the API. With cache_only and
+      no audio_path, the chunks listed in the transcript's manifest are used instead.
+    - Uploads up to `workers` chunks concurrently; each chunk retries with backoff.
+    - Merges diarized segments in offset order as chunks finish, streaming speaker blocks
+      to the transcript (see DiarizedTranscriptWriter) so memory stays flat.
+    - Also writes the time-indexed segment store (episode-NN.segments.jsonl, see transcript_store.py).
+    - metrics (a run_metrics.RunMetrics) gets a 'transcribe' stage for `episode`.
     """
-    if output_path.exists():
+    if output_path.exists() and not overwrite:
         print(f"  ✓ Transcript already exists: {output_path.name}")
         return True
 
-    print(f"  🎤 Transcribing with GPT-4o (speaker diarization, chunked)...")
-    try:
-        duration = get_audio_duration_seconds(audio_path)
-        # Collect combined segments across chunks
-        combined_segments = []
-        chunk_idx = 1
-        for offset_sec, chunk_bytes in chunk_audio_to_bytes(audio_path, max_seconds=1200):
-            # Insert a visible marker for each chunk boundary
-            combined_segments.append({
-                'marker': True,
-                'start': offset_sec,
-                'index': chunk_idx
-            })
-            response = client.audio.transcriptions.create(
-                model="gpt-4o-transcribe-diarize",
-                file=chunk_bytes,
-                response_format="diarized_json",
-                chunking_strategy="auto"
-            )
-            # Merge segments with offset
-            if hasattr(response, 'segments') and response.segments:
-                for seg in response.segments:
-                    # Normalize speaker label to a short token
-                    spk = getattr(seg, 'speaker', 'Unknown')
-                    text = getattr(seg, 'text', '').strip()
-                    start = float(getattr(seg, 'start', 0.0)) + offset_sec
-                    end = float(getattr(seg, 'end', 0.0)) + offset_sec
-                    if text:
-                        combined_segments.append({
-                            'speaker': spk,
-                            'text': text,
-                            'start': start,
-                            'end': end,
-                        })
-            chunk_idx += 1
-
-        if not combined_segments:
-            print("  ❌ No segments returned from diarization")
+    settings = transcription_settings(model, chunking, boundaries)
+    if audio_path is None:
+        manifest = cached_chunks(output_path, model, chunking, boundaries) if cache_only else None
+        if manifest is None:
+            print(f"  ❌ No audio and no chunk manifest for {output_path.name} with these settings")
             return False
+        chunks = ((offset, None, key) for offset, key in manifest)
+    else:
+        chunks = ((offset, chunk_bytes, chunk_cache_key(chunk_bytes.getvalue(), model, TRANSCRIBE_PARAMS))
+                  for offset, chunk_bytes in iter_audio_chunks(audio_path, chunking, boundaries))
+    chunk_keys = []
 
-        # Sort segments by start time and format
-        combined_segments.sort(key=lambda s: s['start'])
-        transcript_text = format_diarized_transcript_from_list(combined_segments)
+    if metrics is None:
+        metrics = RunMetrics('transcribe', path=False)
+    workers = max(1, int(workers))
+    print(f"  🎤 Transcribing with GPT-4o (speaker diarization, chunked, {workers} worker(s))...")
+    # Blocks stream into .partial files that are renamed into place once complete,
+    # so a crash leaves a readable partial transcript but never a "finished" one
+    partial_path = output_path.with_name(output_path.name + PARTIAL_SUFFIX)
+    index_path = segment_index_path(output_path)
+    partial_index_path = index_path.with_name(index_path.name + PARTIAL_SUFFIX)
+    try:
+        with metrics.stage(episode, 'transcribe') as stage, \
+                open(partial_path, 'w', encoding='utf-8') as out, \
+                open(partial_index_path, 'w', encoding='utf-8') as index_out, \
+                ThreadPoolExecutor(max_workers=workers) as pool:
+            if audio_path is not None:
+                stage.add(audio_seconds=get_audio_duration_seconds(audio_path))
+            writer = DiarizedTranscriptWriter(out, on_record=lambda r: index_out.write(dump_segment_record(r)))
+            # Chunks may finish in any order; finished ones wait here until every
+            # earlier chunk has been written, then are merged in offset order
+            finished = {}
+            next_chunk = 1
 
-        # Save transcript
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(transcript_text)
+            def collect(done):
+                nonlocal next_chunk
+                for fut in done:
+                    idx, off = pending.pop(fut)
+                    finished[idx] = (off, fut.result())
+                while next_chunk in finished:
+                    writer.add_chunk(next_chunk, *finished.pop(next_chunk))
+                    next_chunk += 1
+                out.flush()
 
+            pending = {}
+            for chunk_idx, (offset_sec, chunk_bytes, key) in enumerate(chunks, start=1):
+                chunk_keys.append((offset_sec, key))
+                # Keep at most `workers` chunks buffered in memory at once
+                if len(pending) >= workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                fut = pool.submit(transcribe_chunk, client, chunk_bytes, offset_sec, chunk_idx,
+                                  model=model, retries=retries, cache_only=cache_only, stage=stage, key=key)
+                pending[fut] = (chunk_idx, offset_sec)
+                stage.add(chunks=1)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            writer.close()
+            stage.add(segments=writer.segments)
+
+            if not writer.segments:
+                print("  ❌ No segments returned from diarization")
+                stage.fail("no segments")
+
+        if not writer.segments:
+            partial_path.unlink()
+            partial_index_path.unlink()
+            return False
+
+        # The transcript appearing marks the episode done, so it is renamed last
+        os.replace(partial_index_path, index_path)
+        os.replace(partial_path, output_path)
+        store_manifest(output_path.name, chunk_keys, settings)
         print(f"  ✓ Transcribed with speaker diarization: {output_path.name}")
         return True
 
     except Exception as e:
         print(f"  ❌ Transcription error: {e}")
+        if partial_path.exists():
+            print(f"  💾 Partial transcript kept: {partial_path.name}")
         return False
 
 def format_diarized_transcript(response):
@@ -271,133 +554,194 @@ def format_diarized_transcript_from_list(segments):
     """Format a list of diarized segments into readable blocks per speaker.
     Output per block: [HH:MM:SS] [Speaker X]: text
     """
-    def fmt_time(seconds: float) -> str:
-        seconds = int(seconds)
-        h = seconds // 3600
-        m = (seconds % 3600) // 60
-        s = seconds % 60
-        return f"{h:02d}:{m:02d}:{s:02d}"
-    transcript_lines = []
-    current_speaker = None
-    current_text = []
-    block_start = None
+    return format_diarized_transcript_with_index(segments)[0]
+
+def format_diarized_transcript_with_index(segments):
+    """Format segments like format_diarized_transcript_from_list and also return
+    the segment store records: start/end seconds, speaker and the UTF-8 byte
+    offset/length of each segment's text within the formatted transcript.
+    """
+    out = io.StringIO()
+    records = []
+    writer = DiarizedTranscriptWriter(out, on_record=records.append)
     for seg in segments:
-        # Handle inserted chunk markers
+        writer.add(seg)
+    writer.close()
+    return out.getvalue(), records
+
+def _fmt_time(seconds: float) -> str:
+    seconds = int(seconds)
+    h = seconds // 3600
+    m = (seconds % 3600) // 60
+    s = seconds % 60
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+class DiarizedTranscriptWriter:
+    """Write diarized segments to a text stream as readable speaker blocks, as they arrive.
+    Only the current speaker block is held in memory; each block is written
+    as soon as the speaker changes (or a chunk marker arrives), so memory stays
+    flat however long the recording is. Segments must be added in time order.
+    Output per block: [HH:MM:SS] [Speaker X]: text
+
+    on_record(record) receives each segment store record (start/end, speaker
+    and the UTF-8 byte offset/length of the segment's text) once its block is written.
+    """
+
+    def __init__(self, out, on_record=None):
+        self.out = out
+        self.on_record = on_record
+        self.position = 0  # byte offset where the next line starts
+        self.lines = 0
+        self.segments = 0
+        self.block = []  # segments of the current speaker block
+
+    def _emit(self, line):
+        if self.lines:
+            self.out.write("\n")  # blank line between blocks
+            self.position += 1
+        line_start = self.position
+        self.out.write(line)
+        self.lines += 1
+        self.position += len(line.encode('utf-8'))
+        return line_start
+
+    def _flush(self):
+        # Write the pending speaker block with a start-only timestamp
+        block = self.block
+        if block and block[0]['speaker']:
+            prefix = f"[{_fmt_time(block[0]['start'])}] [Speaker {block[0]['speaker']}]: "
+            offset = self._emit(prefix + ' '.join(seg['text'] for seg in block) + "\n") + len(prefix.encode('utf-8'))
+            for seg in block:
+                length = len(seg['text'].encode('utf-8'))
+                if self.on_record:
+                    self.on_record({
+                        'start': round(seg['start'], 3),
+                        'end': round(seg['end'], 3),
+                        'speaker': seg['speaker'],
+                        'offset': offset,
+                        'length': length,
+                    })
+                offset += length + 1
+        self.block = []
+
+    def add_marker(self, index, start):
+        """Write a visible chunk boundary line."""
+        self._flush()
+        self._emit(f"----- chunk {index} start @ {_fmt_time(start)} -----\n")
+
+    def add(self, seg):
+        """Add one segment dict, or a chunk marker ({'marker': True, 'index', 'start'})."""
         if seg.get('marker'):
-            # Flush pending speaker block before marker
-            if current_speaker and current_text:
-                # Write with start-only timestamp for the block
-                start_str = fmt_time(block_start if block_start is not None else 0)
-                transcript_lines.append(
-                    f"[{start_str}] [Speaker {current_speaker}]: {' '.join(current_text)}\n"
-                )
-                current_speaker = None
-                current_text = []
-                block_start = None
-            idx = seg.get('index', 0)
-            t = fmt_time(seg.get('start', 0.0))
-            transcript_lines.append(f"----- chunk {idx} start @ {t} -----\n")
-            continue
+            self.add_marker(seg.get('index', 0), seg.get('start', 0.0))
+            return
+        if self.block and seg['speaker'] != self.block[0]['speaker']:
+            self._flush()
+        self.block.append(seg)
+        self.segments += 1
 
-        speaker = seg['speaker']
-        text = seg['text']
-        if speaker != current_speaker:
-            if current_speaker and current_text:
-                # Close previous block with start-only timestamp
-                start_str = fmt_time(block_start if block_start is not None else 0)
-                transcript_lines.append(
-                    f"[{start_str}] [Speaker {current_speaker}]: {' '.join(current_text)}\n"
-                )
-            current_speaker = speaker
-            current_text = [text]
-            block_start = seg['start']
-        else:
-            current_text.append(text)
-            # Keep earliest start; end time not shown in start-only mode
-    if current_speaker and current_text:
-        start_str = fmt_time(block_start if block_start is not None else 0)
-        transcript_lines.append(
-            f"[{start_str}] [Speaker {current_speaker}]: {' '.join(current_text)}\n"
-        )
-    return "\n".join(transcript_lines)
+    def add_chunk(self, index, offset_sec, segments):
+        """Add one transcribed chunk: its marker, then its segments in start order."""
+        self.add_marker(index, offset_sec)
+        for seg in sorted(segments, key=lambda s: s['start']):
+            self.add(seg)
+
+    def close(self):
+        """Write the last speaker block."""
+        self._flush()
 
 def update_mdx_frontmatter(mdx_file, episode_num):
     """Add transcript link to MDX frontmatter."""
     try:
-        post = frontmatter.load(mdx_file)
-        transcript_path = f"/microbinfie-transcripts/episode-{episode_num}.txt"
-        
-        # Check if already has transcript link
-        if post.get('transcript') == transcript_path:
+        if not patch_mdx(mdx_file, {'transcript': transcript_link(episode_num)}):
             print(f"  ✓ Frontmatter already has transcript link")
-            return
-        
-        # Add transcript to frontmatter
-        post['transcript'] = transcript_path
-        
-        # Write back to file
-        with open(mdx_file, 'wb') as f:
-            frontmatter.dump(post, f)
+            return True
         
         print(f"  ✓ Updated frontmatter with transcript link")
+        return True
     except Exception as e:
         print(f"  ❌ Error updating frontmatter: {e}")
+        return False
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Transcribe MicroBinfie episodes with speaker diarization.")
+    parser.add_argument('episodes', nargs='*', type=int,
+                        help='Only process these episode numbers, e.g. 145 146')
+    parser.add_argument('--feed', default=RSS_FEED_URL,
+                        help='RSS feed URL or local XML file (default: SoundCloud feed)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Chunks uploaded concurrently per episode (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--retries', type=int, default=4,
+                        help='Attempts per chunk before giving up on an episode (default: 4)')
+    parser.add_argument('--chunking', choices=['segment', 'per-chunk'], default='segment',
+                        help='segment: split in one ffmpeg pass (default); per-chunk: one ffmpeg run per chunk')
+    parser.add_argument('--model', default=TRANSCRIBE_MODEL,
+                        help=f'Transcription model (default: {TRANSCRIBE_MODEL}); part of the cache key')
+    parser.add_argument('--reformat', action='store_true',
+                        help='Rewrite existing transcripts from the transcription cache only (no API calls; '
+                             'no audio download once a transcript has a chunk manifest)')
+    parser.add_argument('--download-workers', type=int, default=4,
+                        help='Episodes downloaded in parallel (default: 4)')
+    parser.add_argument('--max-download-rate', type=float, default=None,
+                        help='Combined download bandwidth cap in MB/s (default: unlimited)')
+    parser.add_argument('--boundaries', choices=['silence', 'fixed'], default='silence',
+                        help='silence: cut in pauses up to 1380s (default); fixed: cut every 1200s')
+    parser.add_argument('--metrics', type=Path, default=None,
+                        help='JSONL file for per-episode stage metrics (default: .cache/microbinfie/metrics/)')
+    return parser.parse_args()
 
 def main():
     """Main transcription workflow."""
+    args = parse_args()
+
     # Create directories if they don't exist
     AUDIO_DIR.mkdir(exist_ok=True)
     TRANSCRIPT_DIR.mkdir(exist_ok=True)
     
-    # Load OpenAI API key
+    # Load OpenAI API key (not needed when only re-formatting from the cache)
+    client = None
     api_key = load_api_key()
-    if not api_key:
+    if api_key:
+        # Initialize OpenAI client
+        client = OpenAI(api_key=api_key)
+        print("✅ OpenAI API key loaded\n")
+    elif not args.reformat:
         print("❌ OpenAI API key not found in .credentials file")
         print("   Add to .credentials: OPENAI_API_KEY=sk-...")
         sys.exit(1)
     
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
-    print("✅ OpenAI API key loaded\n")
-    
     print("📻 Fetching RSS feed...")
     try:
-        response = requests.get(RSS_FEED_URL, timeout=30)
-        response.raise_for_status()
+        items, feed_status = fetch_feed(args.feed)
     except Exception as e:
         print(f"❌ Error fetching RSS feed: {e}")
         sys.exit(1)
     
-    # Parse RSS feed
-    root = ET.fromstring(response.content)
-    items = root.findall('.//item')
-    
-    print(f"\n📊 Found {len(items)} episodes in RSS feed\n")
+    print(f"\n📊 Found {len(items)} episodes in RSS feed ({feed_status})\n")
+
+    # One catalog pass replaces a full MDX rescan per RSS item
+    guid_index = catalog_by_guid(load_catalog(CONTENT_DIR, verbose=True))
     
     processed = 0
     skipped = 0
+    metrics = RunMetrics('transcribe', path=args.metrics)
 
     # Optional CLI filter: pass episode numbers to process, e.g.
-    #   python scripts/transcribe-episodes.py 145 146
-    allowed_episode_nums = set()
-    for arg in sys.argv[1:]:
-        try:
-            allowed_episode_nums.add(int(arg))
-        except ValueError:
-            pass
+    #   python scripts/transcribe-episodes.py 145 146 --workers 5
+    allowed_episode_nums = set(args.episodes)
     
+    # Pass 1: match feed items to episodes and decide what needs audio
+    episodes = []
     for item in items:
-        title = item.find('title').text
-        guid = item.find('guid').text
+        title = item['title']
+        guid = item['guid']
         
         # Get audio URL
-        enclosure = item.find('enclosure')
-        if enclosure is None:
+        audio_url = item['audio_url']
+        if not audio_url:
             continue
-        audio_url = enclosure.get('url')
         
         # Find corresponding MDX file first (using GUID)
-        mdx_file = find_mdx_file_by_guid(guid)
+        mdx_file = find_mdx_file_by_guid(guid, guid_index)
         if not mdx_file:
             print(f"⚠️  No MDX file found for: {title}")
             skipped += 1
@@ -414,40 +758,81 @@ def main():
         if allowed_episode_nums and episode_num not in allowed_episode_nums:
             continue
         
-        print(f"\n{'='*60}")
-        print(f"Episode {episode_num}: {title}")
-        print(f"{'='*60}")
-        print(f"  📄 MDX file: {mdx_file.name}")
-        
         # Generate filenames
         slug = generate_slug(title)
-        mp3_filename = f"MicroBinfie podcast - {episode_num:02d} - {slug}.mp3"
-        transcript_filename = f"episode-{episode_num}.txt"
-        transcript_path = TRANSCRIPT_DIR / transcript_filename
+        episodes.append({
+            'num': episode_num,
+            'title': title,
+            'mdx_file': mdx_file,
+            'audio_url': audio_url,
+            # Enclosure length lets the downloader spot truncated files
+            'audio_length': item['audio_length'],
+            'mp3_path': AUDIO_DIR / f"MicroBinfie podcast - {episode_num:02d} - {slug}.mp3",
+            'transcript_path': transcript_file_for(episode_num, TRANSCRIPT_DIR),
+        })
+
+    # Pass 2: fetch audio for every episode that will be transcribed, in parallel
+    # --reformat rebuilds from the chunk manifest when there is one, so no audio is needed
+    for ep in episodes:
+        ep['reformat_cached'] = args.reformat and ep['transcript_path'].exists() and cached_chunks(
+            ep['transcript_path'], args.model, args.chunking, args.boundaries) is not None
+    needs_audio = [ep for ep in episodes
+                   if not ep['reformat_cached'] and (args.reformat or not ep['transcript_path'].exists())]
+    downloaded = {}
+    if needs_audio:
+        print(f"\n⬇️  Fetching audio for {len(needs_audio)} episode(s) "
+              f"({args.download_workers} parallel download(s))...")
+        max_rate = int(args.max_download_rate * 1024 * 1024) if args.max_download_rate else None
+        # Downloads run in parallel, so they are timed as one run-level stage
+        with metrics.stage(None, 'download') as stage:
+            downloaded = download_many(
+                [{'url': ep['audio_url'], 'dest': ep['mp3_path'], 'expected_size': ep['audio_length']}
+                 for ep in needs_audio],
+                max_workers=args.download_workers,
+                max_bytes_per_sec=max_rate,
+            )
+            stage.add(files=len(needs_audio), failed=sum(1 for path in downloaded.values() if not path))
+
+    # Pass 3: transcribe and link, one episode at a time
+    for ep in episodes:
+        episode_num = ep['num']
+        mdx_file = ep['mdx_file']
+        transcript_path = ep['transcript_path']
         
-        # Download MP3
-        mp3_path = download_mp3(audio_url, mp3_filename)
-        if not mp3_path:
-            skipped += 1
-            continue
+        print(f"\n{'='*60}")
+        print(f"Episode {episode_num}: {ep['title']}")
+        print(f"{'='*60}")
+        print(f"  📄 MDX file: {mdx_file.name}")
         
-        # Transcribe if needed
-        if not transcript_path.exists():
-            if transcribe_audio(mp3_path, transcript_path, client):
+        # Transcribe if needed (or rebuild from the cache with --reformat)
+        if args.reformat or not transcript_path.exists():
+            mp3_path = downloaded.get(ep['mp3_path'])
+            if not mp3_path and not ep['reformat_cached']:
+                skipped += 1
+                continue
+            if transcribe_audio(mp3_path, transcript_path, client, workers=args.workers,
+                                retries=args.retries, chunking=args.chunking,
+                                boundaries=args.boundaries, model=args.model,
+                                cache_only=args.reformat, overwrite=args.reformat,
+                                metrics=metrics, episode=episode_num):
                 processed += 1
             else:
                 skipped += 1
                 continue
         else:
-            print(f"  ✓ Transcript already exists: {transcript_filename}")
+            print(f"  ✓ Transcript already exists: {transcript_path.name}")
         
         # Update MDX frontmatter
-        update_mdx_frontmatter(mdx_file, episode_num)
+        with metrics.stage(episode_num, 'frontmatter') as stage:
+            if not update_mdx_frontmatter(mdx_file, episode_num):
+                stage.fail()
     
+    metrics.close()
     print(f"\n{'='*60}")
     print(f"✅ Complete!")
     print(f"   Processed: {processed} new transcripts")
     print(f"   Skipped: {skipped} episodes")
+    metrics.print_summary()
     print(f"{'='*60}\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Full-text inverted index over the MicroBinfie transcripts.
+
+The index lives in .cache/microbinfie/transcript-index/:
+  docs.json         one record per transcript: file mtime/size, token count,
+                    speaker-block start positions with their [HH:MM:SS]
+                    timestamps, and which term shards hold its postings
+  terms/<pr>.json   {term: {episode: [token positions]}} for every term
+                    starting with the two-character prefix <pr>
+
+Updates are incremental: only new or changed episode-NN.txt files are
+tokenized, and only the shards holding their terms are rewritten. A query
+loads just the shards for its terms, ranks episodes with BM25 and maps hit
+positions back to timestamps, so it answers in milliseconds.
+
+`export` writes a static, lazily loadable copy for the site: a manifest plus
+one small JSON file per prefix with per-episode hit counts and timestamps.
+
+Usage (from the repo root):
+    python scripts/transcript_index.py                      # update the index
+    python scripts/transcript_index.py query kraken mlst
+    python scripts/transcript_index.py export               # -> public/microbinfie-index/transcripts/
+"""
+
+import argparse
+import bisect
+import json
+import math
+import os
+import re
+import shutil
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from episode_catalog import CONTENT_DIR, TRANSCRIPT_DIR, catalog_by_episode, load_catalog, transcript_file_for
+
+INDEX_DIR = Path(".cache/microbinfie/transcript-index")
+EXPORT_DIR = Path("public/microbinfie-index/transcripts")
+INDEX_VERSION = 1
+PREFIX_LEN = 2
+# Timestamps kept per episode and term in the static export
+EXPORT_MAX_TIMES = 20
+
+TRANSCRIPT_NAME_RE = re.compile(r'^episode-(\d+)\.txt$')
+BLOCK_RE = re.compile(r'^\[(\d{2}):(\d{2}):(\d{2})\] \[Speaker [^\]]+\]:')
+CHUNK_MARKER_RE = re.compile(r'^----- chunk \d+ start @ [\d:]+ -----$')
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Very common words (and filler) are not indexed; they still advance positions
+STOPWORDS = frozenset("""
+a about all also an and any are as at be because been but by can could did do does doing don
+for from get got had has have he her here him his how i if in into is it its just know like
+me more my no not now of oh on one or our out really right she so some that the their them then
+there these they think this those to too uh um up very was we well were what when where which
+who will with would yeah yes you your
+""".split())
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def term_prefix(term):
+    return term[:PREFIX_LEN]
+
+
+def index_transcript(text):
+    """Return (postings {term: [positions]}, token count, blocks [[position, seconds]])."""
+    postings = defaultdict(list)
+    blocks = []
+    position = 0
+    for line in text.splitlines():
+        if CHUNK_MARKER_RE.match(line):
+            continue
+        m = BLOCK_RE.match(line)
+        if m:
+            h, mi, s = (int(x) for x in m.groups())
+            blocks.append([position, h * 3600 + mi * 60 + s])
+            line = line[m.end():]
+        for token in tokenize(line):
+            if token not in STOPWORDS:
+                postings[token].append(position)
+            position += 1
+    return postings, position, blocks
+
+
+def format_timestamp(seconds):
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def position_time(doc, position):
+    """Timestamp (seconds) of the speaker block holding a token position, or None for plain transcripts."""
+    blocks = doc['blocks']
+    if not blocks:
+        return None
+    i = bisect.bisect_right([b[0] for b in blocks], position) - 1
+    return blocks[max(i, 0)][1]
+
+
+def transcript_files(transcript_dir=TRANSCRIPT_DIR):
+    """{episode number: path} for every transcript under its canonical name (episode-07.txt).
+    A stray unpadded copy (episode-7.txt) is ignored rather than indexed as the same episode.
+    """
+    files = {}
+    for path in transcript_dir.glob('episode-*.txt'):
+        m = TRANSCRIPT_NAME_RE.match(path.name)
+        if m and path.name == transcript_file_for(int(m.group(1)), transcript_dir).name:
+            files[int(m.group(1))] = path
+    return files
+
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_docs(index_dir=INDEX_DIR):
+    data = _read_json(index_dir / 'docs.json', {})
+    if data.get('version') != INDEX_VERSION:
+        return {}
+    return data['docs']
+
+
+def load_shard(prefix, index_dir=INDEX_DIR):
+    return _read_json(index_dir / 'terms' / f"{prefix}.json", {})
+
+
+def update_index(transcript_dir=TRANSCRIPT_DIR, index_dir=INDEX_DIR, verbose=False):
+    """Bring the index up to date with the transcript directory.
+    Returns (changed episodes, removed episodes).
+    """
+    docs = load_docs(index_dir)
+    if not docs and (index_dir / 'terms').exists():
+        # Unreadable or old-version index: start over
+        shutil.rmtree(index_dir / 'terms')
+
+    current = {str(num): path for num, path in transcript_files(transcript_dir).items()}
+
+    changed = []
+    for episode, path in current.items():
+        st = path.stat()
+        doc = docs.get(episode)
+        if not doc or doc['file'] != path.name or doc['mtime'] != st.st_mtime_ns or doc['size'] != st.st_size:
+            changed.append(episode)
+    removed = [episode for episode in docs if episode not in current]
+    if not changed and not removed:
+        return [], []
+
+    affected = set()
+    for episode in changed + removed:
+        if episode in docs:
+            affected.update(docs.pop(episode)['shards'])
+
+    # prefix -> {term: {episode: positions}} for the new/changed transcripts
+    additions = defaultdict(dict)
+    for episode in changed:
+        path = current[episode]
+        st = path.stat()
+        postings, length, blocks = index_transcript(path.read_text(encoding='utf-8', errors='replace'))
+        prefixes = set()
+        for term, positions in postings.items():
+            prefix = term_prefix(term)
+            additions[prefix].setdefault(term, {})[episode] = positions
+            prefixes.add(prefix)
+        docs[episode] = {
+            'file': path.name,
+            'mtime': st.st_mtime_ns,
+            'size': st.st_size,
+            'length': length,
+            'blocks': blocks,
+            'shards': sorted(prefixes),
+        }
+        affected.update(prefixes)
+
+    stale = set(changed) | set(removed)
+    for prefix in sorted(affected):
+        shard = load_shard(prefix, index_dir)
+        for term in list(shard):
+            for episode in stale.intersection(shard[term]):
+                del shard[term][episode]
+            if not shard[term]:
+                del shard[term]
+        for term, by_episode in additions.get(prefix, {}).items():
+            shard.setdefault(term, {}).update(by_episode)
+        shard_path = index_dir / 'terms' / f"{prefix}.json"
+        if shard:
+            _write_json(shard_path, shard)
+        elif shard_path.exists():
+            shard_path.unlink()
+
+    _write_json(index_dir / 'docs.json', {'version': INDEX_VERSION, 'docs': docs})
+    if verbose:
+        print(f"🔎 Indexed {len(changed)} transcript(s), removed {len(removed)}, "
+              f"rewrote {len(affected)} shard(s); {len(docs)} in index")
+    return changed, removed
+
+
+def search(query, index_dir=INDEX_DIR, limit=10, docs=None):
+    """Rank episodes for a free-text query.
+    Returns [{'episode', 'score', 'hits', 'times'}], best first; times are the
+    distinct block timestamps (seconds) where query terms occur.
+    """
+    docs = docs if docs is not None else load_docs(index_dir)
+    terms = [t for t in dict.fromkeys(tokenize(query)) if t not in STOPWORDS]
+    if not docs or not terms:
+        return []
+    avg_length = sum(d['length'] for d in docs.values()) / len(docs)
+    shards = {}
+    scores = defaultdict(float)
+    positions = defaultdict(list)
+    for term in terms:
+        prefix = term_prefix(term)
+        if prefix not in shards:
+            shards[prefix] = load_shard(prefix, index_dir)
+        by_episode = shards[prefix].get(term, {})
+        if not by_episode:
+            continue
+        idf = math.log(1 + (len(docs) - len(by_episode) + 0.5) / (len(by_episode) + 0.5))
+        for episode, hits in by_episode.items():
+            doc = docs.get(episode)
+            if not doc:
+                continue
+            tf = len(hits)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc['length'] / avg_length)
+            scores[episode] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            positions[episode].extend(hits)
+
+    results = []
+    for episode, score in sorted(scores.items(), key=lambda kv: -kv[1])[:limit]:
+        doc = docs[episode]
+        times = sorted({t for t in (position_time(doc, p) for p in positions[episode]) if t is not None})
+        results.append({
+            'episode': int(episode),
+            'score': round(score, 3),
+            'hits': len(positions[episode]),
+            'times': times,
+        })
+    return results
+
+
+def export_index(export_dir=EXPORT_DIR, index_dir=INDEX_DIR, catalog=None):
+    """Write the static shard set the site loads lazily.
+
+    manifest.json: {"version", "prefixLength", "shards": [...],
+                    "episodes": {"147": {"title", "slug", "length"}}}
+    <prefix>.json: {term: [[episode, hits, [seconds, ...]], ...]} (episodes by hits)
+    """
+    docs = load_docs(index_dir)
+    if catalog is None:
+        catalog = load_catalog(CONTENT_DIR)
+    by_episode = catalog_by_episode(catalog)
+
+    if export_dir.exists():
+        shutil.rmtree(export_dir)
+    export_dir.mkdir(parents=True)
+    prefixes = sorted(p.stem for p in (index_dir / 'terms').glob('*.json'))
+    for prefix in prefixes:
+        shard = {}
+        for term, hits_by_episode in load_shard(prefix, index_dir).items():
+            rows = []
+            for episode, hits in hits_by_episode.items():
+                times = sorted({t for t in (position_time(docs[episode], p) for p in hits) if t is not None})
+                rows.append([int(episode), len(hits), times[:EXPORT_MAX_TIMES]])
+            rows.sort(key=lambda r: (-r[1], r[0]))
+            shard[term] = rows
+        _write_json(export_dir / f"{prefix}.json", shard)
+
+    episodes = {}
+    for episode, doc in docs.items():
+        entry = by_episode.get(int(episode)) or {}
+        episodes[episode] = {'title': entry.get('title'), 'slug': entry.get('slug'), 'length': doc['length']}
+    _write_json(export_dir / 'manifest.json', {
+        'version': INDEX_VERSION,
+        'prefixLength': PREFIX_LEN,
+        'shards': prefixes,
+        'episodes': episodes,
+    })
+    return len(prefixes)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build and query the MicroBinfie transcript index.")
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('update', help='Index new or changed transcripts (default)')
+    query = sub.add_parser('query', help='Search the index')
+    query.add_argument('terms', nargs='+')
+    query.add_argument('-n', '--limit', type=int, default=10, help='Episodes to show (default: 10)')
+    export = sub.add_parser('export', help='Write the static JSON shard set for the site')
+    export.add_argument('--out', type=Path, default=EXPORT_DIR,
+                        help=f'Output directory (default: {EXPORT_DIR})')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == 'query':
+        started = time.perf_counter()
+        docs = load_docs()
+        if not docs:
+            print("❌ No transcript index yet; run: python scripts/transcript_index.py update")
+            sys.exit(1)
+        results = search(' '.join(args.terms), limit=args.limit, docs=docs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        titles = {num: entry['title'] for num, entry in catalog_by_episode(load_catalog(CONTENT_DIR)).items()}
+        print(f"🔎 {len(results)} episode(s) for {' '.join(args.terms)!r} ({elapsed_ms:.1f} ms)")
+        for r in results:
+            print(f"  Episode {r['episode']:>3}  score {r['score']:6.2f}  {r['hits']:>3} hit(s)  "
+                  f"{titles.get(r['episode']) or ''}")
+            if r['times']:
+                shown = ', '.join(format_timestamp(t) for t in r['times'][:8])
+                more = f" (+{len(r['times']) - 8} more)" if len(r['times']) > 8 else ''
+                print(f"        @ {shown}{more}")
+        return
+
+    update_index(verbose=True)
+    if args.command == 'export':
+        count = export_index(args.out)
+        print(f"📦 Exported {count} shard(s) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
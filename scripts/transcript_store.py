@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Time-indexed segment store kept alongside each diarized transcript.
+
+transcribe-episodes.py writes public/microbinfie-transcripts/episode-NN.txt
+and, next to it, episode-NN.segments.jsonl with one line per diarized segment:
+
+    {"start": 12.3, "end": 15.9, "speaker": "A", "offset": 1024, "length": 87}
+
+offset/length locate the segment's text in the .txt file (UTF-8 bytes), so a
+consumer can find the segments around a timestamp or for one speaker from the
+small index and read just those byte ranges, without regex-scanning the
+transcript. Older transcripts (plain Whisper prose) have no segment store.
+
+Usage:
+    records = load_segment_index(transcript_path)
+    for seg in segments_between(records, 600, 660):
+        print(seg['speaker'], read_segment_text(transcript_path, seg))
+"""
+
+import bisect
+import json
+import os
+from pathlib import Path
+
+SEGMENT_SUFFIX = '.segments.jsonl'
+
+
+def segment_index_path(transcript_path):
+    """episode-NN.txt -> episode-NN.segments.jsonl in the same directory."""
+    transcript_path = Path(transcript_path)
+    return transcript_path.with_name(transcript_path.stem + SEGMENT_SUFFIX)
+
+
+def dump_segment_record(record):
+    """One JSONL line of the segment store."""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def write_segment_index(transcript_path, records):
+    """Atomically write the segment records for a transcript."""
+    path = segment_index_path(transcript_path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(dump_segment_record(record))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_segment_index(transcript_path):
+    """Return the segment records for a transcript (sorted by start), or None if it has no store."""
+    try:
+        with open(segment_index_path(transcript_path), 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError):
+        return None
+    records.sort(key=lambda r: r['start'])
+    return records
+
+
+def segments_between(records, start, end=None):
+    """Segments overlapping [start, end) seconds; end=None means to the end of the episode."""
+    starts = [r['start'] for r in records]
+    hi = len(records) if end is None else bisect.bisect_left(starts, end)
+    # Walk back from the first segment starting at/after `start` to catch one already running
+    lo = bisect.bisect_left(starts, start)
+    while lo > 0 and records[lo - 1]['end'] > start:
+        lo -= 1
+    return records[lo:hi]
+
+
+def segment_at(records, seconds):
+    """The segment being spoken at `seconds`, or None in a gap."""
+    for record in segments_between(records, seconds, seconds + 1e-6):
+        if record['start'] <= seconds < record['end']:
+            return record
+    return None
+
+
+def segments_for_speaker(records, speaker):
+    return [r for r in records if r['speaker'] == speaker]
+
+
+def read_segment_text(transcript_path, records):
+    """Read the text of one record (dict) or several records (list) from the .txt by seeking."""
+    single = isinstance(records, dict)
+    texts = []
+    with open(transcript_path, 'rb') as f:
+        for record in [records] if single else records:
+            f.seek(record['offset'])
+            texts.append(f.read(record['length']).decode('utf-8'))
+    return texts[0] if single else texts
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Split podcast transcripts into token-budgeted windows for LLM summarisation.
+
+Diarized transcripts ("[HH:MM:SS] [Speaker X]: text" blocks) are split on
+speaker-block boundaries; older Whisper transcripts (wrapped prose) fall back
+to sentence boundaries. Windows are packed greedily up to a token budget, and
+the budget grows (repacking until the windows fit) so an episode never needs
+more than max_windows calls, which keeps per-episode cost and latency predictable.
+"""
+
+import math
+import re
+
+# ~4 characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+SPEAKER_BLOCK_RE = re.compile(r'^\[\d{2}:\d{2}:\d{2}\] \[Speaker [^\]]+\]:', re.MULTILINE)
+CHUNK_MARKER_RE = re.compile(r'^----- chunk \d+ start @ [\d:]+ -----$', re.MULTILINE)
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_units(transcript: str):
+    """Split a transcript into the smallest pieces a window boundary may fall between."""
+    text = CHUNK_MARKER_RE.sub('', transcript)
+    starts = [m.start() for m in SPEAKER_BLOCK_RE.finditer(text)]
+    if starts:
+        edges = starts + [len(text)]
+        units = [text[:starts[0]]] + [text[a:b] for a, b in zip(edges, edges[1:])]
+    else:
+        # Wrapped prose: re-join the lines and cut between sentences
+        units = SENTENCE_END_RE.split(' '.join(text.split()))
+    return [u.strip() for u in units if u.strip()]
+
+
+def _split_oversized(unit: str, budget: int):
+    """Cut a single unit that exceeds the budget, preferring sentence ends."""
+    pieces, current = [], ''
+    for sentence in SENTENCE_END_RE.split(unit):
+        while estimate_tokens(sentence) > budget:
+            cut = budget * CHARS_PER_TOKEN
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:]
+        if current and estimate_tokens(current) + estimate_tokens(sentence) > budget:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _pack(units, budget):
+    """Greedily pack units into windows of at most ~budget tokens."""
+    windows, current, current_tokens = [], [], 0
+    for unit in units:
+        unit_tokens = estimate_tokens(unit)
+        parts = _split_oversized(unit, budget) if unit_tokens > budget else [unit]
+        for part in parts:
+            part_tokens = estimate_tokens(part)
+            if current and current_tokens + part_tokens > budget:
+                windows.append('\n\n'.join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+    if current:
+        windows.append('\n\n'.join(current))
+    return windows
+
+
+def build_windows(transcript: str, max_tokens: int = 12000, max_windows: int = 8):
+    """Pack transcript units into windows of at most ~max_tokens each.
+
+    If the transcript would need more than max_windows windows, the budget
+    starts at ceil(total / max_windows) and grows by ~10% until the packed
+    windows fit (unit boundaries leave windows part-empty, so that first
+    budget can overshoot). Once the budget covers the whole transcript it is
+    a single window, so the loop always ends.
+    """
+    units = split_units(transcript)
+    total = sum(estimate_tokens(u) for u in units)
+    budget = max(max_tokens, math.ceil(total / max_windows)) if max_windows else max_tokens
+    windows = _pack(units, budget)
+    while max_windows and len(windows) > max_windows:
+        budget = math.ceil(budget * 1.1)
+        windows = _pack(units, budget)
+    return windows
+
+
+if __name__ == "__main__":
+    # Sanity check: python scripts/transcript_windows.py public/microbinfie-transcripts/episode-01.txt
+    import sys
+
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        for max_tokens, max_windows in [(1000, 2), (1000, 3), (1000, 5), (4000, 2), (12000, 8)]:
+            n = len(build_windows(text, max_tokens=max_tokens, max_windows=max_windows))
+            status = '✅' if n <= max_windows else '❌'
+            print(f"{status} {path}: max_tokens={max_tokens} max_windows={max_windows} -> {n} windows")
+            if n > max_windows:
+                sys.exit(1)
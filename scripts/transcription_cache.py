@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of raw diarized transcription segments.
+
+Each audio chunk's API result is stored as JSON under
+.cache/microbinfie/transcriptions/, keyed by the sha256 of the chunk bytes,
+the model and the request parameters. Segments are stored relative to the
+chunk start, so a rerun (or a re-format of an existing transcript) only pays
+for chunks that have never been transcribed with that model.
+
+Each finished transcript also gets a manifest under manifests/ listing its
+chunks (start offset and cache key) and the settings that produced them, so
+the transcript can be re-formatted from the cache without the audio.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR = Path(".cache/microbinfie/transcriptions")
+
+
+def chunk_cache_key(chunk_bytes, model, params=None):
+    """Return the cache key for one chunk: sha256 over audio bytes, model and params."""
+    h = hashlib.sha256()
+    h.update(chunk_bytes)
+    h.update(b'\0')
+    h.update(model.encode('utf-8'))
+    h.update(b'\0')
+    h.update(json.dumps(params or {}, sort_keys=True).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _cache_path(key, cache_dir=CACHE_DIR):
+    # Fan out by prefix so one directory never holds thousands of files
+    return cache_dir / key[:2] / f"{key}.json"
+
+
+def load_segments(key, cache_dir=CACHE_DIR):
+    """Return the cached segment list for a key, or None on a miss."""
+    try:
+        with open(_cache_path(key, cache_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)['segments']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def store_segments(key, segments, meta=None, cache_dir=CACHE_DIR):
+    """Atomically write a chunk's segments (plus optional metadata) to the cache."""
+    path = _cache_path(key, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, suffix='.tmp', delete=False) as f:
+        json.dump({'meta': meta or {}, 'segments': segments}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(f.name, path)
+
+
+def _manifest_path(transcript_name, cache_dir=CACHE_DIR):
+    return cache_dir / "manifests" / f"{transcript_name}.json"
+
+
+def store_manifest(transcript_name, chunks, settings, cache_dir=CACHE_DIR):
+    """Record a transcript's chunks [(offset_sec, key)] and the settings (model, chunking...) used."""
+    path = _manifest_path(transcript_name, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, suffix='.tmp', delete=False) as f:
+        json.dump({'settings': settings, 'chunks': [[offset, key] for offset, key in chunks]},
+                  f, separators=(',', ':'))
+    os.replace(f.name, path)
+
+
+def load_manifest(transcript_name, settings, cache_dir=CACHE_DIR):
+    """Return [(offset_sec, key)] if the transcript was last made with these settings, else None."""
+    try:
+        with open(_manifest_path(transcript_name, cache_dir), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('settings') != settings:
+        return None
+    return [(offset, key) for offset, key in manifest['chunks']]